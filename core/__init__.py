@@ -0,0 +1 @@
+"""Stay or Skip 공용 코어 (앱 · 노트북 파이프라인 · 벤치마크가 같이 씀)"""
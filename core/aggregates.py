@@ -0,0 +1,203 @@
+"""Dataset / EDA 탭 차트에 들어가는 집계 (앱과 벤치마크 공용)"""
+import numpy as np
+import pandas as pd
+
+from core import labels
+from core.labels import DEVICE_COLS, PLAN_COLS  # noqa: F401  (filters · 섹션이 agg.*로 참조)
+TIME_SLOT_ORDER = ["Morning", "Afternoon", "Evening", "Night"]
+
+
+def plan_column(df: pd.DataFrame):
+    return next((c for c in PLAN_COLS if c in df.columns), None)
+
+
+def revenue_column(df: pd.DataFrame) -> str:
+    return "revenue_num" if "revenue_num" in df.columns else "revenue"
+
+
+def monthly_revenue(tidy: pd.DataFrame) -> pd.DataFrame:
+    """월별 총매출 (month_dt, rev_col)"""
+    rev_col = revenue_column(tidy)
+    df_rev = tidy[["month", rev_col]].copy()
+    # revenue 문자열일 수 있어 숫자화 한번 더 안전 처리
+    if rev_col == "revenue":
+        df_rev[rev_col] = (
+            df_rev[rev_col].astype(str)
+            .str.replace(r"[^0-9.\-]", "", regex=True)
+            .replace("", np.nan)
+            .astype(float)
+        )
+    df_rev["month_dt"] = pd.to_datetime(df_rev["month"].astype(str) + "-01", errors="coerce")
+    return df_rev.groupby("month_dt", as_index=False)[rev_col].sum()
+
+
+def monthly_revenue_by_month(tidy: pd.DataFrame) -> pd.DataFrame:
+    """월(문자열)별 매출 합계 (month, rev_col) — RARA Revenue 탭 막대"""
+    rev_col = revenue_column(tidy)
+    df_rev = tidy[["month", rev_col]].copy()
+    if rev_col == "revenue":
+        df_rev[rev_col] = df_rev[rev_col].astype(str).str.replace(r"[^0-9.\-]", "", regex=True)
+    df_rev[rev_col] = pd.to_numeric(df_rev[rev_col], errors="coerce")
+    df_rev["month"] = df_rev["month"].astype(str)
+    df_rev = df_rev.dropna(subset=[rev_col, "month"])
+    return df_rev.groupby("month", as_index=False)[rev_col].sum().sort_values("month")
+
+
+def histogram(tidy: pd.DataFrame, col: str, maxbins: int = 18) -> pd.DataFrame:
+    """수치 컬럼 → 구간별 개수 (bin_start, bin_end, count). 정수값이고 범위가 maxbins 이하면 1 단위 구간"""
+    v = pd.to_numeric(tidy[col], errors="coerce").dropna().to_numpy(dtype=np.float64)
+    if len(v) == 0:
+        return pd.DataFrame({"bin_start": [], "bin_end": [], "count": []})
+    lo, hi = np.floor(v.min()), np.ceil(v.max())
+    if np.all(v == np.round(v)) and hi - lo + 1 <= maxbins:
+        edges = np.arange(lo, hi + 2)
+    else:
+        edges = np.histogram_bin_edges(v, bins=maxbins)
+    cnt, edges = np.histogram(v, bins=edges)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": cnt})
+
+
+def _plain(out: pd.DataFrame, col: str) -> pd.DataFrame:
+    """category 라벨 컬럼(core.labels) → 문자열 (스냅샷 · 필터 경로 출력과 같은 dtype)"""
+    if isinstance(out[col].dtype, pd.CategoricalDtype):
+        out[col] = out[col].astype(str)
+    return out
+
+
+def users_by_plan_latest(tidy: pd.DataFrame, plan_col: str) -> pd.DataFrame:
+    """최신 월 기준 요금제별 고유 사용자 수 (plan_col, users)"""
+    latest = tidy["month"].max()
+    return _plain((
+        tidy[tidy["month"] == latest]
+        .groupby(plan_col, observed=True)["userid"].nunique()
+        .reset_index(name="users")
+        .sort_values("users", ascending=False)
+    ), plan_col)
+
+
+def revenue_by_plan(tidy: pd.DataFrame, plan_col: str) -> pd.DataFrame:
+    """요금제별 총 매출 (plan_col, revenue_sum)"""
+    rev_col = revenue_column(tidy)
+    return _plain((
+        tidy.groupby(plan_col, as_index=False, observed=True)[rev_col]
+        .sum().rename(columns={rev_col: "revenue_sum"})
+        .sort_values("revenue_sum", ascending=False)
+    ), plan_col)
+
+
+def na_top(tidy: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+    """결측 건수 상위 k개 (0건 컬럼 제외)"""
+    na = tidy.isna().sum().sort_values(ascending=False)
+    out = na[na > 0].head(k).reset_index()
+    out.columns = ["column", "na_cnt"]
+    return out
+
+
+def missing_rate_top(tidy: pd.DataFrame, k: int = 10) -> pd.DataFrame:
+    """결측 비율(%) 상위 k개"""
+    na = tidy.isna().sum().sort_values(ascending=False)
+    out = (na / len(tidy) * 100).head(k).reset_index()
+    out.columns = ["column", "missing_rate(%)"]
+    return out
+
+
+def total_revenue(tidy: pd.DataFrame) -> int:
+    vals = tidy.get("revenue_num", tidy.get("revenue", 0))
+    try:
+        return int(np.nansum(pd.to_numeric(vals, errors="coerce")))
+    except Exception:
+        return 0
+
+
+def plan_counts(tidy: pd.DataFrame, plan_col: str) -> pd.DataFrame:
+    out = tidy[plan_col].value_counts().reset_index()
+    out.columns = ["plan", "users"]
+    return _plain(out[out["users"] > 0], "plan")
+
+
+def device_top(tidy: pd.DataFrame, k: int = 5) -> pd.DataFrame:
+    out = tidy["spotify_listening_device"].value_counts().head(k).reset_index()
+    out.columns = ["device", "count"]
+    return _plain(out, "device")
+
+
+def time_slot_counts(tidy: pd.DataFrame, order=TIME_SLOT_ORDER) -> pd.DataFrame:
+    """시간대별 응답 수 — order 순서 적용, 없는 라벨은 제거"""
+    out = (
+        tidy["music_time_slot"]
+        .value_counts(dropna=False)
+        .rename_axis("time_slot")
+        .reset_index(name="users")
+    )
+    out["time_slot"] = pd.Categorical(out["time_slot"], categories=order, ordered=True)
+    return out.dropna(subset=["time_slot"]).sort_values("time_slot")
+
+
+SMARTPHONE_PAT = r"Smartphone|Mobile|Phone|휴대폰|스마트폰"
+
+
+def eda_insights(tidy: pd.DataFrame) -> list:
+    """EDA Summary Insight 문구 (Premium 비중 · 주 사용 기기 · 청취 시간대)"""
+    plan_col   = plan_column(tidy)
+    device_col = next((c for c in DEVICE_COLS if c in tidy.columns), None)
+    _counts = lambda col: tidy[col].dropna().astype(str).str.strip().value_counts()
+    return insights_from_counts(
+        len(tidy),
+        tidy[plan_col].value_counts() if plan_col else None,
+        _counts(device_col) if device_col else None,
+        _counts("music_time_slot") if "music_time_slot" in tidy.columns else None,
+    )
+
+
+def insights_from_counts(n_rows: int, plan_vc, device_vc, slot_vc) -> list:
+    """값별 건수(Series: 라벨 → 건수)만으로 인사이트 문구 생성 — 필터 인덱스 경로와 공용"""
+    ins = []
+
+    # ① Premium 비중 문구
+    if plan_vc is not None and plan_vc.sum() > 0:
+        is_premium = labels.is_premium(plan_vc.index)
+        prem_ratio = float(plan_vc[is_premium].sum() / n_rows)  # 0~1
+        prem_pct = prem_ratio * 100.0
+        if prem_ratio >= 0.50:
+            ins.append(f"Premium 비중 {prem_pct:.1f}%.")
+        else:
+            ins.append(f"대다수가 Free이며, Premium 비중은 {prem_pct:.1f}%입니다.")
+    else:
+        ins.append("요금제 컬럼이 없어 비중을 계산하지 못했습니다.")
+
+    # ② 주 사용 기기 (스마트폰 우선)
+    if device_vc is not None and device_vc.sum() > 0:
+        smart = device_vc.index.str.contains(SMARTPHONE_PAT, case=False)
+        smart_ratio = device_vc[smart].sum() / device_vc.sum()
+        if smart_ratio >= 0.60:
+            ins.append(f"스마트폰 사용이 압도적입니다(약 {smart_ratio * 100.0:.1f}%).")
+        else:
+            vc = device_vc.sort_values(ascending=False)
+            ins.append(f"가장 많이 쓰는 기기는 {vc.index[0]}(약 {float(vc.iloc[0] / vc.sum())*100:.1f}%)입니다.")
+    else:
+        ins.append("주 사용 기기 정보를 찾지 못했습니다.")
+
+    # ③ 청취 시간대 한 줄 요약
+    if slot_vc is not None and slot_vc.sum() > 0:
+        ins.append(f"청취는 {slot_vc.idxmax()} 시간대가 가장 활발합니다.")
+    return ins
+
+
+def overview(tidy: pd.DataFrame) -> dict:
+    """Dataset Overview 카드 요약값"""
+    has_month = "month" in tidy.columns
+    return {"n_rows": len(tidy), "n_cols": tidy.shape[1],
+            "month_min": tidy["month"].min() if has_month else "—",
+            "month_max": tidy["month"].max() if has_month else "—",
+            "n_users": tidy["userid"].nunique() if "userid" in tidy.columns else 0}
+
+
+def dataset_tab(tidy: pd.DataFrame) -> dict:
+    """Dataset 탭 차트 집계 일괄 (벤치마크용 묶음)"""
+    plan_col = plan_column(tidy)
+    out = {"monthly_revenue": monthly_revenue(tidy), "na_top": na_top(tidy),
+           "total_revenue": total_revenue(tidy), "n_users": tidy["userid"].nunique()}
+    if plan_col:
+        out["users_by_plan_latest"] = users_by_plan_latest(tidy, plan_col)
+        out["revenue_by_plan"] = revenue_by_plan(tidy, plan_col)
+    return out
@@ -0,0 +1,159 @@
+"""두 앱 · 섹션이 같이 쓰는 데이터 진입점 (캐시 네임스페이스 하나)
+
+st.cache_*의 캐시 키는 함수가 정의된 모듈/이름 기준이다. 로더를 앱 파일마다 따로 정의하면
+같은 서버 프로세스에서도 spotify.py · spotify_v2.py가 각자 cold 로드를 한다.
+여기 한 곳에 두면 어느 앱/섹션이 먼저 불러도 나머지는 데운 캐시를 그대로 쓴다.
+
+스냅샷(core.snapshot, `python -m tools.snapshot`)이 있으면 필터 없는 화면은 전부 스냅샷에서 그리고,
+원본(DataStore)은 필터를 걸거나 스냅샷에 없는 값을 요청할 때 처음 로드한다.
+"""
+import os
+
+import streamlit as st
+
+from core import (aggregates as agg, clusters, conversion, filters, perf, pipeline, profile, refresh, segtrends, snapshot,
+                  transitions)
+from core.loader import BASE, load_merged
+from core.store import DataStore
+
+EXPORT_DIR = BASE / "data"
+
+
+@perf.cache_resource(show_spinner=False)
+def load_store() -> DataStore:
+    """머지 데이터(xlsx 우선, 없으면 csv) → 프로세스 공용 DataStore (실제 로직은 core.loader)"""
+    df, source = load_merged(BASE)
+    return DataStore(df, source)
+
+
+def get_store() -> DataStore:
+    """load_store() + 파일이 없을 때 안내 후 중단. 디버그 패널에 캐시 통계 등록"""
+    try:
+        store = load_store()
+    except FileNotFoundError:
+        st.error("`spotify_merged.xlsx` 파일을 우선 찾고, 없으면 `spotify_merged.csv`를 찾습니다. 폴더(또는 data/raw)에 업로드해주세요.")
+        st.stop()
+    perf.register_stats("shared store (프로세스 공용 캐시)", store.stats)
+    return store
+
+
+@perf.cache_resource(show_spinner=False)
+def load_exports() -> dict:
+    """Revenue 입력(노트북 Step6 export CSV) — 프로세스에 한 번만 읽어 공유 (읽기 전용으로 쓸 것)"""
+    return pipeline.load_exports(str(EXPORT_DIR))
+
+
+# ---------- 스냅샷 ----------
+@perf.cache_resource(show_spinner=False)
+def load_snapshot():
+    """스냅샷 memory-map. 없음 · 깨짐 · 원본보다 낡음 · STAYORSKIP_SNAPSHOT=0 이면 None"""
+    if os.environ.get("STAYORSKIP_SNAPSHOT") == "0" or not snapshot.DEFAULT_PATH.exists():
+        return None
+    try:
+        snap = snapshot.Snapshot(snapshot.DEFAULT_PATH)
+    except (OSError, ValueError):
+        return None
+    return None if snap.is_stale(BASE) else snap
+
+
+def get_snapshot():
+    snap = load_snapshot()
+    if snap is not None:
+        perf.register_stats("snapshot", lambda: {"path": str(snap.path), "created": snap.manifest["created"],
+                                                 "frames": len(snap.manifest["frames"])})
+    return snap
+
+
+@perf.cache_resource(show_spinner=False)
+def load_profile():
+    """데이터 품질 프로파일 (`python -m tools.profile`). 없음 · 깨짐 · 원본보다 낡음이면 None"""
+    if not profile.DEFAULT_PATH.exists():
+        return None
+    try:
+        prof = profile.Profile(profile.DEFAULT_PATH)
+    except (OSError, ValueError, KeyError):
+        return None
+    return None if prof.is_stale(BASE) else prof
+
+
+def schema():
+    """컬럼 확인용 프레임 (스냅샷 모드면 0행 — 값이 필요하면 get_store())"""
+    snap = get_snapshot()
+    return snap.frame("schema") if snap is not None else get_store().df
+
+
+def filter_options():
+    """사이드바 필터 옵션 (.options(dim)) — 스냅샷이 있으면 원본을 읽지 않음"""
+    snap = get_snapshot()
+    return snap if snap is not None else filters.index_of(get_store())
+
+
+def view(sel: dict = None):
+    """Dataset / EDA 집계 뷰 — 필터가 없고 스냅샷이 있으면 스냅샷, 아니면 비트맵 인덱스(FilteredView)"""
+    snap = get_snapshot()
+    if snap is not None and not filters.normalize(sel, snap.value("options", {})):
+        return snapshot.SnapshotView(snap, lambda: filters.FilteredView(get_store(), None, load_profile()))
+    return filters.FilteredView(get_store(), sel, load_profile())
+
+
+@perf.cache_resource(show_spinner=False)
+def metrics() -> refresh.MetricsRefresher:
+    """Revenue 지표 번들 (프로세스 공용). 원본이 바뀌면 백그라운드로 다시 계산해 통째로 교체"""
+    snap = get_snapshot()
+    if snap is not None and refresh.complete(snap.exports()):
+        return refresh.MetricsRefresher(EXPORT_DIR, BASE, snap.exports(), snap.value("metrics_source"))
+    return refresh.MetricsRefresher(EXPORT_DIR, BASE, load_exports(), refresh.read_manifest(EXPORT_DIR).get("source"))
+
+
+def revenue_exports() -> dict:
+    mx = metrics()
+    perf.register_stats("metrics refresh", mx.status)
+    return mx.exports()
+
+
+def monthly_revenue_by_month():
+    snap = get_snapshot()
+    if snap is not None and "monthly_revenue_by_month" in snap:
+        return snap.frame("monthly_revenue_by_month")
+    return get_store().derive(agg.monthly_revenue_by_month)
+
+
+def premium_duration_hist(maxbins: int = 18):
+    """Premium 이용 개월 수 구간별 행 수 (Revenue 히스토그램 — 원본 행 대신 구간 개수만, 스냅샷이 있으면 스냅샷)"""
+    snap = get_snapshot()
+    if snap is not None and maxbins == 18 and "premium_duration_hist" in snap:
+        return snap.frame("premium_duration_hist")
+    return get_store().derive(agg.histogram, "premium_duration", maxbins)
+
+
+def plan_transitions():
+    """요금제 전이표 (core.transitions) — 스냅샷에 있으면 스냅샷, 아니면 공용 캐시에 한 번 계산"""
+    snap = get_snapshot()
+    if snap is not None and "plan_transitions" in snap:
+        return snap.frame("plan_transitions")
+    return get_store().derive(transitions.transition_table)
+
+
+def segment_trends() -> segtrends.SegmentTrends:
+    """취향 세그먼트 × 월 KPI 텐서 (core.segtrends) — 스냅샷에 있으면 스냅샷, 아니면 공용 캐시에 한 번 계산"""
+    snap = get_snapshot()
+    if snap is not None and "segment_trends" in snap:
+        return segtrends.from_frame(snap.frame("segment_trends"))
+    return get_store().derive(segtrends.build)
+
+
+def preference_clusters(k: int = clusters.K) -> dict:
+    """취향 클러스터 (core.clusters.run — model · labels · profile · centers), k마다 공용 캐시에 한 번"""
+    return get_store().derive(clusters.run, k)
+
+
+def conversion_events():
+    """유저별 첫 Free · 전환 월 인덱스 (core.conversion) — 공용 캐시에 한 번, 이후 분석은 이 배열만 사용"""
+    return get_store().derive(conversion.first_events)
+
+
+def conversion_segment(col: str):
+    """conversion_events() 유저 순서의 대표 세그먼트 값 (컬럼별 한 번)"""
+    store = get_store()
+    return store.memo(("conversion", "segment", col),
+                      lambda: conversion.user_segment(store.df, conversion_events(), col))
@@ -0,0 +1,46 @@
+"""이미지 에셋 레지스트리 (두 앱 · 섹션 공용)
+
+로컬(루트 → assets/ → StayOrSkip/) 순으로 찾고, 없으면 GitHub Raw에서 받는다.
+결과는 프로세스 캐시(st.cache_resource)에 한 번만 — 리런/세션마다 파일을 다시 읽거나
+네트워크(최대 6초)를 다시 타지 않는다.
+"""
+import base64
+from pathlib import Path
+
+from core import perf
+
+BASE = Path(__file__).resolve().parent.parent
+RAW_BASE = "https://raw.githubusercontent.com/twinklefins/modu_project/main/StayOrSkip"  # 본인 레포 경로
+SEARCH_DIRS = ["", "assets", "StayOrSkip"]
+BLANK_PIXEL = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///ywAAAAAAQABAAACAUwAOw=="  # 빈 투명 픽셀(1x1)
+
+
+def _candidates(name: str):
+    """'StayOrSkip/x.png', 'assets/x.png'처럼 폴더가 붙어 와도 파일명 기준으로 함께 탐색"""
+    names = [name] + ([Path(name).name] if Path(name).name != name else [])
+    return [BASE / d / n for n in names for d in SEARCH_DIRS]
+
+
+@perf.cache_resource(show_spinner=False)
+def asset_bytes(name: str):
+    """에셋 원본 바이트 (못 찾으면 None)"""
+    for p in _candidates(name):
+        try:
+            return p.read_bytes()
+        except OSError:
+            pass
+    try:
+        import urllib.request
+        with urllib.request.urlopen(f"{RAW_BASE}/{Path(name).name}", timeout=6) as resp:
+            return resp.read()
+    except Exception:
+        return None
+
+
+@perf.cache_resource(show_spinner=False)
+def datauri(name: str) -> str:
+    """<img src=...>용 data URI (못 찾으면 빈 픽셀)"""
+    b = asset_bytes(name)
+    if not b:
+        return BLANK_PIXEL
+    return "data:image/png;base64," + base64.b64encode(b).decode("ascii")
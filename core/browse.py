@@ -0,0 +1,139 @@
+"""행 단위 데이터 브라우저 (서버 쪽 페이지네이션 · 정렬 · 컬럼 필터)
+
+브라우저에는 요청한 페이지의 행 · 컬럼만 보낸다. 무거운 부분은 DataStore 공용 캐시에 한 번만:
+- 정렬 순서: 컬럼별 argsort (factorize 코드 위에서 — 문자열 비교 없이 정수 정렬, 결측은 항상 맨 뒤)
+- 컬럼 필터: (컬럼, 연산자, 값)별 bool 마스크
+- 사이드바 필터: core.filters 비트맵 인덱스 그대로
+이후 페이지 이동은 캐시된 행 번호 배열을 자르고 그 행만 iloc으로 꺼내는 비용뿐이다.
+"""
+import numpy as np
+import pandas as pd
+
+from core import filters
+from core.store import _key
+
+OPS = ("contains", "=", "!=", ">", ">=", "<", "<=")
+PAGE_SIZES = (25, 50, 100, 200)
+
+
+def _sort_order(df: pd.DataFrame, col: str, ascending: bool) -> np.ndarray:
+    s = df[col]
+    try:
+        codes, _ = pd.factorize(s, sort=True)  # 결측 → -1
+    except TypeError:  # 섞인 타입(str · float 등) object 컬럼은 문자열로 비교 (결측은 그대로 결측)
+        codes, _ = pd.factorize(s.astype(str).where(s.notna()), sort=True)
+    k = int(codes.max()) + 1 if len(codes) else 0
+    key = codes if ascending else (k - 1 - codes)
+    key = np.where(codes < 0, k, key)  # 결측은 방향과 무관하게 맨 뒤
+    return np.argsort(key, kind="stable")
+
+
+def _col_mask(df: pd.DataFrame, col: str, op: str, value: str) -> np.ndarray:
+    s = df[col]
+    if op == "contains":
+        return s.astype(str).str.contains(value, case=False, regex=False, na=False).to_numpy(bool)
+    num = pd.to_numeric(pd.Series([value]), errors="coerce").iloc[0]
+    if pd.api.types.is_numeric_dtype(s) and pd.notna(num):
+        lhs, rhs = s, num
+    else:  # 문자열 비교 (결측은 어떤 조건에도 안 걸림)
+        lhs, rhs = s.astype(str).where(s.notna()), str(value)
+    res = {"=": lhs == rhs, "!=": lhs != rhs, ">": lhs > rhs, ">=": lhs >= rhs,
+           "<": lhs < rhs, "<=": lhs <= rhs}[op]
+    return (res & s.notna()).to_numpy(bool)
+
+
+def take_arrow(s: pd.Series, idx: np.ndarray):
+    """s의 idx 행 → pyarrow 배열. Arrow 컬럼은 청크별로 — ChunkedArray.take는 컬럼 전체를 이어 붙인 뒤 자른다"""
+    import pyarrow as pa
+    if not isinstance(s.array, pd.arrays.ArrowExtensionArray):
+        return pa.Array.from_pandas(s.take(idx))
+    chunks = s.array.__arrow_array__().chunks
+    if len(chunks) <= 1:
+        return chunks[0].take(pa.array(idx)) if chunks else pa.array([], s.array.__arrow_array__().type)
+    starts = np.cumsum([0] + [len(c) for c in chunks])
+    which = np.searchsorted(starts, idx, side="right") - 1
+    parts, order = [], []
+    for ci in np.unique(which):
+        pos = np.flatnonzero(which == ci)
+        parts.append(chunks[ci].take(pa.array(idx[pos] - starts[ci])))
+        order.append(pos)
+    inv = np.empty(len(idx), dtype=np.int64)
+    inv[np.concatenate(order)] = np.arange(len(idx))
+    return pa.concat_arrays(parts).take(pa.array(inv))
+
+
+def _take(s: pd.Series, idx: np.ndarray) -> pd.Series:
+    """행 몇 개만 꺼냄 (화면용 — dtype 유지)"""
+    if not isinstance(s.array, pd.arrays.ArrowExtensionArray):
+        return s.take(idx)
+    vals = take_arrow(s, idx).to_numpy(zero_copy_only=False)
+    return pd.Series(vals, index=s.index[idx], name=s.name, dtype=s.dtype)
+
+
+def take_rows(df: pd.DataFrame, idx: np.ndarray, columns) -> pd.DataFrame:
+    return pd.DataFrame({c: _take(df[c], idx) for c in columns})
+
+
+def normalize_filters(col_filters, columns) -> tuple:
+    """[(컬럼, 연산자, 값), ...] → 유효한 것만 (빈 값 · 없는 컬럼 · 모르는 연산자 제외)"""
+    out = []
+    for col, op, value in col_filters or ():
+        value = "" if value is None or pd.isna(value) else str(value).strip()
+        if col in columns and op in OPS and value:
+            out.append((col, op, value))
+    return tuple(out)
+
+
+class RowBrowser:
+    """필터(사이드바 선택 + 컬럼 필터) · 정렬 하나에 대한 행 번호 배열 → page(i)"""
+
+    def __init__(self, store, sel: dict = None, col_filters=(), sort: str = None, ascending: bool = True):
+        self.store = store
+        self.index = filters.index_of(store)
+        self.sel = self.index.normalize(sel)
+        self.col_filters = normalize_filters(col_filters, self.index.columns)
+        self.sort = sort if sort in self.index.columns else None
+        self.ascending = bool(ascending)
+        self._idx = None
+
+    def _memo(self, name, fn, *args):
+        return self.store.memo(("browse", name) + args, lambda: fn(self.store.df, *args))
+
+    def _mask(self):
+        m = self.index.rows(self.index.mask(self.sel))
+        for f in self.col_filters:
+            fm = self._memo("mask", _col_mask, *f)
+            m = fm if m is None else (m & fm)
+        return m
+
+    def _rows(self) -> np.ndarray:
+        m = self._mask()
+        if self.sort is None:
+            return None if m is None else np.flatnonzero(m)  # None = 원본 순서 전체 (배열을 만들지 않음)
+        order = self._memo("order", _sort_order, self.sort, self.ascending)
+        return order if m is None else order[m[order]]
+
+    def rows(self):
+        """조건에 맞는 행 번호 (정렬 순서, None = 전체 행 원본 순서). 같은 조건은 공용 캐시에서"""
+        if self._idx is None:
+            if not (self.sel or self.col_filters or self.sort):
+                return None
+            key = ("browse", "rows", _key(self.sel), self.col_filters, self.sort, self.ascending)
+            self._idx = self.store.memo(key, self._rows)
+        return self._idx
+
+    def total(self) -> int:
+        idx = self.rows()
+        return self.index.n if idx is None else len(idx)
+
+    def n_pages(self, size: int) -> int:
+        return max(1, -(-self.total() // size))
+
+    def page(self, i: int, size: int = PAGE_SIZES[0], columns=None) -> pd.DataFrame:
+        """i번째 페이지(0부터)의 행 · 컬럼만 꺼냄. 인덱스는 원본 행 번호"""
+        i = min(max(int(i), 0), self.n_pages(size) - 1)
+        idx = self.rows()
+        idx = np.arange(i * size, min((i + 1) * size, self.index.n)) if idx is None else idx[i * size:(i + 1) * size]
+        df = self.store.df
+        cols = [c for c in (columns or df.columns) if c in df.columns]
+        return take_rows(df, idx, cols)
@@ -0,0 +1,311 @@
+"""차트 백엔드 — 모든 차트는 브라우저(Vega-Lite)에서 그리고, 서버는 집계 프레임과 캐시된 스펙 골격만 보낸다
+
+차트 종류별 템플릿(line · bar · hbar · histogram · heatmap · donut · bar_trend · scatter)은 데이터 대신
+이름(alt.NamedData)을 참조하는 Altair 차트를 돌려주고, 그 스펙(JSON 문자열)은 (템플릿, 파라미터, 활성 Altair 테마)마다
+프로세스에 한 번만 만든다. Altair 객체 생성 + to_dict()(스키마 검증 · 테마 병합)에 차트당 10~20ms가 들기 때문.
+렌더는 골격 복사 + datasets 주입뿐이고, 히스토그램도 구간별 개수(aggregates.histogram)만 보낸다:
+
+    charts.show("hbar", plan_rev, x="revenue_sum", y="plan", x_title="Revenue (₩)")
+    charts.show("bar_trend", monthly, x="month", y="revenue", window=3)   # 막대 + 이동 평균 선이 같은 데이터셋 참조
+    charts.spec("line", {"data": df}, x="month", y="arpu")                 # st.vega_lite_chart에 넘길 dict
+    export_buttons("arpu", df, png=charts.rasterizer("line", df, x="month", y="arpu"))   # PNG는 클릭할 때만
+
+datasets의 DataFrame은 Streamlit이 Arrow로 proto.datasets에 따로 싣는다(스펙 JSON에 값이 인라인되지 않음).
+한 스펙 안에서 같은 이름을 여러 레이어가 참조하면 데이터는 한 번만 간다. 서로 다른 차트 요소끼리는
+Streamlit이 데이터셋을 공유하지 않으므로, 같은 데이터의 변형(합계 막대 · 이동 평균 등)은 한 템플릿의 레이어로 묶는다.
+스펙 문자열이 리런마다 같아서, 데이터도 같으면 Streamlit 메시지 캐시가 재전송을 건너뛴다.
+
+서버 래스터화(png)는 내보내기 버튼을 눌렀을 때만 하고 결과를 데이터 지문으로 캐시한다 — 리런마다 그리는 일은 없다.
+vl-convert(선택 의존성)가 있으면 같은 스펙을 그대로, 없으면 matplotlib으로 기본 템플릿만 그린다(그때만 import).
+"""
+import hashlib, io, json, threading
+from collections import OrderedDict
+
+import altair as alt
+import pandas as pd
+
+from core import perf
+from core.ui import GREEN, MINT
+
+DATA = "data"  # 템플릿이 참조하는 기본 데이터셋 이름
+
+TEMPLATES = {}  # 이름 → 파라미터를 받아 alt.Chart를 돌려주는 함수
+_skeletons = {}  # (이름, 파라미터, 테마) → 스펙 JSON 문자열
+_lock = threading.Lock()
+_stats = {"compiled": 0, "hits": 0, "png": 0, "png_hits": 0}
+PNG_CACHE = 32  # 보관할 PNG 수 (데이터 지문 기준 LRU)
+_png = OrderedDict()
+
+
+def template(fn):
+    """템플릿 등록 데코레이터 (함수 이름 = 템플릿 이름)"""
+    TEMPLATES[fn.__name__] = fn
+    return fn
+
+
+def _freeze(v):
+    if isinstance(v, dict):
+        return tuple(sorted((k, _freeze(x)) for k, x in v.items()))
+    if isinstance(v, (list, tuple)):
+        return tuple(_freeze(x) for x in v)
+    return v
+
+
+def skeleton(kind: str, **params) -> str:
+    """템플릿 스펙(JSON 문자열) — 처음 한 번만 Altair로 만들고 검증"""
+    key = (kind, _freeze(params), alt.themes.active)
+    with _lock:
+        raw = _skeletons.get(key)
+        if raw is not None:
+            _stats["hits"] += 1
+            return raw
+    raw = json.dumps(TEMPLATES[kind](**params).to_dict())
+    with _lock:
+        _skeletons[key] = raw
+        _stats["compiled"] += 1
+    return raw
+
+
+def spec(kind: str, data, **params) -> dict:
+    """골격 복사 + datasets 주입. data는 DataFrame(기본 이름) 또는 {이름: DataFrame}"""
+    out = json.loads(skeleton(kind, **params))  # 새 dict — Streamlit이 스펙 일부를 고쳐 써도 골격은 그대로
+    out["datasets"] = dict(data) if isinstance(data, dict) else {params.get("data", DATA): data}
+    return out
+
+
+def show(kind: str, data, name: str = None, **params):
+    """템플릿 차트 렌더 (perf.vega_lite_chart — 렌더 시간 계측)"""
+    return perf.vega_lite_chart(spec(kind, data, **params), name=name)
+
+
+def stats() -> dict:
+    with _lock:
+        return {**_stats, "templates": len(_skeletons), "png_cached": len(_png)}
+
+
+# ---------- 서버 래스터화 (내보내기 전용) ----------
+def _fingerprint(data) -> str:
+    frames = data if isinstance(data, dict) else {DATA: data}
+    h = hashlib.blake2b(digest_size=16)
+    for name in sorted(frames):
+        df = frames[name]
+        h.update(name.encode())
+        h.update("|".join(map(str, df.columns)).encode())
+        h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def inline(spec_: dict) -> dict:
+    """datasets의 DataFrame → JSON 값 배열 (브라우저 밖 렌더러 · 정적 리포트용)"""
+    spec_["datasets"] = {k: json.loads(v.to_json(orient="records", date_format="iso"))
+                         for k, v in spec_["datasets"].items()}
+    return spec_
+
+
+def png(kind: str, data, **params) -> bytes:
+    """같은 템플릿 스펙을 서버에서 PNG로 — vl-convert가 있으면 그대로, 없으면 matplotlib(기본 템플릿만).
+    (템플릿, 파라미터, 데이터 지문)마다 한 번만 그리고 LRU에 보관"""
+    key = (kind, _freeze(params), _fingerprint(data))
+    with _lock:
+        if key in _png:
+            _png.move_to_end(key)
+            _stats["png_hits"] += 1
+            return _png[key]
+    try:
+        import vl_convert as vlc
+        out = vlc.vegalite_to_png(json.dumps(inline(spec(kind, data, **params))), scale=2)
+    except ImportError:
+        out = _raster_mpl(kind, data if not isinstance(data, dict) else data[params.get("data", DATA)], params)
+    with _lock:
+        _png[key] = out
+        _stats["png"] += 1
+        while len(_png) > PNG_CACHE:
+            _png.popitem(last=False)
+    return out
+
+
+def rasterizer(kind: str, data, **params):
+    """클릭했을 때만 PNG를 만드는 0-인자 함수 (ui.export_buttons(png=...)에 넘김)"""
+    return lambda: png(kind, data, **params)
+
+
+def _raster_mpl(kind: str, df: pd.DataFrame, p: dict) -> bytes:
+    from core import ui
+    plt = ui.pyplot()
+    fig, ax = plt.subplots(figsize=(7, 3.6))
+    color = p.get("color", GREEN)
+    if kind == "line" and p.get("series"):
+        for key, g in df.groupby(p["series"], sort=False):
+            ax.plot(g[p["x"]].astype(str), g[p["y"]], marker="o", label=str(key))
+        ax.legend()
+    elif kind == "line":
+        xs = df[p["x"]] if p.get("x_type") == "T" else df[p["x"]].astype(str)
+        ax.plot(xs, df[p["y"]], marker="o" if p.get("points", True) else None, color=color)
+    elif kind == "bar":
+        ax.bar(df[p["x"]].astype(str), df[p["y"]], color=color)
+    elif kind == "hbar":
+        d = df.sort_values(p["x"])
+        ax.barh(d[p["y"]].astype(str), d[p["x"]], color=color)
+    elif kind == "histogram":
+        ax.bar(df["bin_start"], df["count"], width=df["bin_end"] - df["bin_start"], align="edge", color=color)
+    elif kind == "heatmap":
+        grid = df.pivot(index=p["y"], columns=p["x"], values=p["value"])
+        ax.imshow(grid.to_numpy(dtype=float), cmap="Greens", aspect="auto")
+        ax.set_xticks(range(grid.shape[1]), [str(c) for c in grid.columns])
+        ax.set_yticks(range(grid.shape[0]), [str(i) for i in grid.index])
+    else:
+        plt.close(fig)
+        raise ValueError(f"vl-convert 없이 PNG로 내보낼 수 없는 템플릿: {kind}")
+    if p.get("y_domain"):
+        ax.set_ylim(*p["y_domain"])
+    ax.set_xlabel(p.get("x_title") or ""); ax.set_ylabel(p.get("y_title") or "")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+
+perf.register_stats("chart templates (프로세스 공용 스펙 골격)", stats)
+
+
+# ---------- 공통 조각 ----------
+def _tooltip(fields):
+    """((필드:타입, 제목, 포맷 or None), ...) → alt.Tooltip 목록"""
+    return [alt.Tooltip(f, title=t, format=fmt) if fmt else alt.Tooltip(f, title=t) for f, t, fmt in fields]
+
+
+def _axis(fmt=None, label_limit=None, **kwargs) -> alt.Axis:
+    if fmt:
+        kwargs["format"] = fmt
+    if label_limit:
+        kwargs["labelLimit"] = label_limit
+    return alt.Axis(**kwargs)
+
+
+def _finish(chart, height: int, axis_color: str = None, grid: float = None):
+    chart = chart.properties(height=height)
+    if axis_color is None:
+        return chart
+    return chart.configure_axis(labelColor=axis_color, titleColor=axis_color,
+                                **({"grid": True, "gridOpacity": grid} if grid else {}))
+
+
+# ---------- 템플릿 ----------
+@template
+def line(x, y, x_type="N", x_title=None, y_title=None, fmt=",.0f", axis_format=None, y_domain=None, sort=None,
+         series=None, palette=None, color=GREEN, points=True, point_size=None, stroke_width=None, zoom=False,
+         tooltip=None, height=320, axis_color=None, grid=None, data=DATA):
+    """선 (x: 월 · 시간대 · 날짜). 범주형 x는 데이터 순서(sort로 지정 가능), series가 있으면 계열별 색(palette)
+    zoom=True면 x 구간 선택 + 확대/이동"""
+    point = alt.OverlayMarkDef(filled=True, **({"fill": color} if not series else {}),
+                               **({"size": point_size} if point_size else {})) if points else False
+    mark = dict(point=point, **({"color": color} if not series else {}),
+                **({"strokeWidth": stroke_width} if stroke_width else {}))
+    enc = dict(
+        x=alt.X(f"{x}:{x_type}", sort=(list(sort) if sort else None) if x_type != "T" else alt.Undefined,
+                title=x_title, axis=alt.Axis(labelAngle=0, labelOverlap=False if x_type != "T" else alt.Undefined)),
+        y=alt.Y(f"{y}:Q", title=y_title, axis=_axis(axis_format),
+                scale=alt.Scale(domain=list(y_domain)) if y_domain else alt.Undefined),
+        tooltip=_tooltip(tooltip or ((f"{x}:{x_type}", x_title or x, None),
+                                     *(((f"{series}:N", series, None),) if series else ()),
+                                     (f"{y}:Q", y_title or y, fmt))))
+    if series:
+        enc["color"] = alt.Color(f"{series}:N", title=None, scale=alt.Scale(domain=list(palette[0]), range=list(
+            palette[1])) if palette else alt.Undefined)
+    ch = alt.Chart(alt.NamedData(data)).mark_line(**mark).encode(**enc)
+    if zoom:
+        ch = ch.interactive().add_params(alt.selection_interval(encodings=["x"]))
+    return _finish(ch, height, axis_color, grid)
+
+
+@template
+def bar(x, y, x_type="N", x_title=None, y_title=None, fmt=",.0f", axis_format=None, sort=None, color=GREEN,
+        tooltip=None, height=320, data=DATA):
+    """세로 막대 (x: 범주 · 순서형, 데이터 순서)"""
+    ch = alt.Chart(alt.NamedData(data)).mark_bar(color=color).encode(
+        x=alt.X(f"{x}:{x_type}", sort=list(sort) if sort else None, title=x_title,
+                axis=alt.Axis(labelAngle=0, labelLimit=2000)),
+        y=alt.Y(f"{y}:Q", title=y_title, axis=_axis(axis_format)),
+        tooltip=_tooltip(tooltip or ((f"{x}:{x_type}", x_title or x, None), (f"{y}:Q", y_title or y, fmt))))
+    return _finish(ch, height)
+
+
+@template
+def histogram(x_title=None, y_title=None, fmt=",.0f", color=GREEN, height=320, data=DATA):
+    """미리 센 구간 막대 (aggregates.histogram 출력: bin_start · bin_end · count) — 원본 행은 보내지 않음"""
+    ch = alt.Chart(alt.NamedData(data)).mark_bar(color=color, binSpacing=1).encode(
+        x=alt.X("bin_start:Q", bin="binned", title=x_title), x2="bin_end:Q",
+        y=alt.Y("count:Q", title=y_title),
+        tooltip=_tooltip((("bin_start:Q", "from", None), ("bin_end:Q", "to", None), ("count:Q", y_title or "count", fmt))))
+    return _finish(ch, height)
+
+
+@template
+def hbar(x, y, x_title=None, y_title=None, fmt=",.0f", axis_format=None, label_limit=None, color=GREEN,
+         tooltip=None, height=220, axis_color=None, data=DATA):
+    """값 큰 순 가로 막대 (y: 범주, x: 값)"""
+    ch = alt.Chart(alt.NamedData(data)).mark_bar(color=color).encode(
+        x=alt.X(f"{x}:Q", title=x_title, axis=_axis(axis_format)),
+        y=alt.Y(f"{y}:N", sort="-x", title=None, axis=_axis(label_limit=label_limit)),
+        tooltip=_tooltip(tooltip or ((f"{y}:N", y_title or y, None), (f"{x}:Q", x_title or x, fmt))))
+    return _finish(ch, height, axis_color)
+
+
+@template
+def donut(theta, color, scheme="greens", inner=60, tooltip=None, height=280, data=DATA):
+    """비중 도넛 (범례 없음 — 툴팁으로)"""
+    ch = alt.Chart(alt.NamedData(data)).mark_arc(innerRadius=inner).encode(
+        theta=alt.Theta(f"{theta}:Q"),
+        color=alt.Color(f"{color}:N", scale=alt.Scale(scheme=scheme), legend=None),
+        tooltip=_tooltip(tooltip or ((f"{color}:N", color, None), (f"{theta}:Q", theta, ",.0f"))))
+    return _finish(ch, height)
+
+
+@template
+def heatmap(x, y, value, x_type="N", x_title=None, y_title=None, value_title=None, fmt=".1%", scheme="greens",
+            sort=None, domain=None, text=None, text_dark_above=None, tooltip=None, height=320, data=DATA):
+    """범주 × 범주 색칠 격자 (경과 개월 등 숫자 x는 x_type="O"). sort = 두 축 공용 범주 순서, domain = 색 범위
+    text="포맷"이면 칸마다 값 글자를 겹쳐 쓰고(같은 데이터셋), 값이 text_dark_above보다 크면 글자를 어둡게"""
+    order = list(sort) if sort else alt.Undefined
+    base = alt.Chart(alt.NamedData(data)).encode(
+        x=alt.X(f"{x}:{x_type}", title=x_title, sort=order, axis=alt.Axis(labelAngle=0)),
+        y=alt.Y(f"{y}:N", title=y_title, sort=order))
+    ch = base.mark_rect().encode(
+        color=alt.Color(f"{value}:Q", title=value_title,
+                        scale=alt.Scale(scheme=scheme, **({"domain": list(domain)} if domain else {}))),
+        tooltip=_tooltip(tooltip or ((f"{x}:{x_type}", x_title or x, None), (f"{y}:N", y_title or y, None),
+                                     (f"{value}:Q", value_title or value, fmt))))
+    if text:
+        label = base.mark_text(fontSize=14, fontWeight="bold").encode(
+            text=alt.Text(f"{value}:Q", format=text),
+            color=(alt.condition(f"datum['{value}'] > {text_dark_above}", alt.value("#121212"), alt.value("#F9FCF9"))
+                   if text_dark_above is not None else alt.value("#F9FCF9")))
+        return alt.layer(ch, label).properties(height=height)
+    return _finish(ch, height)
+
+
+@template
+def bar_trend(x, y, window=3, x_title=None, y_title=None, trend_title=None, fmt=",.0f", axis_format=None,
+              color=GREEN, trend_color=MINT, height=320, data=DATA):
+    """세로 막대 + 최근 window개 이동 평균 선 — 두 레이어가 같은 데이터셋을 참조(데이터는 한 번 전송)"""
+    trend_title = trend_title or f"{window}개월 이동 평균"
+    base = alt.Chart(alt.NamedData(data)).encode(
+        x=alt.X(f"{x}:N", title=x_title, axis=alt.Axis(labelAngle=0, labelLimit=2000)))
+    bars = base.mark_bar(color=color, opacity=0.85).encode(
+        y=alt.Y(f"{y}:Q", title=y_title, axis=_axis(axis_format)),
+        tooltip=_tooltip(((f"{x}:N", x_title or x, None), (f"{y}:Q", y_title or y, fmt))))
+    trend = base.transform_window(trend=f"mean({y})", frame=[-(window - 1), 0], sort=[{"field": x}]).mark_line(
+        color=trend_color, strokeWidth=2.5, point=alt.OverlayMarkDef(filled=True, fill=trend_color)).encode(
+        y=alt.Y("trend:Q"), tooltip=_tooltip(((f"{x}:N", x_title or x, None), ("trend:Q", trend_title, fmt))))
+    return alt.layer(bars, trend).properties(height=height)
+
+
+@template
+def scatter(x, y, x_title=None, y_title=None, x_domain=None, axis_format=None, size=140, color=GREEN,
+            tooltip=None, height=320, data=DATA):
+    """점 산포"""
+    ch = alt.Chart(alt.NamedData(data)).mark_circle(size=size, color=color).encode(
+        x=alt.X(f"{x}:Q", title=x_title, scale=alt.Scale(domain=list(x_domain)) if x_domain else alt.Undefined),
+        y=alt.Y(f"{y}:Q", title=y_title, axis=_axis(axis_format)),
+        tooltip=_tooltip(tooltip or ((f"{x}:Q", x_title or x, None), (f"{y}:Q", y_title or y, ",.0f"))))
+    return _finish(ch, height)
@@ -0,0 +1,258 @@
+"""취향 클러스터 — 설문 취향 변수 전체로 유저를 k개 묶음으로 (k-modes, Hamming 거리)
+
+pref_summary는 변수 하나씩 본다. 여기서는 유저의 최신 월 취향값(pipeline.latest_prefs) 15개를 정수 코드로 바꾸고
+k-modes로 묶는다: 거리 = 서로 다른 변수 수, 중심(mode) = 클러스터 안에서 변수마다 가장 흔한 값.
+범주형 설문에는 one-hot k-means보다 자연스럽고, 중심이 "변수 = 값" 조합이라 그대로 읽힌다.
+
+한 반복은 유저 청크(CHUNK명)마다 (배정, (클러스터, 변수, 값) 카운트)를 내고 카운트를 더해 mode를 갱신하는 map-reduce다.
+workers > 1이고 유저가 min_users 이상이면 청크를 프로세스 풀(pipeline._mp_context)에서 돈다.
+
+    model, labels = fit(prefs, k=6)          # prefs = latest_prefs(tidy) · labels = (userid, cluster, distance)
+    model.assign(new_prefs)                  # 새 유저 배정만 (재학습 없음 — 청크 × k × 변수 비교)
+    model.update(new_prefs)                  # 배정 + 카운트 누적 → mode만 다시 (전체 재학습 없이 중심 이동)
+    profile(tidy, labels, model)             # 클러스터별 users · LTV · Premium 기간 · 전환율 · 유지율 · ARPU · 특징 값
+    model.save(path) / load(path)
+
+결측 취향값은 MISSING 라벨 하나로 센다. 학습 때 없던 값은 코드 -1(모든 mode와 불일치)로 배정한다.
+"""
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import pipeline, segtrends
+from core.loader import BASE
+
+K = 6
+CHUNK = 65_536
+MAX_ITER = 30
+MIN_USERS = 500_000  # 이보다 적으면 워커 기동 · 코드 전송 비용이 더 큼
+MISSING = "(결측)"
+DEFAULT_PATH = BASE / "artifacts" / "clusters" / "model.npz"
+
+
+# ---------- 청크 연산 (워커에서도 돎) ----------
+def _assign_chunk(codes: np.ndarray, modes: np.ndarray):
+    """(n, p) 코드 × (k, p) mode → 가장 가까운 클러스터 · 불일치 변수 수"""
+    d = (codes[:, None, :] != modes[None, :, :]).sum(axis=2, dtype=np.int16)
+    lab = d.argmin(axis=1)
+    return lab.astype(np.int32), d[np.arange(len(d)), lab]
+
+
+def _count_chunk(codes: np.ndarray, lab: np.ndarray, k: int, width: int) -> np.ndarray:
+    """(클러스터, 변수, 값) 카운트 (k, p, width) — 코드 -1(처음 보는 값)은 세지 않음"""
+    p = codes.shape[1]
+    cell = (lab[:, None].astype(np.int64) * p + np.arange(p)) * width + codes
+    cell = cell[codes >= 0]
+    return np.bincount(cell, minlength=k * p * width).reshape(k, p, width)
+
+
+def _step(codes: np.ndarray, modes: np.ndarray, width: int):
+    lab, dist = _assign_chunk(codes, modes)
+    return lab, dist, _count_chunk(codes, lab, len(modes), width)
+
+
+def _chunks(codes: np.ndarray, chunk: int) -> list:
+    return [codes[i:i + chunk] for i in range(0, max(len(codes), 1), chunk)]
+
+
+# ---------- 모델 ----------
+class KModes:
+    """cols: 변수 · categories: 변수별 값 라벨(문자열) · modes: (k, p) 코드 · counts: (k, p, width) 누적 카운트"""
+
+    def __init__(self, cols, categories, modes: np.ndarray, counts: np.ndarray, chunk: int = CHUNK):
+        self.cols, self.categories = list(cols), [list(c) for c in categories]
+        self.modes, self.counts, self.chunk = modes, counts, chunk
+        self._lookup = [{v: i for i, v in enumerate(c)} for c in self.categories]
+
+    @property
+    def k(self) -> int:
+        return len(self.modes)
+
+    @property
+    def width(self) -> int:
+        return self.counts.shape[2]
+
+    def sizes(self) -> np.ndarray:
+        """클러스터별 유저 수 (아무 변수 하나의 카운트 합 — 처음 보는 값 배정분은 빠질 수 있음)"""
+        return self.counts.sum(axis=2).max(axis=1)
+
+    def encode(self, prefs: pd.DataFrame) -> np.ndarray:
+        """취향 프레임 → (n, p) int16 코드 (없는 컬럼 · 처음 보는 값 = -1)"""
+        codes = np.full((len(prefs), len(self.cols)), -1, np.int16)
+        for j, (col, lookup) in enumerate(zip(self.cols, self._lookup)):
+            if col in prefs.columns:
+                vals, inv = np.unique(_labels(prefs[col]), return_inverse=True)
+                codes[:, j] = np.array([lookup.get(v, -1) for v in vals], np.int16)[inv]
+        return codes
+
+    def assign(self, prefs: pd.DataFrame) -> pd.DataFrame:
+        """새 유저 배정 (userid, cluster, distance) — mode는 그대로"""
+        lab, dist = self._assign(self.encode(prefs))
+        return _label_frame(prefs, lab, dist)
+
+    def update(self, prefs: pd.DataFrame) -> pd.DataFrame:
+        """배정 후 카운트를 더하고 mode를 다시 뽑는다(재학습 없이 새 유저를 반영). 배정 결과 반환"""
+        codes = self.encode(prefs)
+        lab, dist = self._assign(codes)
+        self.counts = self.counts + _count_chunk(codes, lab, self.k, self.width)
+        self.modes = _modes(self.counts, self.modes)
+        return _label_frame(prefs, lab, dist)
+
+    def _assign(self, codes: np.ndarray):
+        parts = [_assign_chunk(c, self.modes) for c in _chunks(codes, self.chunk)]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    def centers(self) -> pd.DataFrame:
+        """클러스터 × 변수 mode 라벨 · 클러스터 안 비율(purity)"""
+        rows = []
+        sizes = np.maximum(self.sizes(), 1)
+        for c in range(self.k):
+            for j, col in enumerate(self.cols):
+                m = int(self.modes[c, j])
+                rows.append({"cluster": c, "variable": col, "value": self.categories[j][m],
+                             "share": self.counts[c, j, m] / sizes[c]})
+        return pd.DataFrame(rows, columns=["cluster", "variable", "value", "share"])
+
+    # ---- 저장 ----
+    def save(self, path=DEFAULT_PATH) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = json.dumps({"cols": self.cols, "categories": self.categories}, ensure_ascii=False)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            np.savez_compressed(f, modes=self.modes, counts=self.counts, meta=np.array(meta))
+        tmp.replace(path)
+        return path
+
+
+def load(path=DEFAULT_PATH) -> KModes:
+    with np.load(path) as z:
+        meta = json.loads(str(z["meta"]))
+        return KModes(meta["cols"], meta["categories"], z["modes"], z["counts"])
+
+
+def _labels(s: pd.Series) -> np.ndarray:
+    """값 → 라벨 문자열 (결측 = MISSING, 4.0 같은 정수 실수는 '4')"""
+    out = s.astype(object).where(s.notna(), MISSING)
+    return np.array([str(int(v)) if isinstance(v, float) and v.is_integer() else str(v) for v in out], dtype=object)
+
+
+def _label_frame(prefs: pd.DataFrame, lab: np.ndarray, dist: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({"userid": prefs["userid"].to_numpy(), "cluster": lab, "distance": dist.astype(np.int16)})
+
+
+def _modes(counts: np.ndarray, old: np.ndarray) -> np.ndarray:
+    """카운트 → mode. 빈 클러스터는 이전 mode 유지"""
+    new = counts.argmax(axis=2).astype(np.int16)
+    empty = counts.sum(axis=2).max(axis=1) == 0
+    new[empty] = old[empty]
+    return new
+
+
+def _init(codes: np.ndarray, k: int, seed: int) -> np.ndarray:
+    """k-means++ 방식 시작 mode (Hamming 거리 비례 추첨, 표본 최대 2만 명)"""
+    rng = np.random.default_rng(seed)
+    sample = codes[rng.choice(len(codes), min(len(codes), 20_000), replace=False)]
+    modes = [sample[rng.integers(len(sample))]]
+    dist = (sample != modes[0]).sum(axis=1).astype(np.float64)
+    for _ in range(1, k):
+        total = dist.sum()
+        i = rng.choice(len(sample), p=dist / total) if total > 0 else rng.integers(len(sample))
+        modes.append(sample[i])
+        dist = np.minimum(dist, (sample != sample[i]).sum(axis=1))
+    return np.array(modes, np.int16)
+
+
+# ---------- 학습 ----------
+def fit(prefs: pd.DataFrame, k: int = K, cols=pipeline.PREF_COLS, max_iter: int = MAX_ITER, seed: int = 42,
+        workers: int = None, chunk: int = CHUNK, min_users: int = MIN_USERS):
+    """유저별 취향(userid + cols) → (KModes, 배정 프레임). 배정이 더 바뀌지 않거나 max_iter면 멈춤"""
+    cols = [c for c in cols if c in prefs.columns]
+    if not cols or len(prefs) == 0:
+        raise ValueError("클러스터링할 취향 컬럼 · 유저가 없습니다.")
+    k = max(1, min(k, len(prefs)))
+    categories = [sorted(set(_labels(prefs[c]))) for c in cols]
+    width = max(len(c) for c in categories)
+    model = KModes(cols, categories, np.zeros((k, len(cols)), np.int16), np.zeros((k, len(cols), width), np.int64),
+                   chunk)
+    codes = model.encode(prefs)
+    modes = _init(codes, k, seed)
+    workers = pipeline.WORKERS if workers is None else workers
+    pool = ProcessPoolExecutor(workers, mp_context=pipeline._mp_context()) \
+        if workers > 1 and len(codes) >= min_users else None
+    lab = None
+    try:
+        for _ in range(max_iter):
+            parts = _chunks(codes, chunk)
+            mapped = (pool.map(_step, parts, repeat(modes), repeat(width)) if pool is not None
+                      else map(_step, parts, repeat(modes), repeat(width)))
+            steps = list(mapped)
+            new = np.concatenate([s[0] for s in steps])
+            dist = np.concatenate([s[1] for s in steps])
+            counts = sum(s[2] for s in steps)
+            modes, moved = _modes(counts, modes), lab is None or bool((new != lab).any())
+            lab = new
+            if not moved:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    model.modes, model.counts = modes, counts
+    lab, dist = model._assign(codes)  # 마지막 mode 기준 거리
+    return model, _label_frame(prefs, lab, dist)
+
+
+def user_prefs(tidy: pd.DataFrame, cols=pipeline.PREF_COLS) -> pd.DataFrame:
+    return pipeline.latest_prefs(tidy, cols).reset_index(drop=True)
+
+
+# ---------- 클러스터 요약 ----------
+def signature(model: KModes, top: int = 3) -> list:
+    """클러스터마다 전체 대비 가장 두드러진 mode 값 top개 ("변수=값" 문자열, lift 큰 순)"""
+    total = model.counts.sum(axis=0)
+    overall = total / np.maximum(total.sum(axis=1, keepdims=True), 1)  # (변수, 값) 전체 비율
+    out = []
+    for c, row in enumerate(model.centers().groupby("cluster", sort=True)):
+        cen = row[1].reset_index(drop=True)
+        base = np.array([overall[j, model.modes[c, j]] for j in range(len(model.cols))])
+        lift = cen["share"].to_numpy() / np.maximum(base, 1e-9)
+        keep = [j for j in np.argsort(-lift, kind="stable") if cen.loc[j, "value"] != MISSING][:top]
+        out.append(" · ".join(f"{cen.loc[j, 'variable']}={cen.loc[j, 'value']}" for j in keep))
+    return out
+
+
+def profile(tidy: pd.DataFrame, labels: pd.DataFrame, model: KModes = None) -> pd.DataFrame:
+    """클러스터별 users · share · avg_ltv · avg_premium_duration · avg_monthly_revenue · free_to_premium_rate
+    · premium_retention(월→다음 달, 구간 합산) · arpu (+ model이 있으면 signature) — LTV 큰 순"""
+    prep = pipeline.prepare(tidy)
+    ltv = pipeline.user_rollups(prep).merge(labels[["userid", "cluster"]], on="userid", how="inner")
+    out = ltv.groupby("cluster").agg(
+        users=("userid", "nunique"), avg_ltv=("ltv", "mean"), avg_premium_duration=("premium_duration", "mean"),
+        avg_monthly_revenue=("avg_monthly_revenue", "mean"), free_to_premium_rate=("is_free_to_premium", "mean"),
+    ).reset_index()
+    out["share"] = out["users"] / out["users"].sum()
+    # 유지율 · ARPU: 클러스터를 세그먼트 하나로 보는 segtrends 카운트 (유저 → 클러스터는 고정)
+    tagged = tidy.assign(cluster=tidy["userid"].map(labels.set_index("userid")["cluster"]))
+    tr = segtrends.build(tagged, cols=["cluster"])
+    ret, arpu = {}, {}
+    for c in out["cluster"]:
+        cnt = dict(zip(segtrends.COUNTS, tr.data[tr.row("cluster", c)].T))
+        prem = cnt["premium_users"][:-1].sum()
+        ret[c] = cnt["kept"][:-1].sum() / prem if prem else np.nan
+        arpu[c] = cnt["revenue"].sum() / cnt["revenue_rows"].sum() if cnt["revenue_rows"].sum() else np.nan
+    out["premium_retention"], out["arpu"] = out["cluster"].map(ret), out["cluster"].map(arpu)
+    if model is not None:
+        out["signature"] = out["cluster"].map(dict(enumerate(signature(model))))
+    return out.sort_values("avg_ltv", ascending=False, ignore_index=True)
+
+
+def run(tidy: pd.DataFrame, k: int = K, seed: int = 42, workers: int = None) -> dict:
+    """tidy → {"model", "labels", "profile", "centers"} (앱 · CLI 공용)"""
+    prefs = user_prefs(tidy)
+    model, labels = fit(prefs, k=k, seed=seed, workers=workers)
+    return {"model": model, "labels": labels, "profile": profile(tidy, labels, model),
+            "centers": model.centers()}
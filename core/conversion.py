@@ -0,0 +1,126 @@
+"""Free→Premium 전환 — 유저별 첫 이벤트 월 인덱스를 한 번 만들고 나머지는 전부 그 위에서
+
+행 배열을 두 번 훑는다(np.minimum.at): ① 유저별 첫 관측 월 · 첫 Free 월, ② 첫 Free 월 이후 첫 Premium 월(= 전환 월).
+유저 × 월 패널을 만들지 않으므로 메모리는 유저 수에 비례한다. 이후 분석은 유저 수 길이 정수 배열 연산뿐:
+
+    ev = first_events(tidy)              # userid · first_seen · first_free · converted (월 인덱스, 없으면 -1)
+    time_to_convert(ev)                  # 전환까지 걸린 개월 수 분포
+    cohort_table(ev)                     # 첫 Free 월 코호트 × 경과 개월 누적 전환율
+    by_segment(ev, user_segment(tidy, ev, "Gender"), window=3)
+    rolling(ev, window=3, span=3)        # 코호트별 window개월 내 전환율 + span 코호트 이동 평균
+
+월 라벨은 ev.attrs["months"] (인덱스 → "2023-01").
+"""
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg, labels
+
+NONE = -1
+
+
+def first_events(df: pd.DataFrame, plan_col: str = None) -> pd.DataFrame:
+    """유저별 첫 관측 · 첫 Free · 첫 전환(첫 Free 월보다 뒤의 첫 Premium) 월 인덱스"""
+    plan_col = plan_col or agg.plan_column(df)
+    users, user_labels = pd.factorize(df["userid"])
+    months, month_labels = pd.factorize(df["month"].astype(str), sort=True)
+    plans, plan_labels = pd.factorize(df[plan_col])
+    n, big = len(user_labels), np.iinfo(np.int32).max
+    ok = (users >= 0) & (months >= 0)
+    users, months, plans = users[ok], months[ok].astype(np.int32), plans[ok]
+    paid = np.zeros(len(plans), bool)
+    paid[plans >= 0] = labels.is_premium(plan_labels)[plans[plans >= 0]]
+    free = (plans >= 0) & ~paid
+
+    first_seen, first_free, converted = (np.full(n, big, np.int32) for _ in range(3))
+    np.minimum.at(first_seen, users, months)
+    np.minimum.at(first_free, users[free], months[free])
+    after = paid & (months > first_free[users])  # first_free가 없으면(big) 항상 False
+    np.minimum.at(converted, users[after], months[after])
+
+    out = pd.DataFrame({"userid": user_labels,
+                        **{k: np.where(v == big, NONE, v) for k, v in
+                           (("first_seen", first_seen), ("first_free", first_free), ("converted", converted))}})
+    out.attrs["months"] = [str(m) for m in month_labels]
+    return out
+
+
+def notebook_flag(ev: pd.DataFrame) -> np.ndarray:
+    """노트북 KPI 정의(첫 달 Free & 이후 어느 달이든 Premium)의 유저별 0/1 — pipeline의 is_free_to_premium과 같음"""
+    return ((ev["first_free"] == 0) & (ev["converted"] >= 0)).to_numpy().astype(int)
+
+
+def lag(ev: pd.DataFrame) -> np.ndarray:
+    """전환까지 걸린 개월 수 (전환 안 함 = -1)"""
+    return np.where(ev["converted"] >= 0, ev["converted"] - ev["first_free"], NONE)
+
+
+def time_to_convert(ev: pd.DataFrame) -> pd.DataFrame:
+    """전환 소요 개월 분포 (months_to_convert, users, share, cum_share) — share는 전환자 중 비중"""
+    d = lag(ev)
+    d = d[d > 0]
+    cnt = np.bincount(d, minlength=2)[1:] if len(d) else np.zeros(0, np.int64)
+    total = max(int(cnt.sum()), 1)
+    return pd.DataFrame({"months_to_convert": np.arange(1, len(cnt) + 1), "users": cnt,
+                         "share": cnt / total, "cum_share": np.cumsum(cnt) / total})
+
+
+def cohort_table(ev: pd.DataFrame) -> pd.DataFrame:
+    """첫 Free 월 코호트 × 경과 개월 k: k개월 안에 전환한 누적 비율 (cohort, cohort_users, lag, converted, rate).
+    관측 끝을 넘는 칸(코호트 월 + k > 마지막 월)은 빼서 미관측을 미전환으로 세지 않는다"""
+    months = ev.attrs["months"]
+    cohort = ev["first_free"].to_numpy()
+    d = lag(ev)
+    n_m = len(months)
+    has = cohort >= 0
+    size = np.bincount(cohort[has], minlength=n_m)
+    conv = d > 0
+    hits = np.zeros((n_m, n_m), np.int64)  # (코호트, lag) 전환 수
+    np.add.at(hits, (cohort[conv], d[conv]), 1)
+    cum = np.cumsum(hits, axis=1)
+    rows = [{"cohort": months[c], "cohort_users": int(size[c]), "lag": k, "converted": int(cum[c, k]),
+             "rate": cum[c, k] / size[c]}
+            for c in range(n_m) if size[c] for k in range(1, n_m - c)]
+    return pd.DataFrame(rows, columns=["cohort", "cohort_users", "lag", "converted", "rate"])
+
+
+def within(ev: pd.DataFrame, window: int = None) -> np.ndarray:
+    """첫 Free 이후 window개월 안에 전환했는지 (None = 관측 기간 전체)"""
+    d = lag(ev)
+    return (d > 0) if window is None else ((d > 0) & (d <= window))
+
+
+def rolling(ev: pd.DataFrame, window: int = 3, span: int = 3) -> pd.DataFrame:
+    """코호트별 window개월 내 전환율 + 최근 span개 코호트 가중 이동 평균.
+    window를 다 관측하지 못한 코호트는 complete=False (이동 평균에서 제외)"""
+    months = ev.attrs["months"]
+    cohort = ev["first_free"].to_numpy()
+    has = cohort >= 0
+    size = np.bincount(cohort[has], minlength=len(months))
+    hit = np.bincount(cohort[has & within(ev, window)], minlength=len(months))
+    out = pd.DataFrame({"cohort": months, "cohort_users": size, "converted": hit})
+    out["complete"] = np.arange(len(months)) + window <= len(months) - 1
+    out["rate"] = out["converted"] / out["cohort_users"].replace(0, np.nan)
+    full = out.where(out["complete"])
+    out["rolling_rate"] = (full["converted"].rolling(span, min_periods=1).sum()
+                           / full["cohort_users"].rolling(span, min_periods=1).sum()).where(out["complete"])
+    return out[out["cohort_users"] > 0].reset_index(drop=True)
+
+
+def user_segment(df: pd.DataFrame, ev: pd.DataFrame, col: str) -> np.ndarray:
+    """유저별 대표 세그먼트 값(가장 늦은 월의 결측 아닌 값) — ev 유저 순서에 맞춤"""
+    s = df[["userid", "month", col]].dropna(subset=[col])
+    last = s.sort_values("month").drop_duplicates("userid", keep="last").set_index("userid")[col]
+    return last.reindex(ev["userid"]).to_numpy()
+
+
+def by_segment(ev: pd.DataFrame, segment, window: int = None) -> pd.DataFrame:
+    """세그먼트별 (첫 Free가 있는 유저 중) 전환율 — segment는 ev 유저 순서의 라벨 배열"""
+    has = (ev["first_free"] >= 0).to_numpy()
+    codes, seg_labels = pd.factorize(pd.Series(segment)[has])
+    ok = codes >= 0
+    size = np.bincount(codes[ok], minlength=len(seg_labels))
+    hit = np.bincount(codes[ok & within(ev, window)[has]], minlength=len(seg_labels))
+    out = pd.DataFrame({"segment": seg_labels.astype(str), "users": size, "converted": hit})
+    out["rate"] = out["converted"] / out["users"]
+    return out.sort_values("rate", ascending=False, ignore_index=True)
@@ -0,0 +1,122 @@
+"""차트 데이터 · 필터된 행 내보내기 (CSV / Parquet, 청크 단위)
+
+차트 집계는 DataStore 캐시에 이미 있는 프레임을 그대로, 행 슬라이스는 공용 프레임에서
+CHUNK_ROWS 행씩 Arrow 테이블로 잘라(행 번호가 없으면 0-copy 슬라이스) 직렬화한다 — 중간에 pandas 사본을 만들지 않는다.
+청크의 Arrow 스키마는 전체 프레임 기준으로 한 번 정한다(한 청크에서 전부 결측인 object 컬럼이 null 타입이 되지 않게).
+CSV도 pyarrow.csv로 쓴다(Arrow 문자열 컬럼에서 DataFrame.to_csv보다 수 배 빠름).
+앱에서는 st.download_button에 함수로 넘겨 클릭 시 별도 스레드에서 만든다(스크립트 · 다른 세션을 막지 않음).
+st.download_button은 바이트 전체를 받으므로 to_bytes()는 파일 전체를 메모리에 모은다 — 스트리밍은 아니다.
+청크 단위로 바로 기록하는 것은 write()(파일 경로)뿐이다.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from core import browse
+
+CHUNK_ROWS = 100_000
+INFER_ROWS = 1_000  # object 컬럼 타입 추론에 보는 결측 아닌 값 수
+FORMATS = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _table(df: pd.DataFrame, schema=None):
+    import pyarrow as pa
+    return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+
+def schema_of(df: pd.DataFrame):
+    """전체 프레임 기준 Arrow 스키마 — dtype이 정해진 컬럼은 0행 변환으로, object 컬럼은 결측 아닌 값 일부로 추론
+    (전부 결측이면 string)"""
+    import pyarrow as pa
+    schema = pa.Schema.from_pandas(df.head(0), preserve_index=False).remove_metadata()
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            vals = df[field.name].dropna()
+            typ = pa.infer_type(vals.iloc[:INFER_ROWS].to_numpy(object)) if len(vals) else pa.string()
+            schema = schema.set(i, pa.field(field.name, pa.string() if pa.types.is_null(typ) else typ))
+    return schema
+
+
+def iter_tables(df: pd.DataFrame, rows=None, columns=None, chunk_rows: int = CHUNK_ROWS):
+    """df(또는 그중 rows 행)를 chunk_rows 행씩 Arrow 테이블로 (columns만, 모든 청크가 같은 스키마)"""
+    import pyarrow as pa
+    cols = [c for c in (columns or df.columns) if c in df.columns]
+    schema = schema_of(df[cols])
+    n = len(df) if rows is None else len(rows)
+    for lo in range(0, max(n, 1), chunk_rows):
+        if rows is None:
+            yield _table(df.iloc[lo:lo + chunk_rows][cols], schema)
+        else:
+            idx = np.asarray(rows[lo:lo + chunk_rows])
+            yield pa.table({c: browse.take_arrow(df[c], idx) for c in cols}).cast(schema)
+
+
+def _tables(data):
+    """DataFrame · Arrow 테이블 · 그 iterable → 테이블 iterable"""
+    if isinstance(data, pd.DataFrame):
+        return [_table(data)]
+    if hasattr(data, "schema") and hasattr(data, "num_rows"):
+        return [data]
+    return _frames_as_tables(data)
+
+
+def _frames_as_tables(data):
+    """프레임 청크는 첫 프레임의 schema_of()로 (첫 청크에서 전부 결측인 object 컬럼은 string)"""
+    schema = None
+    for t in data:
+        if isinstance(t, pd.DataFrame):
+            schema = schema_of(t) if schema is None else schema
+            t = _table(t, schema)
+        yield t
+
+
+def iter_csv(tables):
+    """테이블 청크 → CSV 바이트 청크 (첫 청크만 헤더, 엑셀에서 한글이 깨지지 않게 BOM)"""
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    first = True
+    for t in tables:
+        buf = pa.BufferOutputStream()
+        pcsv.write_csv(t, buf, pcsv.WriteOptions(include_header=first, quoting_style="needed"))
+        b = buf.getvalue().to_pybytes()
+        yield b"\xef\xbb\xbf" + b if first else b
+        first = False
+
+
+def iter_parquet(tables):
+    """테이블 청크 → Parquet 바이트 청크 (청크 = row group). 스키마는 첫 청크 것 — 이후 청크는 거기에 맞춰 캐스팅"""
+    import pyarrow.parquet as pq
+    buf, writer = io.BytesIO(), None
+    for t in tables:
+        if writer is None:
+            writer = pq.ParquetWriter(buf, t.schema)
+        elif not t.schema.equals(writer.schema):
+            t = t.cast(writer.schema)
+        writer.write_table(t)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if writer is not None:
+        writer.close()
+        yield buf.getvalue()
+
+
+def iter_bytes(data, fmt: str):
+    tables = _tables(data)
+    return iter_csv(tables) if fmt == "csv" else iter_parquet(tables)
+
+
+def to_bytes(data, fmt: str) -> bytes:
+    """DataFrame 또는 테이블 청크 iterable → 파일 내용 전체 (다운로드 버튼용 — 메모리에 모두 모음)"""
+    return b"".join(iter_bytes(data, fmt))
+
+
+def write(data, path, fmt: str = None) -> int:
+    """파일로 바로 (청크마다 기록 — 메모리에 전체를 들고 있지 않음). 쓴 바이트 수"""
+    fmt = fmt or ("parquet" if str(path).endswith(".parquet") else "csv")
+    n = 0
+    with open(path, "wb") as f:
+        for b in iter_bytes(data, fmt):
+            n += f.write(b)
+    return n
@@ -0,0 +1,445 @@
+"""사이드바 필터(월 · 요금제 · 연령 · 성별 · 기기 · 장르) 교차 필터링용 인덱스
+
+필터가 바뀔 때마다 tidy 프레임을 다시 자르면(df[mask]) 수백만 행에서 초 단위가 걸린다.
+FilterIndex는 데이터 로드 후 한 번만 만들어 DataStore에 고정(pin)해 두고,
+- 필터 값마다 행 비트맵(np.packbits): 같은 필터 안은 OR, 필터끼리는 AND → 마스크 결합이 ms 이하
+- 집계용 정수 코드(pd.factorize) + 컬럼별 결측 비트맵: 차트 집계를 np.bincount / popcount로
+  계산해 필터된 프레임을 만들지 않는다.
+- 고유 사용자 수: (월, 요금제[, 세그먼트]) 셀별 userid HyperLogLog(UserSketches) — 선택된 셀의 합집합만 추정.
+  정확한 값(요금제 × 사용자 bincount)은 STAYORSKIP_EXACT_DISTINCT=1 또는 FilteredView(exact=True)로.
+
+    view = FilteredView(store, {"month": ("2023-02", "2023-05"), "plan": [...], "device": ["Smartphone"]})
+    view.monthly_revenue()   # core.aggregates.monthly_revenue(필터된 tidy)와 같은 모양
+"""
+import os, re, threading
+
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg, sketch
+from core.store import _key
+
+# 필터 이름 → (컬럼 후보, 다중값 여부). 다중값("Smartphone, Computer")은 토큰 단위로 매칭
+FILTER_DIMS = {
+    "month":  (["month"], False),
+    "plan":   (agg.PLAN_COLS, False),
+    "Age":    (["Age"], False),
+    "Gender": (["Gender"], False),
+    "device": (agg.DEVICE_COLS, True),
+    "genre":  (["fav_music_genre"], False),
+}
+EXACT_DISTINCT = os.environ.get("STAYORSKIP_EXACT_DISTINCT") == "1"
+SKETCH_P = 14       # 셀당 레지스터 16,384개(16KB) — 표준오차 ≈ 0.8%, 수만 명 이하는 linear counting으로 거의 정확
+SKETCH_MAX_MB = 64  # 셀이 이보다 많은 세그먼트는 스케치 없이 정확 계산
+EXACT_USERS_MAX_ROWS = 200_000  # 선택된 행이 이 이하면 HLL 대신 np.unique로 정확히 (작은 표본에서 "≈519" 같은 오차 방지)
+
+
+def _popcount(packed: np.ndarray, axis=None):
+    if hasattr(np, "bitwise_count"):  # numpy 2.0+
+        return np.bitwise_count(packed).sum(axis=axis, dtype=np.int64)
+    return np.unpackbits(packed, axis=-1).sum(axis=axis, dtype=np.int64)
+
+
+def _codes(s: pd.Series, sort: bool = False):
+    """라벨 코드 + 1 (0 = 결측 → bincount 결과의 0번 칸을 버리면 됨).
+    기본은 첫 등장 순 — value_counts의 동률 순서와 맞추기 위함. category 컬럼(core.labels)은 코드를 그대로
+    (category value_counts의 동률 순서 = category 순서)"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return (s.cat.codes.to_numpy() + 1).astype(np.int32), pd.Index(s.cat.categories)
+    codes, labels = pd.factorize(s, sort=sort)
+    return (codes + 1).astype(np.int32), pd.Index(labels)
+
+
+def _bitmaps(codes: np.ndarray, k: int) -> np.ndarray:
+    """라벨별 행 비트맵 (k, ceil(n/8))"""
+    return np.stack([np.packbits(codes == i + 1) for i in range(k)]) if k else np.zeros((0, 0), np.uint8)
+
+
+def normalize(sel: dict, options: dict) -> dict:
+    """빈 선택 · 전체 범위 · 없는 라벨은 빼서 캐시 키를 맞춘다 (빈 dict = 전체).
+    options: 필터 이름 → 정렬된 라벨 (FilterIndex.options / 스냅샷에 저장된 값)"""
+    out = {}
+    for dim, val in (sel or {}).items():
+        labels = options.get(dim)
+        if not labels or not val:
+            continue
+        if dim == "month":
+            lo, hi = val
+            if (lo, hi) != (labels[0], labels[-1]):
+                out[dim] = (lo, hi)
+        else:
+            keep = sorted(v for v in set(val) if v in labels)
+            if keep and len(keep) < len(labels):
+                out[dim] = tuple(keep)
+    return out
+
+
+def _ordered(labels) -> list:
+    """사이드바 표시 순서 — 모든 라벨이 숫자로 시작하는 구간("6-12", "60+")이면 하한 숫자 순, 아니면 문자열 순"""
+    lead = lambda lab: re.match(r"\s*(\d+)", str(lab))
+    if labels and all(map(lead, labels)):
+        return sorted(labels, key=lambda lab: (int(lead(lab).group(1)), str(lab)))
+    return sorted(labels)
+
+
+class FilterIndex:
+    def __init__(self, tidy: pd.DataFrame):
+        self.n = len(tidy)
+        self.columns = list(tidy.columns)
+        self.plan_col = agg.plan_column(tidy)
+        self.rev_col = agg.revenue_column(tidy)
+
+        # 결측 비트맵 (컬럼, 행) — na_top / missing_rate_top 용
+        self.null_bm = np.stack([np.packbits(tidy[c].isna().to_numpy()) for c in self.columns])
+
+        # 집계용 코드
+        self.codes, self.labels, self.code_cols = {}, {}, {}
+        for name, col in [("month", "month"), ("plan", self.plan_col), ("userid", "userid"),
+                          ("device", "spotify_listening_device"), ("time_slot", "music_time_slot"),
+                          ("Age", "Age")]:
+            if col and col in tidy.columns:
+                self.codes[name], self.labels[name] = _codes(tidy[col], sort=(name == "month"))
+                self.code_cols[name] = col
+        rev = tidy[self.rev_col] if self.rev_col in tidy.columns else pd.Series(0.0, index=tidy.index)
+        self.revenue = pd.to_numeric(rev, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+
+        # 필터 값별 비트맵
+        self.dims, self.dim_cols = {}, {}
+        for dim, (cands, multi) in FILTER_DIMS.items():
+            col = next((c for c in cands if c in tidy.columns), None)
+            if col is None:
+                continue
+            self.dim_cols[dim] = col
+            codes, labels = (self.codes[dim], self.labels[dim]) if dim in self.codes else _codes(tidy[col])
+            raw = _bitmaps(codes, len(labels))
+            if multi:  # 원본 라벨을 토큰으로 쪼개 토큰별로 OR
+                split = [{t.strip() for t in str(lab).split(",") if t.strip()} for lab in labels]
+                tokens = sorted(set().union(*split)) if split else []
+                raw = np.stack([np.bitwise_or.reduce(raw[[i for i, s in enumerate(split) if t in s]], axis=0)
+                                for t in tokens]) if tokens else raw[:0]
+                labels = pd.Index(tokens)
+            self.dims[dim] = (list(labels), raw)
+
+    def options(self, dim: str) -> list:
+        return _ordered(self.dims[dim][0]) if dim in self.dims else []
+
+    def normalize(self, sel: dict) -> dict:
+        return normalize(sel, {dim: self.options(dim) for dim in self.dims})
+
+    def mask(self, sel: dict):
+        """선택 → 압축 비트맵 (None = 전체 행)"""
+        sel = self.normalize(sel)
+        packed = None
+        for dim, val in sel.items():
+            labels, bm = self.dims[dim]
+            if dim == "month":
+                lo, hi = val
+                idx = [i for i, m in enumerate(labels) if lo <= m <= hi]
+            else:
+                pos = {lab: i for i, lab in enumerate(labels)}
+                idx = [pos[v] for v in val]
+            dim_bm = np.bitwise_or.reduce(bm[idx], axis=0) if idx else np.zeros(bm.shape[1], np.uint8)
+            packed = dim_bm if packed is None else packed & dim_bm
+        return packed
+
+    def rows(self, packed) -> np.ndarray:
+        """압축 비트맵 → bool 마스크 (None = 전체)"""
+        if packed is None:
+            return None
+        return np.unpackbits(packed, count=self.n).view(bool)
+
+    def count(self, packed) -> int:
+        return self.n if packed is None else int(_popcount(packed))
+
+
+class UserSketches:
+    """(월, 요금제[, 세그먼트 하나]) 셀별 userid HLL 레지스터 — 셀을 골라 max 하면 어떤 필터 조합이든 고유 사용자 수.
+    userid 해시는 라벨마다 한 번만, 세그먼트 큐브는 그 세그먼트 필터가 처음 쓰일 때 만든다."""
+
+    def __init__(self, index: FilterIndex, tidy: pd.DataFrame, p: int = SKETCH_P):
+        self.index, self.tidy, self.p = index, tidy, p
+        users = index.codes["userid"]
+        self._ok = users > 0
+        self._hash = sketch.hash_values(index.labels["userid"])[users[self._ok] - 1]
+        self._cubes = {}
+        self._lock = threading.Lock()
+
+    def _axes(self, seg):
+        """[(필터 이름, 행별 코드(0 = 결측), 라벨)] — 월 · 요금제 (+ 세그먼트)"""
+        ix = self.index
+        axes = [(d, ix.codes[d], ix.labels[d]) for d in ("month", "plan") if d in ix.codes]
+        if seg is not None:
+            col = ix.dim_cols[seg]
+            codes, labels = ((ix.codes[seg], ix.labels[seg]) if ix.code_cols.get(seg) == col
+                             else _codes(self.tidy[col]))
+            axes.append((seg, codes, labels))
+        return axes
+
+    def cube(self, seg: str = None):
+        """(축 목록, 레지스터 (월+1, 요금제+1[, 세그먼트+1], m)) — 셀이 너무 많으면 None"""
+        if seg not in self._cubes:
+            with self._lock:
+                if seg not in self._cubes:
+                    axes = self._axes(seg)
+                    shape = tuple(len(lab) + 1 for _, _, lab in axes)
+                    n_cells = int(np.prod(shape))
+                    if n_cells << self.p > SKETCH_MAX_MB * 2**20:
+                        self._cubes[seg] = None
+                    else:
+                        cells = (np.ravel_multi_index([c[self._ok] for _, c, _ in axes], shape) if axes
+                                 else np.zeros(len(self._hash), np.intp))
+                        reg = sketch.registers(cells, self._hash, n_cells, self.p)
+                        self._cubes[seg] = (axes, reg.reshape(shape + (-1,)))
+        return self._cubes[seg]
+
+    @staticmethod
+    def _pick(dim, labels, val) -> np.ndarray:
+        """선택 → 축 위치 (0 = 결측 칸은 필터가 없을 때만 포함)"""
+        if val is None:
+            return np.arange(len(labels) + 1)
+        if dim == "month":
+            lo, hi = val
+            pos = [i for i, m in enumerate(labels) if lo <= m <= hi]
+        elif FILTER_DIMS[dim][1]:  # 다중값 라벨 — 선택한 토큰을 하나라도 포함하면
+            want = set(val)
+            pos = [i for i, lab in enumerate(labels) if want & {t.strip() for t in str(lab).split(",")}]
+        else:
+            want = set(val)
+            pos = [i for i, lab in enumerate(labels) if lab in want]
+        return np.asarray(pos, dtype=np.intp) + 1
+
+    def select(self, sel: dict):
+        """정규화된 선택 → {필터 이름: 고른 축 위치}, 레지스터 부분 배열. 세그먼트 필터가 둘 이상이면 None"""
+        segs = [d for d in sel if d not in ("month", "plan")]
+        if len(segs) > 1:
+            return None
+        c = self.cube(segs[0] if segs else None)
+        if c is None:
+            return None
+        axes, reg = c
+        picks = {d: self._pick(d, labels, sel.get(d)) for d, _, labels in axes}
+        return picks, reg[np.ix_(*picks.values())]
+
+
+class FilteredView:
+    """필터 선택 하나에 대한 Dataset / EDA 집계 (core.aggregates와 같은 출력 모양).
+    결과는 DataStore LRU에 (함수, 선택) 키로 공유된다."""
+
+    def __init__(self, store, sel: dict = None, profile=None, exact: bool = None):
+        self.store = store
+        self.index = index_of(store)
+        self.sel = self.index.normalize(sel)
+        self.profile = profile
+        # 월 범위만 골랐거나 선택이 없으면 결측 건수는 프로파일(core.profile) 월 통계를 합쳐서
+        self._pstats = profile.for_selection(self.sel) if profile is not None else None
+        self.exact = EXACT_DISTINCT if exact is None else bool(exact)
+        self.key = _key(self.sel)
+        self.packed = self.index.mask(self.sel)
+        self._rows = None
+        self._taken, self._counts = {}, {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.sel)
+
+    def _m(self):
+        if self._rows is None and self.packed is not None:
+            self._rows = self.index.rows(self.packed)
+        return self._rows
+
+    def _memo(self, name, fn, *args):
+        return self.store.memo(("filters", name, self.key, self.exact, args), lambda: fn(*args))
+
+    def _sketch(self):
+        """선택된 셀의 userid HLL 레지스터 (정확 모드 · 행이 EXACT_USERS_MAX_ROWS 이하 · 스케치로 답할 수 없는 조합이면 None)"""
+        if self.exact or "userid" not in self.index.codes or self.n_rows() <= EXACT_USERS_MAX_ROWS:
+            return None
+        return sketches_of(self.store).select(self.sel)
+
+    @property
+    def approx_users(self) -> bool:
+        """고유 사용자 수가 HLL 추정치인지 (화면 표기용)"""
+        return self._sketch() is not None
+
+    def _take(self, name):
+        """필터된 행의 코드 배열 (뷰마다 컬럼당 한 번만 자름)"""
+        if name not in self._taken:
+            c = self.index.revenue if name == "revenue" else self.index.codes[name]
+            m = self._m()
+            self._taken[name] = c if m is None else c[m]
+        return self._taken[name]
+
+    def _weights(self):
+        return self._take("revenue")
+
+    def _bins(self, name, weights=None) -> np.ndarray:
+        """라벨별 행 수 (weights가 있으면 합계). 결측 칸(0번)은 버림"""
+        k = len(self.index.labels[name]) + 1
+        if weights is not None:
+            return np.bincount(self._take(name), weights=weights, minlength=k)[1:]
+        if name not in self._counts:
+            self._counts[name] = np.bincount(self._take(name), minlength=k)[1:]
+        return self._counts[name]
+
+    def _value_counts(self, name) -> pd.Series:
+        """라벨별 행 수 (결측 제외, 0건 제외)"""
+        cnt = self._bins(name)
+        return pd.Series(cnt, index=self.index.labels[name])[cnt > 0]
+
+    # ---- 요약 ----
+    def n_rows(self) -> int:
+        return self.index.count(self.packed)
+
+    def overview(self) -> dict:
+        return self._memo("overview", self._overview)
+
+    def _overview(self):
+        ix = self.index
+        months = self._value_counts("month").index if "month" in ix.codes else []
+        n_users, sk = 0, self._sketch()
+        if sk is not None:
+            reg = sk[1]
+            n_users = int(round(sketch.estimate(reg.reshape(-1, reg.shape[-1]).max(axis=0)))) if reg.size else 0
+        elif "userid" in ix.codes:
+            users = self._take("userid")
+            n_users = int(np.unique(users[users > 0]).size)
+        return {"n_rows": self.n_rows(), "n_cols": len(ix.columns),
+                "month_min": months[0] if len(months) else "—",
+                "month_max": months[-1] if len(months) else "—", "n_users": n_users,
+                "n_users_approx": sk is not None}
+
+    def preview(self, k: int = 5) -> pd.DataFrame:
+        m = self._m()
+        tidy = self.store.df
+        return tidy.head(k) if m is None else tidy.take(np.flatnonzero(m)[:k])
+
+    # ---- Dataset 탭 ----
+    def monthly_revenue(self) -> pd.DataFrame:
+        return self._memo("monthly_revenue", self._monthly_revenue)
+
+    def _monthly_revenue(self):
+        ix = self.index
+        sums, cnt = self._bins("month", self._weights()), self._bins("month")
+        out = pd.DataFrame({"month_dt": pd.to_datetime(ix.labels["month"].astype(str) + "-01", errors="coerce"),
+                            ix.rev_col: sums})[cnt > 0]
+        return out.groupby("month_dt", as_index=False)[ix.rev_col].sum()
+
+    def users_by_plan_latest(self, plan_col: str) -> pd.DataFrame:
+        return self._memo("users_by_plan_latest", self._users_by_plan_latest, plan_col)
+
+    def _users_by_plan_latest(self, plan_col):
+        ix = self.index
+        sk = self._sketch()
+        if sk is not None and {"month", "plan"} <= set(sk[0]):
+            return self._users_by_plan_latest_hll(plan_col, *sk)
+        present = np.flatnonzero(self._bins("month"))
+        latest = present[-1] + 1 if len(present) else -1  # month 코드는 정렬돼 있음
+        ok = self._take("month") == latest
+        plan, user = self._take("plan")[ok], self._take("userid")[ok]
+        # (요금제, 사용자) 쌍을 bincount → 요금제별로 0이 아닌 사용자 수 = nunique (정렬 없이)
+        k, u = len(ix.labels["plan"]) + 1, len(ix.labels["userid"]) + 1
+        pairs = np.bincount(plan.astype(np.int64) * u + user, minlength=k * u).reshape(k, u)
+        cnt = np.count_nonzero(pairs[1:, 1:], axis=1)
+        out = pd.DataFrame({plan_col: ix.labels["plan"], "users": cnt})[cnt > 0]
+        return out.sort_values("users", ascending=False)
+
+    def _users_by_plan_latest_hll(self, plan_col, picks, reg):
+        """최신 월 = 레지스터가 비어 있지 않은 마지막 월 칸, 요금제 칸마다 (세그먼트 칸 합집합) 추정"""
+        m = reg.shape[-1]
+        filled = np.flatnonzero(reg.reshape(reg.shape[0], -1).any(axis=1) & (picks["month"] > 0))
+        plans = picks["plan"]
+        keep = plans > 0  # 요금제 결측 칸 제외
+        if not len(filled) or not keep.any():
+            return pd.DataFrame({plan_col: pd.Series(dtype=object), "users": pd.Series(dtype="int64")})
+        latest = reg[filled[-1]][keep]
+        cnt = np.rint(sketch.estimate(latest.reshape(len(latest), -1, m).max(axis=1))).astype(np.int64)
+        out = pd.DataFrame({plan_col: self.index.labels["plan"][plans[keep] - 1], "users": cnt})[cnt > 0]
+        return out.sort_values("users", ascending=False)
+
+    def revenue_by_plan(self, plan_col: str) -> pd.DataFrame:
+        return self._memo("revenue_by_plan", self._revenue_by_plan, plan_col)
+
+    def _revenue_by_plan(self, plan_col):
+        ix = self.index
+        sums, cnt = self._bins("plan", self._weights()), self._bins("plan")
+        out = pd.DataFrame({plan_col: ix.labels["plan"], "revenue_sum": sums})[cnt > 0]
+        return out.sort_values("revenue_sum", ascending=False)
+
+    def _na_counts(self) -> pd.Series:
+        if self._pstats is not None:
+            return self.profile.null_counts(self._pstats).reindex(self.index.columns, fill_value=0)
+        ix = self.index
+        bm = ix.null_bm if self.packed is None else ix.null_bm & self.packed
+        return pd.Series(_popcount(bm, axis=1), index=ix.columns)
+
+    def na_top(self, k: int = 5) -> pd.DataFrame:
+        return self._memo("na_top", self._na_top, k)
+
+    def _na_top(self, k):
+        na = self._na_counts().sort_values(ascending=False)
+        out = na[na > 0].head(k).reset_index()
+        out.columns = ["column", "na_cnt"]
+        return out
+
+    def total_revenue(self) -> int:
+        return self._memo("total_revenue", lambda: int(self._weights().sum()))
+
+    # ---- EDA 탭 ----
+    def missing_rate_top(self, k: int = 10) -> pd.DataFrame:
+        return self._memo("missing_rate_top", self._missing_rate_top, k)
+
+    def _missing_rate_top(self, k):
+        na = self._na_counts().sort_values(ascending=False)
+        out = (na / max(self.n_rows(), 1) * 100).head(k).reset_index()
+        out.columns = ["column", "missing_rate(%)"]
+        return out
+
+    def plan_counts(self, plan_col: str = None) -> pd.DataFrame:
+        return self._memo("plan_counts", self._plan_counts)
+
+    def _plan_counts(self):
+        out = self._value_counts("plan").sort_values(ascending=False, kind="stable").reset_index()
+        out.columns = ["plan", "users"]
+        return out
+
+    def device_top(self, k: int = 5) -> pd.DataFrame:
+        return self._memo("device_top", self._device_top, k)
+
+    def _device_top(self, k):
+        out = self._value_counts("device").sort_values(ascending=False, kind="stable").head(k).reset_index()
+        out.columns = ["device", "count"]
+        return out
+
+    def time_slot_counts(self, order=agg.TIME_SLOT_ORDER) -> pd.DataFrame:
+        return self._memo("time_slot_counts", self._time_slot_counts, tuple(order))
+
+    def _time_slot_counts(self, order):
+        out = self._value_counts("time_slot").sort_values(ascending=False, kind="stable").rename_axis("time_slot")
+        out = out.reset_index(name="users")
+        out["time_slot"] = pd.Categorical(out["time_slot"], categories=list(order), ordered=True)
+        return out.dropna(subset=["time_slot"]).sort_values("time_slot")
+
+    def eda_insights(self) -> list:
+        return self._memo("eda_insights", self._eda_insights)
+
+    def _eda_insights(self):
+        ix = self.index
+
+        def stripped(name):
+            if name not in ix.codes:
+                return None
+            vc = self._value_counts(name)
+            return vc.groupby(vc.index.astype(str).str.strip()).sum()
+
+        plan_vc = self._value_counts("plan") if "plan" in ix.codes else None
+        return agg.insights_from_counts(self.n_rows(), plan_vc, stripped("device"), stripped("time_slot"))
+
+
+def index_of(store) -> FilterIndex:
+    """DataStore에 고정된 FilterIndex (프로세스당 한 번 생성)"""
+    return store.pin("filters", FilterIndex)
+
+
+def sketches_of(store) -> UserSketches:
+    """DataStore에 고정된 UserSketches (처음 필요할 때 생성)"""
+    return store.pin("user_sketches", lambda df: UserSketches(index_of(store), df))
@@ -0,0 +1,86 @@
+"""라벨 정규화 — 요금제 · 기기 · 청취 빈도 표기 변형을 수집(tidy_up) 때 한 번 정식 라벨 category로
+
+원본 xlsx는 "Premium (paid subscription)", 정리본은 "Premium"처럼 같은 값이 파일마다 다르게 적혀 있고,
+다중값 컬럼은 "Office hours,Study Hours" · "While Traveling, " 같이 공백 · 빈 토큰이 섞여 있다.
+고유 라벨(수십 개)마다 정식 라벨을 한 번 정하고 행은 코드만 다시 매핑하므로(category remap) 행 수와 무관하다.
+이후 코드는 Premium 여부를 문자열 정규식 대신 category 코드 → 룩업 배열로 본다:
+
+    df = normalize(df)                  # loader.tidy_up이 호출
+    premium_mask(df["subscription_plan"])   # 행별 bool (코드 룩업)
+    is_premium(labels)                  # 라벨 배열 → bool (value_counts 인덱스 등)
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+PLAN_COL = "subscription_plan"
+PLAN_COLS = [PLAN_COL, "spotify_subscription_plan"]
+PREMIUM, FREE = "Premium", "Free"
+
+# 알려진 요금제 표기 (소문자 · 앞뒤 공백 제거 후 비교). 목록에 없으면 "premium" / "free" 포함 여부로
+PLAN_ALIASES = {
+    "premium (paid subscription)": PREMIUM, "premium": PREMIUM, "paid": PREMIUM,
+    "free (ad-supported)": FREE, "free": FREE, "ad-supported": FREE,
+}
+DEVICE_COLS = ["spotify_listening_device", "listening_device", "device"]
+MULTI_COLS = DEVICE_COLS + ["music_lis_frequency"]  # 콤마 구분 다중값
+SINGLE_COLS = ["pod_lis_frequency"]
+
+_SPACES = re.compile(r"\s+")
+
+
+def canonical_plan(label) -> str:
+    s = _SPACES.sub(" ", str(label)).strip()
+    key = s.lower()
+    if key in PLAN_ALIASES:
+        return PLAN_ALIASES[key]
+    if "premium" in key:
+        return PREMIUM
+    if "free" in key:
+        return FREE
+    return s
+
+
+def canonical_multi(label) -> str:
+    """토큰 앞뒤 공백 · 빈 토큰 · 중복 토큰 제거 후 ", "로 다시 잇기 (순서는 원본 그대로)"""
+    tokens = (_SPACES.sub(" ", t).strip() for t in str(label).split(","))
+    return ", ".join(dict.fromkeys(t for t in tokens if t))
+
+
+def canonical_single(label) -> str:
+    return _SPACES.sub(" ", str(label)).strip()
+
+
+def remap(s: pd.Series, fn) -> pd.Series:
+    """고유 라벨마다 fn 한 번 → 정렬된 정식 라벨 category (결측 유지)"""
+    codes, uniq = pd.factorize(s)
+    canon = pd.Index([fn(u) for u in uniq], dtype=object)
+    cats = pd.Index(sorted(set(canon)))
+    lut = np.append(cats.get_indexer(canon), -1)  # codes == -1(결측) → 마지막 칸 -1
+    return pd.Series(pd.Categorical.from_codes(lut[codes], cats), index=s.index, name=s.name)
+
+
+def normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """요금제 · 다중값 · 빈도 컬럼을 정식 라벨 category로. subscription_plan이 없으면 spotify_subscription_plan을 복사"""
+    if PLAN_COL not in df.columns and PLAN_COLS[1] in df.columns:
+        df[PLAN_COL] = df[PLAN_COLS[1]]
+    for cols, fn in ((PLAN_COLS, canonical_plan), (MULTI_COLS, canonical_multi), (SINGLE_COLS, canonical_single)):
+        for c in cols:
+            if c in df.columns and not pd.api.types.is_numeric_dtype(df[c]):
+                df[c] = remap(df[c], fn)
+    return df
+
+
+def is_premium(labels) -> np.ndarray:
+    """요금제 라벨 배열 → Premium 여부"""
+    return np.array([canonical_plan(v) == PREMIUM for v in labels], dtype=bool)
+
+
+def premium_mask(s: pd.Series) -> np.ndarray:
+    """행별 Premium 여부 — category면 코드 룩업, 아니면 고유값만 판정 (결측 = False)"""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, cats = s.cat.codes.to_numpy(), s.cat.categories
+    else:
+        codes, cats = pd.factorize(s)
+    return np.append(is_premium(cats), False)[codes]
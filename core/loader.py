@@ -0,0 +1,136 @@
+"""머지 데이터 로더 — 앱(load_data)과 벤치마크가 같은 경로를 탄다
+
+원본은 spotify_merged.xlsx → csv → 월 파티션 저장소(data/parts, core.partitions) 순서로 찾는다.
+월 범위 · 요금제만 필요하면 load_months()가 파티션 저장소에서 걸리는 파일만 읽는다.
+"""
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from core import labels, perf
+
+BASE = Path(__file__).resolve().parent.parent  # 레포 루트(StayOrSkip)
+
+MERGED_XLSX = "spotify_merged.xlsx"
+MERGED_CSV = "spotify_merged.csv"
+CLEANED_CSV = "spotify_cleaned_final_v2.csv"  # 노트북 Step2~5 입력 (메트릭 파이프라인)
+PARTS_MANIFEST = Path("data") / "parts" / "_manifest.json"  # core.partitions.DEFAULT_DIR / MANIFEST
+
+
+def find_merged(base: Path = BASE):
+    """spotify_merged.xlsx 우선, 없으면 동일 스키마 CSV(루트 → data/raw), 그것도 없으면 파티션 저장소 manifest.
+    못 찾으면 None"""
+    xlsx = base / MERGED_XLSX
+    if xlsx.exists():
+        return xlsx
+    cands = [base / MERGED_CSV, base / "data" / "raw" / MERGED_CSV, base / PARTS_MANIFEST]
+    return next((p for p in cands if p.exists()), None)
+
+
+def is_parts(path) -> bool:
+    return Path(path).name == PARTS_MANIFEST.name
+
+
+def read_merged(path: Path) -> pd.DataFrame:
+    path = Path(path)
+    if is_parts(path):
+        from core import partitions
+        return partitions.scan(path.parent)
+    if path.suffix == ".xlsx":
+        return pd.read_excel(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def iter_merged(path: Path, chunk_rows: int = 200_000):
+    """원본을 chunk_rows 행씩 (tidy_up 적용). CSV/Parquet은 스트리밍, xlsx는 통째로 읽어 자름"""
+    path = Path(path)
+    if is_parts(path):
+        from core import partitions
+        yield from partitions.iter_parts(path.parent)
+        return
+    if path.suffix == ".csv":
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            yield tidy_up(chunk)
+        return
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield tidy_up(batch.to_pandas())
+        return
+    df = tidy_up(read_merged(path))
+    for lo in range(0, len(df), chunk_rows):
+        yield df.iloc[lo:lo + chunk_rows]
+
+
+def to_revenue_num(s: pd.Series) -> pd.Series:
+    """문자형 매출(₩, 콤마, 원) → float. 이미 숫자면 그대로 캐스팅"""
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    cleaned = s.astype(str).str.replace(r"[^0-9.\-]", "", regex=True)
+    return pd.to_numeric(cleaned.where(cleaned != "", np.nan), errors="coerce")
+
+
+def tidy_up(df: pd.DataFrame, normalize: bool = True) -> pd.DataFrame:
+    """최소 정리: revenue → revenue_num, month → str, 요금제 · 기기 · 빈도 라벨 → 정식 라벨 category (core.labels)
+    normalize=False면 라벨은 원본 그대로 (메트릭 파이프라인 입력 — 설문 그룹이 노트북과 같아야 함)"""
+    if "revenue" in df.columns and "revenue_num" not in df.columns:
+        df["revenue_num"] = to_revenue_num(df["revenue"])
+    if "month" in df.columns:
+        df["month"] = df["month"].astype(str)
+    return labels.normalize(df) if normalize else df
+
+
+def load_merged(base: Path = BASE):
+    """(df, source) 반환. source는 'xlsx' / 'csv' / 'parquet' / 'parts'"""
+    path = find_merged(base)
+    if path is None:
+        raise FileNotFoundError("spotify_merged.xlsx(우선) 또는 spotify_merged.csv 를 찾지 못했습니다.")
+    source = "parts" if is_parts(path) else path.suffix.lstrip(".")
+    with perf.timer(f"read_merged[{source}]", "io"):
+        df = read_merged(path)
+    with perf.timer("tidy_up", "io"):
+        df = tidy_up(df)
+    return df, source
+
+
+def find_metrics_source(base: Path = BASE):
+    """메트릭 파이프라인 원본: 노트북 정제본(루트 → data/raw), 없으면 머지 원본. 못 찾으면 None"""
+    cands = [base / CLEANED_CSV, base / "data" / "raw" / CLEANED_CSV]
+    return next((p for p in cands if p.exists()), None) or find_merged(base)
+
+
+def load_metrics_input(base: Path = BASE):
+    """메트릭 파이프라인(노트북 Step1~6) 입력 (df, source) — 라벨 정규화 없이.
+    정제본이 있으면 그대로, 없으면 머지 원본에 pipeline.clean(노트북 정제)을 적용한다.
+    labels.normalize는 다중값 설문 그룹을 합치므로(music_lis_frequency 35 → 32) pref · sig 결과가 노트북과 달라진다"""
+    path = find_metrics_source(base)
+    if path is None:
+        raise FileNotFoundError(f"{CLEANED_CSV} 또는 spotify_merged.xlsx/.csv 를 찾지 못했습니다.")
+    with perf.timer("read_metrics_input", "io"):
+        if path.name == CLEANED_CSV:
+            return tidy_up(pd.read_csv(path), normalize=False), "cleaned"
+        from core import pipeline
+        df = pipeline.clean(read_merged(path))
+        return tidy_up(df, normalize=False), "parts" if is_parts(path) else path.suffix.lstrip(".")
+
+
+def load_months(base: Path = BASE, start: str = None, end: str = None, plans=None, columns=None) -> pd.DataFrame:
+    """월 범위(start ~ end, 포함) · 요금제 · 컬럼만 tidy로. 머지 원본이 없고 파티션 저장소가 있으면 걸리는 파티션만 읽고,
+    아니면 원본 전체를 읽어 거른다(결과는 같음)"""
+    path = find_merged(base)
+    if path is not None and is_parts(path):
+        from core import partitions
+        with perf.timer("read_merged[parts]", "io"):
+            return partitions.scan(path.parent, start, end, plans, columns)
+    df, _ = load_merged(base)
+    keep = np.ones(len(df), bool)
+    if start is not None:
+        keep &= (df["month"] >= start).to_numpy()
+    if end is not None:
+        keep &= (df["month"] <= end).to_numpy()
+    if plans is not None:
+        keep &= df[labels.PLAN_COL].isin({labels.canonical_plan(p) for p in plans}).to_numpy()
+    df = df[keep] if columns is None else df.loc[keep, list(columns)]
+    return df.reset_index(drop=True)
@@ -0,0 +1,176 @@
+"""월(· 요금제) 파티션 저장소 — tidy 데이터를 month=YYYY-MM[/plan=...] 폴더의 Parquet 파일로
+
+머지 원본(xlsx · csv)은 파일 하나라 월 범위만 필요해도 전부 읽는다. 파티션 저장소는 manifest(_manifest.json)에
+파티션 목록(월 · 요금제 · 파일 · 행 수)을 두고, 읽을 때 요청한 월 범위 · 요금제에 걸리는 파일만 연다(partition pruning).
+새 달은 파일 하나(요금제 파티션이면 요금제 수만큼)를 더하고 manifest만 다시 쓰면 된다:
+
+    write(tidy, root, by_plan=True)         # 전체 재작성 (임시 폴더에 쓰고 교체)
+    append(new_month, root)                 # 새 파티션 파일 추가 → manifest 갱신
+    scan(root, start="2023-03", end="2023-06", plans=["Premium"], columns=["userid", "month", "revenue_num"])
+    scan(root, *[latest_month(root)] * 2)   # 최신 월 파티션만
+
+파일에는 파티션 컬럼(month · 요금제)도 그대로 들어 있어 파일 하나만 읽어도 tidy 스키마가 된다.
+스키마(Arrow)는 첫 작성 때 고정하고 append는 거기에 맞춰 캐스팅한다. category 라벨은 문자열로 쓰고 읽을 때 다시 정규화(loader.tidy_up).
+loader.find_merged는 머지 원본이 없으면 data/parts/_manifest.json을 원본으로 쓴다(지문 = manifest 크기 · 수정시각).
+"""
+import json, os, shutil
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import pandas as pd
+
+from core import labels
+from core.loader import BASE, tidy_up
+
+MANIFEST = "_manifest.json"
+VERSION = 1
+DEFAULT_DIR = BASE / "data" / "parts"
+PLAN_COL = labels.PLAN_COL
+
+
+def read_manifest(root=DEFAULT_DIR) -> dict:
+    with (Path(root) / MANIFEST).open(encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != VERSION:
+        raise ValueError(f"파티션 manifest 버전 불일치: {manifest.get('version')}")
+    return manifest
+
+
+def exists(root=DEFAULT_DIR) -> bool:
+    return (Path(root) / MANIFEST).exists()
+
+
+def _write_manifest(root: Path, manifest: dict):
+    manifest["updated"] = datetime.now().isoformat(timespec="seconds")
+    tmp = root / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, root / MANIFEST)
+
+
+def _plain(df: pd.DataFrame) -> pd.DataFrame:
+    """category 컬럼 → 라벨 문자열 (파티션마다 사전이 달라도 같은 Arrow 타입이 되도록)"""
+    cats = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: df[c].cat.categories.dtype for c in cats}) if cats else df
+
+
+def _table(df: pd.DataFrame, schema=None):
+    import pyarrow as pa
+    t = pa.Table.from_pandas(_plain(df), preserve_index=False)
+    return t.replace_schema_metadata(None) if schema is None else t.select(schema.names).cast(schema)
+
+
+def _part_dir(month: str, plan) -> str:
+    return f"month={quote(str(month), safe='')}" + ("" if plan is None else f"/plan={quote(str(plan), safe='')}")
+
+
+def _groups(df: pd.DataFrame, by_plan: bool):
+    """(월, 요금제 | None) → 행 묶음. 요금제 결측은 '(none)' 파티션"""
+    if not by_plan:
+        for month, part in df.groupby("month", sort=True):
+            yield str(month), None, part
+        return
+    plan = df[PLAN_COL].astype(object).where(df[PLAN_COL].notna(), "(none)")
+    for (month, p), part in df.groupby([df["month"], plan], sort=True, observed=True):
+        yield str(month), str(p), part
+
+
+def _write_parts(df: pd.DataFrame, root: Path, manifest: dict, schema):
+    import pyarrow.parquet as pq
+    for month, plan, part in _groups(df, manifest["by_plan"]):
+        rel = _part_dir(month, plan)
+        n = sum(1 for p in manifest["parts"] if p["dir"] == rel)
+        path = f"{rel}/part-{n:05d}.parquet"
+        (root / rel).mkdir(parents=True, exist_ok=True)
+        pq.write_table(_table(part, schema), root / path, compression="zstd")
+        manifest["parts"].append({"month": month, "plan": plan, "dir": rel, "path": path, "rows": len(part)})
+
+
+def write(df: pd.DataFrame, root=DEFAULT_DIR, by_plan: bool = False, source: dict = None) -> Path:
+    """tidy → 파티션 저장소 전체 재작성. 임시 폴더에 다 쓴 뒤 교체해 읽는 쪽이 반쯤 쓴 저장소를 보지 않게"""
+    import pyarrow as pa
+    if by_plan and PLAN_COL not in df.columns:
+        raise ValueError(f"요금제 파티션에는 {PLAN_COL} 컬럼이 필요합니다.")
+    root = Path(root)
+    tmp = root.with_name(root.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    schema = pa.Schema.from_pandas(_plain(df), preserve_index=False).remove_metadata()
+    manifest = {"version": VERSION, "by_plan": by_plan, "source": source, "parts": []}
+    _write_parts(df, tmp, manifest, schema)
+    _write_manifest(tmp, manifest)
+    old = root.with_name(root.name + ".old")
+    if root.exists():
+        os.replace(root, old)
+    os.replace(tmp, root)
+    shutil.rmtree(old, ignore_errors=True)
+    return root
+
+
+def append(df: pd.DataFrame, root=DEFAULT_DIR) -> list:
+    """새 행(보통 새 달 하나)을 파티션 파일로 추가. 기존 파일은 건드리지 않는다. 추가된 파티션 목록 반환"""
+    import pyarrow.parquet as pq
+    root = Path(root)
+    manifest = read_manifest(root)
+    if not manifest["parts"]:
+        raise ValueError("빈 저장소에는 append 대신 write로 스키마를 정하세요.")
+    schema = pq.read_schema(root / manifest["parts"][0]["path"]).remove_metadata()
+    before = len(manifest["parts"])
+    _write_parts(tidy_up(df), root, manifest, schema)
+    _write_manifest(root, manifest)
+    return manifest["parts"][before:]
+
+
+# ---------- 읽기 ----------
+def months(root=DEFAULT_DIR) -> list:
+    return sorted({p["month"] for p in read_manifest(root)["parts"]})
+
+
+def latest_month(root=DEFAULT_DIR):
+    ms = months(root)
+    return ms[-1] if ms else None
+
+
+def select(manifest: dict, start: str = None, end: str = None, plans=None) -> list:
+    """manifest 파티션 중 월 범위(start ~ end, 포함) · 요금제에 걸리는 것만 (요금제 파티션이 아니면 월만 거름)"""
+    plans = None if plans is None else {labels.canonical_plan(p) for p in plans}
+    return [p for p in manifest["parts"]
+            if (start is None or p["month"] >= start) and (end is None or p["month"] <= end)
+            and (plans is None or p["plan"] is None or p["plan"] in plans)]
+
+
+def scan(root=DEFAULT_DIR, start: str = None, end: str = None, plans=None, columns=None) -> pd.DataFrame:
+    """걸리는 파티션 파일만 읽어 tidy 프레임으로. 요금제 파티션이 아니면 요금제는 행 단위로 거른다"""
+    import pyarrow as pa, pyarrow.parquet as pq
+    root = Path(root)
+    manifest = read_manifest(root)
+    parts = select(manifest, start, end, plans)
+    cols = None if columns is None else list(dict.fromkeys(
+        list(columns) + ([PLAN_COL] if plans is not None and not manifest["by_plan"] else [])))
+    if parts:
+        table = pa.concat_tables([pq.read_table(root / p["path"], columns=cols) for p in parts])
+    else:
+        table = pq.read_schema(root / manifest["parts"][0]["path"]).empty_table() if manifest["parts"] else pa.table({})
+        table = table.select(cols) if cols is not None else table
+    df = tidy_up(table.to_pandas())
+    if plans is not None and not manifest["by_plan"]:
+        df = df[df[PLAN_COL].isin({labels.canonical_plan(p) for p in plans})]
+        df = df[list(columns)] if columns is not None else df
+    return df.reset_index(drop=True)
+
+
+def iter_parts(root=DEFAULT_DIR, start: str = None, end: str = None, plans=None, columns=None):
+    """걸리는 파티션을 하나씩 (tidy_up 적용) — 저장소 전체를 메모리에 올리지 않는 스트리밍용"""
+    import pyarrow.parquet as pq
+    root = Path(root)
+    for p in select(read_manifest(root), start, end, plans):
+        yield tidy_up(pq.read_table(root / p["path"], columns=columns).to_pandas())
+
+
+def stats(root=DEFAULT_DIR) -> pd.DataFrame:
+    """파티션별 (month, plan, files, rows, bytes)"""
+    root = Path(root)
+    rows = [{**p, "bytes": (root / p["path"]).stat().st_size} for p in read_manifest(root)["parts"]]
+    df = pd.DataFrame(rows, columns=["month", "plan", "dir", "path", "rows", "bytes"])
+    return (df.groupby(["month", "plan"], dropna=False, sort=True)
+            .agg(files=("path", "size"), rows=("rows", "sum"), bytes=("bytes", "sum")).reset_index())
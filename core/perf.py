@@ -0,0 +1,240 @@
+"""렌더 타이밍 · 캐시 히트 계측
+
+- timer(name) / @timed(name): 임의 구간 측정 (컨텍스트 매니저 / 데코레이터)
+- section(title): section_title()이 부르면 다음 섹션 시작 전까지를 한 구간으로 잰다
+- altair_chart() / vega_lite_chart(): st.altair_chart / st.vega_lite_chart 대체 — 차트 렌더(직렬화 포함) 시간
+- cache_data(...) / cache_resource(...): st.cache_* 대체 — 히트/미스 횟수와 미스 시 실제 계산 시간 집계
+- begin_rerun() / end_rerun(): 리런 단위 묶음. ?debug=1 (또는 STAYORSKIP_DEBUG=1)이면
+  사이드바에 숨은 디버그 패널을 그리고 artifacts/perf/timings.jsonl 에 JSON Lines로 남긴다.
+
+Streamlit 밖(벤치/노트북)에서는 begin_rerun()을 직접 부른 경우에만 모듈 전역 기록기에 쌓인다.
+"""
+import functools, json, os, threading, time, uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent.parent
+LOG_PATH = Path(os.environ.get("STAYORSKIP_PERF_LOG", BASE / "artifacts" / "perf" / "timings.jsonl"))
+MAX_RERUNS = 20  # 세션당 보관할 리런 수
+
+_local_state = {"rerun": None, "history": [], "open": None}
+_tl = threading.local()  # 캐시 미스 플래그 (st.cache_data는 같은 스레드에서 본문 실행)
+_cache_lock = threading.Lock()
+CACHE_STATS = {}  # 함수명 → {"calls", "hits", "misses", "miss_ms"} (프로세스 전체)
+
+
+def _state() -> dict:
+    """현재 세션의 계측 상태 (Streamlit 세션이면 session_state, 아니면 모듈 전역)"""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx(suppress_warning=True) is not None:
+            import streamlit as st
+            if "_perf" not in st.session_state:
+                st.session_state["_perf"] = {"rerun": None, "history": [], "open": None}
+            return st.session_state["_perf"]
+    except Exception:
+        pass
+    return _local_state
+
+
+def _record(name: str, kind: str, ms: float, **extra):
+    st_ = _state()
+    if st_["rerun"] is None:  # begin_rerun() 전(벤치/노트북)이면 기록하지 않음
+        return
+    st_["rerun"]["records"].append({"name": name, "kind": kind, "ms": round(ms, 3), **extra})
+
+
+@contextmanager
+def timer(name: str, kind: str = "block"):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, kind, (time.perf_counter() - t0) * 1000)
+
+
+def timed(name: str = None, kind: str = "func"):
+    def deco(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(label, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+# ---------- 섹션 구간 ----------
+def _close_section():
+    st_ = _state()
+    opened = st_.get("open")
+    if opened:
+        _record(opened[0], "section", (time.perf_counter() - opened[1]) * 1000)
+        st_["open"] = None
+
+
+def section(title: str):
+    """이전 섹션을 닫고 새 섹션 구간 시작 (section_title()에서 호출)"""
+    _close_section()
+    _state()["open"] = (title, time.perf_counter())
+
+
+def _current_section() -> str:
+    opened = _state().get("open")
+    return opened[0] if opened else "-"
+
+
+# ---------- 차트 렌더 ----------
+def altair_chart(chart, name: str = None, **kwargs):
+    import streamlit as st
+    kwargs.setdefault("use_container_width", True)
+    with timer(name or f"{_current_section()} · altair", "chart"):
+        return st.altair_chart(chart, **kwargs)
+
+
+def vega_lite_chart(spec: dict, name: str = None, **kwargs):
+    """이미 만든 스펙 dict 렌더 (core.charts 템플릿 — datasets의 DataFrame은 Arrow로 따로 실림)"""
+    import streamlit as st
+    kwargs.setdefault("use_container_width", True)
+    with timer(name or f"{_current_section()} · vega-lite", "chart"):
+        return st.vega_lite_chart(spec=spec, **kwargs)
+
+
+# ---------- 캐시 히트/미스 ----------
+def _instrumented(st_cache, kind, func, cache_kwargs):
+    def deco(fn):
+        label = fn.__qualname__
+        with _cache_lock:
+            CACHE_STATS.setdefault(label, {"cache": kind, "calls": 0, "hits": 0, "misses": 0, "miss_ms": 0.0})
+
+        @functools.wraps(fn)
+        def _on_miss(*args, **kwargs):
+            _tl.missed = True
+            return fn(*args, **kwargs)
+
+        cached = st_cache(**cache_kwargs)(_on_miss)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            outer = getattr(_tl, "missed", False)  # 캐시 함수 안에서 다른 캐시 함수를 부르는 경우 바깥 플래그 보존
+            _tl.missed = False
+            t0 = time.perf_counter()
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                miss, _tl.missed = _tl.missed, outer
+                with _cache_lock:
+                    s = CACHE_STATS[label]
+                    s["calls"] += 1
+                    s["misses" if miss else "hits"] += 1
+                    if miss:
+                        s["miss_ms"] += ms
+                _record(label, "cache", ms, hit=not miss)
+
+        wrapper.clear = cached.clear
+        return wrapper
+    return deco(func) if func is not None else deco
+
+
+def cache_data(func=None, **cache_kwargs):
+    """st.cache_data와 같은 사용법. 호출마다 히트/미스를 세고 리런 기록에 남긴다"""
+    import streamlit as st
+    return _instrumented(st.cache_data, "data", func, cache_kwargs)
+
+
+def cache_resource(func=None, **cache_kwargs):
+    """st.cache_resource 버전 (프로세스 공용 객체 — 복사/pickle 없음)"""
+    import streamlit as st
+    return _instrumented(st.cache_resource, "resource", func, cache_kwargs)
+
+
+# ---------- 디버그 패널에 붙일 추가 통계 ----------
+EXTRA_STATS = {}  # 이름 → dict를 돌려주는 함수
+
+
+def register_stats(name: str, fn):
+    EXTRA_STATS[name] = fn
+
+
+# ---------- 리런 단위 ----------
+def debug_enabled() -> bool:
+    if os.environ.get("STAYORSKIP_DEBUG") == "1":
+        return True
+    try:
+        import streamlit as st
+        return st.query_params.get("debug") == "1"
+    except Exception:
+        return False
+
+
+def begin_rerun():
+    st_ = _state()
+    st_["open"] = None
+    st_["rerun"] = {"id": uuid.uuid4().hex[:8], "ts": datetime.now().isoformat(timespec="seconds"),
+                    "t0": time.perf_counter(), "records": []}
+
+
+def end_rerun(render_panel: bool = True) -> dict:
+    """열린 섹션을 닫고 리런 총시간 확정. 디버그 모드면 JSONL 기록 + 사이드바 패널"""
+    _close_section()
+    st_ = _state()
+    rerun = st_["rerun"]
+    if rerun is None:
+        return {}
+    rerun["total_ms"] = round((time.perf_counter() - rerun.pop("t0")) * 1000, 3)
+    st_["history"] = (st_["history"] + [rerun])[-MAX_RERUNS:]
+    st_["rerun"] = None
+    if debug_enabled():
+        export_jsonl([rerun])
+        if render_panel:
+            _render_panel(rerun, st_["history"])
+    return rerun
+
+
+def to_jsonl(reruns) -> str:
+    """리런 기록 → JSON Lines (레코드 1개 = 1줄, rerun id/시각 포함)"""
+    lines = []
+    for r in reruns:
+        for rec in r["records"]:
+            lines.append(json.dumps({"rerun": r["id"], "ts": r["ts"], **rec}, ensure_ascii=False))
+        lines.append(json.dumps({"rerun": r["id"], "ts": r["ts"], "name": "<rerun>", "kind": "total",
+                                 "ms": r.get("total_ms")}, ensure_ascii=False))
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def export_jsonl(reruns, path: Path = None):
+    path = Path(path or LOG_PATH)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(to_jsonl(reruns))
+    except OSError:
+        pass  # 읽기 전용 배포 환경이면 패널/다운로드로만
+
+
+def _render_panel(rerun: dict, history: list):
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander(f"🛠 Debug · rerun {rerun['total_ms']:,.0f} ms", expanded=False):
+        df = pd.DataFrame(rerun["records"])
+        if not df.empty:
+            st.caption("이번 리런 (느린 순)")
+            st.dataframe(df.sort_values("ms", ascending=False), hide_index=True, use_container_width=True)
+        with _cache_lock:
+            cache = pd.DataFrame([{"func": k, **v} for k, v in CACHE_STATS.items()])
+        if not cache.empty:
+            st.caption("st.cache_data · st.cache_resource 히트/미스 (프로세스 누적, cache 열로 구분)")
+            st.dataframe(cache, hide_index=True, use_container_width=True)
+        for name, fn in list(EXTRA_STATS.items()):
+            try:
+                st.caption(name)
+                st.json(fn(), expanded=False)
+            except Exception:
+                pass
+        st.caption("최근 리런 총시간 (ms): " + ", ".join(f"{r['total_ms']:,.0f}" for r in history))
+        st.download_button("timings.jsonl", to_jsonl(history), file_name="timings.jsonl",
+                           mime="application/jsonl")
@@ -0,0 +1,315 @@
+"""노트북(spotify_cleaned.ipynb) Step 1~6을 함수로 옮긴 메트릭 파이프라인
+
+Step6 export 결과(data/out_*.csv)가 Revenue 탭의 입력이다.
+입력은 loader.load_metrics_input(라벨 정규화 없음) — 설문 라벨을 합치면 pref · sig 그룹이 노트북과 달라진다.
+노트북은 Step2~5를 정제본(spotify_cleaned_final_v2.csv)에서 돌리므로 그 파일을 먼저 쓰고,
+없으면 머지 원본에 같은 정제(clean)를 적용한다. `python -m tools.pipeline --check`가 커밋된 export 재현을 확인한다.
+Step2 유저 롤업은 workers > 1(STAYORSKIP_WORKERS)이면 userid 해시로 샤드를 나눠 프로세스 풀에서 계산한다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+from core import labels
+
+PREF_COLS = [
+    "premium_sub_willingness", "preffered_premium_plan", "preferred_listening_content",
+    "fav_music_genre", "music_time_slot", "music_Influencial_mood", "music_lis_frequency",
+    "music_expl_method", "music_recc_rating", "pod_lis_frequency", "fav_pod_genre",
+    "preffered_pod_format", "pod_host_preference", "preffered_pod_duration",
+    "pod_variety_satisfaction",
+]
+
+# Step5 후보 컬럼 (노트북과 동일)
+NUM_CANDIDATES = ["premium_sub_willingness", "music_recc_rating", "is_premium"]
+CAT_CANDIDATES = [
+    "preferred_listening_content", "fav_music_genre", "music_time_slot",
+    "music_Influencial_mood", "music_lis_frequency", "music_expl_method",
+    "pod_lis_frequency", "fav_pod_genre", "preffered_pod_format",
+    "pod_host_preference", "preffered_pod_duration", "pod_variety_satisfaction",
+    "gender", "subscription_plan", "spotify_listening_device",
+]
+
+# Step2 파티션 실행 — 유저가 샤드 하나에만 속하므로 샤드별 롤업을 이어 붙이면 전체 롤업과 같다
+WORKERS = int(os.environ.get("STAYORSKIP_WORKERS", 1))
+PARTITION_MIN_ROWS = 5_000_000  # 이보다 작으면 워커 기동(spawn ≈ pandas import) · 전송 비용이 더 큼
+ROLLUP_COLS = ["userid", "month", "is_premium", "revenue"]
+
+# Step6 export 파일명 ↔ 번들 키
+EXPORT_FILES = {
+    "kpi": "out_revenue_kpis.csv",
+    "retention": "out_premium_retention_monthly.csv",
+    "arpu": "out_arpu_monthly.csv",
+    "pref": "out_pref_group_summary.csv",
+    "sig": "out_pref_significance_tests.csv",
+    "imp": "out_feature_importance_ltv.csv",
+}
+OPTIONAL_DEPS = {"sig": "scipy", "imp": "sklearn"}  # 없으면 run_available()이 건너뛰는 export
+
+
+# ---------- Step 0. 정제 (spotify_merged → spotify_cleaned_final_v2와 같게) ----------
+NA_LABEL = "No preference / Not applicable"
+NA_FILL_COLS = ["fav_pod_genre", "preffered_pod_format", "pod_host_preference", "preffered_pod_duration"]
+SATISFACTION = {"Very Satisfied": "Satisfied", "Very Dissatisfied": "Dissatisfied", "Ok": "Neutral"}
+
+
+def clean(df: pd.DataFrame) -> pd.DataFrame:
+    """노트북 정제본과 같은 값으로: 문자열 앞뒤 공백 제거 · subscription_plan → Free/Premium ·
+    팟캐스트 취향 결측 → NA_LABEL · preffered_premium_plan 결측 → 구독 의향 No면 'Not interested', 아니면 'Not specified' ·
+    pod_variety_satisfaction 5단계 → 3단계"""
+    df = df.copy()
+    for c in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[c]):
+            df[c] = df[c].astype(object).where(df[c].isna(), df[c].astype(str).str.strip())
+    if "subscription_plan" in df.columns:
+        df["subscription_plan"] = df["subscription_plan"].map(labels.canonical_plan, na_action="ignore")
+    if "preffered_premium_plan" in df.columns:
+        no = df.get("premium_sub_willingness", pd.Series("", index=df.index)).eq("No")
+        fill = pd.Series(np.where(no, "Not interested", "Not specified"), index=df.index)
+        df["preffered_premium_plan"] = df["preffered_premium_plan"].fillna(fill)
+    for c in NA_FILL_COLS:
+        if c in df.columns:
+            df[c] = df[c].fillna(NA_LABEL)
+    if "pod_variety_satisfaction" in df.columns:
+        df["pod_variety_satisfaction"] = df["pod_variety_satisfaction"].replace(SATISFACTION)
+    return df
+
+
+# ---------- Step 1. 준비 ----------
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """is_premium 파생 + revenue 숫자화(revenue_num 있으면 그걸 사용)"""
+    df = df.copy()
+    df["is_premium"] = labels.premium_mask(df["subscription_plan"]).astype(int)
+    if "revenue_num" in df.columns:
+        df["revenue"] = df["revenue_num"]
+    df["month"] = df["month"].astype(str)
+    return df
+
+
+# ---------- Step 2. KPI + 파생변수 ----------
+def _rollups(df: pd.DataFrame, first_m: str, later_ms: list) -> pd.DataFrame:
+    """유저별 합계를 groupby 한 번으로 (전환 여부도 행 플래그 합 → 집합 연산 없음)"""
+    flags = pd.DataFrame({
+        "userid": df["userid"],
+        "ltv": df["revenue"],
+        "premium_duration": df["is_premium"],
+        "free_first": (df["month"] == first_m) & (df["is_premium"] == 0),
+        "prem_later": df["month"].isin(later_ms) & (df["is_premium"] == 1),
+    })
+    g = flags.groupby("userid").sum()
+    ltv_user = g[["ltv", "premium_duration"]].reset_index()
+    ltv_user["avg_monthly_revenue"] = ltv_user["ltv"] / ltv_user["premium_duration"].replace(0, np.nan)
+    ltv_user["is_free_to_premium"] = ((g["free_first"] > 0) & (g["prem_later"] > 0)).to_numpy().astype(int)
+    return ltv_user
+
+
+def shards(df: pd.DataFrame, n: int) -> list:
+    """userid 해시 % n 으로 나눈 프레임 n개 (롤업에 필요한 컬럼만 — 워커로 보내는 양을 줄임)"""
+    cols = [c for c in ROLLUP_COLS if c in df.columns]
+    part = pd.util.hash_pandas_object(df["userid"], index=False).to_numpy() % np.uint64(n)
+    return [df.loc[part == i, cols] for i in range(n)]
+
+
+def _mp_context():
+    """forkserver: 앱 서버(여러 스레드)에서 바로 fork하면 잠금 상태가 복제돼 멈출 수 있다.
+    서버 프로세스가 pandas를 한 번 import해 두고 워커는 거기서 fork → spawn보다 기동이 훨씬 빠름"""
+    if "forkserver" not in multiprocessing.get_all_start_methods():  # Windows
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["core.pipeline"])
+    return ctx
+
+
+def user_rollups(df: pd.DataFrame, workers: int = None, min_rows: int = PARTITION_MIN_ROWS) -> pd.DataFrame:
+    """유저별 premium_duration / ltv / avg_monthly_revenue / is_free_to_premium
+    workers > 1이고 min_rows 이상이면 userid 샤드별로 프로세스 풀에서 계산 후 합침(결과는 같음).
+    워커 프로세스가 메인 모듈을 다시 import하므로 스크립트에서 부를 때는 `if __name__ == "__main__":` 안에서"""
+    months = sorted(df["month"].unique())
+    first_m, later_ms = months[0], months[1:]  # 첫 달 기준은 전체 데이터에서 정해 샤드에 넘김
+    workers = WORKERS if workers is None else workers
+    if workers <= 1 or len(df) < min_rows:
+        return _rollups(df, first_m, later_ms)
+    with ProcessPoolExecutor(workers, mp_context=_mp_context()) as pool:
+        parts = list(pool.map(_rollups, shards(df, workers), [first_m] * workers, [later_ms] * workers))
+    return pd.concat(parts, ignore_index=True).sort_values("userid", ignore_index=True)
+
+
+def premium_retention(df: pd.DataFrame) -> pd.DataFrame:
+    """월→다음달 Premium 유지율 (from_to, premium_users, premium_retention)"""
+    months = sorted(df["month"].unique())
+    ret_rows = []
+    for a, b in zip(months[:-1], months[1:]):
+        A = set(df[(df["month"] == a) & (df["is_premium"] == 1)]["userid"])
+        B = set(df[(df["month"] == b) & (df["is_premium"] == 1)]["userid"])
+        retained = (len(A & B) / len(A)) if A else np.nan
+        ret_rows.append({"from_to": f"{a}→{b}", "premium_users": len(A), "premium_retention": retained})
+    return pd.DataFrame(ret_rows, columns=["from_to", "premium_users", "premium_retention"])
+
+
+def arpu_monthly(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby("month", as_index=False)["revenue"].mean().rename(columns={"revenue": "arpu"})
+
+
+def kpi_table(df, ltv_user, ret_df) -> pd.DataFrame:
+    return pd.DataFrame({
+        "metric": ["conversion_rate", "premium_retention_mean", "arpu_overall", "avg_premium_duration"],
+        "value": [
+            ltv_user["is_free_to_premium"].mean(),
+            ret_df["premium_retention"].mean(),
+            df["revenue"].mean(),
+            ltv_user["premium_duration"].mean(),
+        ],
+    })
+
+
+def kpi_values(kpi: pd.DataFrame) -> dict:
+    """out_revenue_kpis.csv → {metric: float}
+    (float(kpi.loc[...,"value"])는 pandas 3에서 1원소 Series를 float로 바꾸지 못해 실패)"""
+    return dict(zip(kpi["metric"].astype(str), pd.to_numeric(kpi["value"], errors="coerce").astype(float)))
+
+
+# ---------- Step 3. 취향 변수별 그룹 비교 ----------
+def latest_prefs(df: pd.DataFrame, cols=PREF_COLS) -> pd.DataFrame:
+    """유저별 대표 취향값 (최근 월 기준)"""
+    cols = [c for c in cols if c in df.columns]
+    return df.sort_values(["userid", "month"]).groupby("userid").tail(1)[["userid"] + cols]
+
+
+def pref_summary(ltv_user_pref: pd.DataFrame, cols=PREF_COLS) -> pd.DataFrame:
+    parts = []
+    for c in cols:
+        if c not in ltv_user_pref.columns:
+            continue
+        temp = ltv_user_pref.groupby(c).agg(
+            users=("userid", "nunique"),
+            avg_ltv=("ltv", "mean"),
+            avg_premium_duration=("premium_duration", "mean"),
+            avg_monthly_revenue=("avg_monthly_revenue", "mean"),
+            free_to_premium_rate=("is_free_to_premium", "mean"),
+        ).reset_index()
+        temp["variable"] = c
+        parts.append(temp)
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+
+
+# ---------- Step 4. 통계 검정 (scipy) ----------
+def significance_tests(ltv_user_pref: pd.DataFrame, cols=PREF_COLS) -> pd.DataFrame:
+    from scipy import stats  # 무거운 의존성 → 호출 시점에만
+
+    tests = []
+    for c in cols:
+        if c not in ltv_user_pref.columns:
+            continue
+        ct = pd.crosstab(ltv_user_pref[c], ltv_user_pref["is_free_to_premium"])
+        if ct.shape[0] > 1 and ct.shape[1] > 1:
+            _, p, _, _ = stats.chi2_contingency(ct)
+            tests.append({"feature": c, "test_type": "chi2 (conversion)", "p_value": p,
+                          "note": "p<0.05 → 전환율 차이가 유의미함"})
+    for c in cols:
+        if c not in ltv_user_pref.columns:
+            continue
+        groups = [g["ltv"].dropna().values for _, g in ltv_user_pref.groupby(c)]
+        if len(groups) >= 2 and all(len(g) > 1 for g in groups):
+            _, p = stats.f_oneway(*groups)
+            tests.append({"feature": c, "test_type": "ANOVA (LTV)", "p_value": p,
+                          "note": "p<0.05 → LTV 평균 차이가 유의미함"})
+    return pd.DataFrame(tests, columns=["feature", "test_type", "p_value", "note"]).sort_values("p_value")
+
+
+# ---------- Step 5. LTV Feature Importance (sklearn) ----------
+def feature_importance(df: pd.DataFrame, ltv_user: pd.DataFrame, n_estimators: int = 300) -> pd.Series:
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.model_selection import train_test_split
+
+    rep_cols = [c for c in dict.fromkeys(NUM_CANDIDATES + CAT_CANDIDATES) if c in df.columns]
+    rep_pref = (
+        df.dropna(subset=[c for c in CAT_CANDIDATES if c in df.columns], how="all")
+          .sort_values(["userid", "month"])
+          .groupby("userid")
+          .tail(1)[["userid"] + rep_cols]
+    )
+    ltv_data = ltv_user.merge(rep_pref, on="userid", how="left")
+
+    X = pd.DataFrame(index=ltv_data.index)
+    for c in [c for c in NUM_CANDIDATES if c in ltv_data.columns]:
+        X[c] = pd.to_numeric(ltv_data[c], errors="coerce")
+    cats = [c for c in CAT_CANDIDATES if c in ltv_data.columns]
+    for c in cats:
+        X[c] = ltv_data[c].astype(str).fillna("None")
+    X = pd.get_dummies(X, columns=cats, drop_first=True)
+    X = X.dropna(axis=1, thresh=len(X) * 0.2)
+    X = X.replace([np.inf, -np.inf], np.nan).fillna(0)
+    y = pd.to_numeric(ltv_data["ltv"], errors="coerce").fillna(0)
+
+    assert X.shape[0] >= 20 and X.shape[1] >= 1, f"LTV 표본/특징 부족: X={X.shape}, y={y.shape}"
+    X_train, _, y_train, _ = train_test_split(X, y, test_size=0.2, random_state=42)
+    rf = RandomForestRegressor(n_estimators=n_estimators, random_state=42, n_jobs=-1)
+    rf.fit(X_train, y_train)
+    return pd.Series(rf.feature_importances_, index=X.columns).sort_values(ascending=False)
+
+
+# ---------- 전체 실행 / Step 6. Export ----------
+def run(df: pd.DataFrame, with_tests: bool = True, with_importance: bool = True) -> dict:
+    """Step 1~5 → EXPORT_FILES 키를 가진 번들(dict of DataFrame)"""
+    df = prepare(df)
+    ltv_user = user_rollups(df)
+    ret_df = premium_retention(df)
+    bundle = {
+        "kpi": kpi_table(df, ltv_user, ret_df),
+        "retention": ret_df,
+        "arpu": arpu_monthly(df),
+    }
+    ltv_user_pref = ltv_user.merge(latest_prefs(df), on="userid", how="left")
+    bundle["pref"] = pref_summary(ltv_user_pref)
+    if with_tests:
+        bundle["sig"] = significance_tests(ltv_user_pref)
+    if with_importance:
+        bundle["imp"] = feature_importance(df, ltv_user).to_frame("importance")
+    return bundle
+
+
+def buildable() -> set:
+    """지금 설치된 의존성으로 run_available()이 만들 수 있는 export 키"""
+    from importlib.util import find_spec
+    return {k for k in EXPORT_FILES if k not in OPTIONAL_DEPS or find_spec(OPTIONAL_DEPS[k]) is not None}
+
+
+def run_available(df: pd.DataFrame) -> dict:
+    """설치된 의존성 기준 run() (scipy 없으면 sig, sklearn 없으면 imp 생략)"""
+    keys = buildable()
+    return run(df, with_tests="sig" in keys, with_importance="imp" in keys)
+
+
+def as_exports(bundle: dict) -> dict:
+    """run() 번들 → load_exports()와 같은 모양 (imp는 CSV처럼 index → 첫 컬럼)"""
+    out = {k: bundle.get(k) for k in EXPORT_FILES}
+    if out["imp"] is not None:
+        out["imp"] = out["imp"].reset_index()
+    return out
+
+
+def export(bundle: dict, out_dir: str = "data"):
+    """파일마다 임시 파일에 쓰고 rename — 읽는 쪽(앱)이 반쯤 쓴 CSV를 보지 않게"""
+    os.makedirs(out_dir, exist_ok=True)
+    for key, name in EXPORT_FILES.items():
+        if bundle.get(key) is None:
+            continue
+        path = os.path.join(out_dir, name)
+        # 중요도는 인덱스(feature)를 그대로 저장 — 노트북과 동일 포맷
+        bundle[key].to_csv(path + ".tmp", index=(key == "imp"))
+        os.replace(path + ".tmp", path)
+
+
+def load_exports(data_dir: str = "data") -> dict:
+    """Revenue 탭 입력 로드. 없는 파일은 None (data/ → CWD 순서로 탐색)"""
+    out = {}
+    for key, name in EXPORT_FILES.items():
+        out[key] = None
+        for p in (os.path.join(data_dir, name), name):
+            if os.path.exists(p):
+                out[key] = pd.read_csv(p)
+                break
+    return out
@@ -0,0 +1,197 @@
+"""유저 × 월 요금제 비트맵 — "유저 u가 m월에 Premium이었나"를 문자열 없이
+
+유지율 · Premium 기간 · Free→Premium 전환 KPI는 결국 (유저, 월) Premium 여부만 본다.
+원본을 매번 훑으며 요금제 라벨을 판정하는 대신, 유저를 정렬된 조밀 인덱스로 바꾸고
+월마다 비트셋 하나(np.packbits, 유저 8명 = 1바이트)로 저장한다. KPI는 비트 AND · popcount:
+
+    bits = build(tidy)               # premium · free (월, ceil(유저/8)) + revenue (월, 유저) 행렬
+    write(bits, path); bits = open_bits(path)   # 배열은 memory-map (읽는 만큼만 페이지 인)
+    bits.retention()                 # pipeline.premium_retention과 같은 표 = popcount(P[a] & P[b]) / popcount(P[a])
+    bits.kpis()                      # pipeline.kpi_values(kpi_table(...))와 같은 dict
+
+Premium 판정은 노트북 Step1(pipeline.prepare)과 같다(core.labels) — 요금제 결측 행도 Free로 센다.
+같은 (유저, 월)이 여러 행이면 비트는 OR, 매출은 합이고, ARPU 분모(월별 매출 행 수)는 manifest에 따로 둔다.
+단, avg_premium_duration은 '행 수'가 아니라 'Premium인 월 수' 평균이다((유저, 월) 중복이 없으면 같음).
+
+파일 구조 (*.bits):
+    MAGIC | 배열 블롭(64바이트 정렬, C-order raw) ... | userid(Arrow IPC) | manifest(JSON) | manifest 길이(uint64 LE)
+"""
+import json, mmap, os, struct
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg, labels
+from core.filters import _popcount
+from core.loader import BASE
+
+MAGIC = b"SOSBITS1"
+VERSION = 1
+DEFAULT_PATH = BASE / "artifacts" / "planbits" / "plans.bits"
+ALIGN = 64
+USER_BLOCK = 1 << 20  # 유저별 합(premium_duration)을 풀 때 한 번에 푸는 바이트 열 수 (= 유저 800만 명)
+
+
+class PlanBits:
+    """months: 월 라벨 · users: 정렬된 userid · premium/free: (월, ceil(유저/8)) uint8 비트셋 · revenue: (월, 유저)
+    rows / rev_rows: 월별 원본 행 수 · 매출 값이 있는 행 수 (ARPU 분모)"""
+
+    def __init__(self, months, users, premium, free, revenue, rows, rev_rows, source: dict = None):
+        self.months, self.users = list(months), users
+        self.premium, self.free, self.revenue = premium, free, revenue
+        self.rows, self.rev_rows = np.asarray(rows, np.int64), np.asarray(rev_rows, np.int64)
+        self.source = source
+
+    @property
+    def n_users(self) -> int:
+        return len(self.users)
+
+    def seen(self) -> np.ndarray:
+        """월별 관측 비트셋 (Premium 또는 Free 행이 있음)"""
+        return self.premium | self.free
+
+    def index_of(self, userid) -> int:
+        """userid → 비트 위치 (없으면 -1)"""
+        i = int(np.searchsorted(self.users, userid))
+        return i if i < self.n_users and self.users[i] == userid else -1
+
+    def is_premium(self, userid, month: str) -> bool:
+        i, m = self.index_of(userid), self.months.index(month)
+        return i >= 0 and bool(self.premium[m, i >> 3] >> (7 - (i & 7)) & 1)
+
+    def premium_users(self) -> np.ndarray:
+        """월별 Premium 유저 수"""
+        return _popcount(self.premium, axis=1)
+
+    def retention(self) -> pd.DataFrame:
+        """월→다음달 Premium 유지율 (pipeline.premium_retention과 같은 열)"""
+        a, b = self.premium[:-1], self.premium[1:]
+        base, kept = _popcount(a, axis=1), _popcount(a & b, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.where(base > 0, kept / base, np.nan)
+        return pd.DataFrame({"from_to": [f"{x}→{y}" for x, y in zip(self.months[:-1], self.months[1:])],
+                             "premium_users": base, "premium_retention": rate})
+
+    def premium_duration(self) -> np.ndarray:
+        """유저별 Premium 월 수 (users 순서) — 유저 블록 단위로 풀어 메모리를 묶는다"""
+        out = np.zeros(self.n_users, np.int64)
+        for lo in range(0, self.premium.shape[1], USER_BLOCK):
+            block = np.unpackbits(np.asarray(self.premium[:, lo:lo + USER_BLOCK]), axis=1)
+            n = min(block.shape[1], self.n_users - lo * 8)
+            out[lo * 8:lo * 8 + n] = block[:, :n].sum(axis=0)
+        return out
+
+    def free_to_premium(self) -> np.ndarray:
+        """노트북 KPI(첫 달 Free & 이후 어느 달이든 Premium) 비트셋"""
+        if len(self.months) < 2:
+            return np.zeros(self.premium.shape[1], np.uint8)
+        return self.free[0] & np.bitwise_or.reduce(self.premium[1:], axis=0)
+
+    def arpu_monthly(self) -> pd.DataFrame:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            arpu = self.revenue.sum(axis=1) / np.where(self.rev_rows > 0, self.rev_rows, np.nan)
+        return pd.DataFrame({"month": self.months, "arpu": arpu})
+
+    def kpis(self) -> dict:
+        """Revenue KPI 4종 (pipeline.kpi_values(kpi_table(...))와 같은 키)"""
+        n = max(self.n_users, 1)
+        return {"conversion_rate": int(_popcount(self.free_to_premium())) / n,
+                "premium_retention_mean": float(self.retention()["premium_retention"].mean()),
+                "arpu_overall": float(self.revenue.sum() / max(int(self.rev_rows.sum()), 1)),
+                "avg_premium_duration": int(self.premium_users().sum()) / n}
+
+
+# ---------- 빌드 ----------
+def build(df: pd.DataFrame, plan_col: str = None, source: dict = None) -> PlanBits:
+    """tidy → PlanBits (행 배열을 한 번 훑어 비트 위치에 OR)"""
+    plan_col = plan_col or agg.plan_column(df)
+    users, user_labels = pd.factorize(df["userid"], sort=True)
+    months, month_labels = pd.factorize(df["month"].astype(str), sort=True)
+    ok = (users >= 0) & (months >= 0)
+    paid = labels.premium_mask(df[plan_col])
+    rev = pd.to_numeric(df[agg.revenue_column(df)], errors="coerce").to_numpy(dtype=np.float64)
+    users, months, paid, rev = users[ok], months[ok], paid[ok], rev[ok]
+    n_u, n_m = len(user_labels), len(month_labels)
+    width = (n_u + 7) // 8
+
+    planes = np.zeros((2, n_m, width), np.uint8)  # 0 = premium, 1 = free
+    bit = (np.uint8(0x80) >> (users & 7).astype(np.uint8)).astype(np.uint8)
+    np.bitwise_or.at(planes, ((~paid).astype(np.intp), months, users >> 3), bit)
+    revenue = np.zeros((n_m, n_u), np.float64)
+    has = ~np.isnan(rev)
+    np.add.at(revenue, (months[has], users[has]), rev[has])
+    return PlanBits([str(m) for m in month_labels], np.asarray(user_labels), planes[0], planes[1], revenue,
+                    np.bincount(months, minlength=n_m), np.bincount(months[has], minlength=n_m), source)
+
+
+def build_from_source(base: Path = BASE) -> PlanBits:
+    from core.loader import find_merged, load_merged
+    from core.snapshot import fingerprint
+    tidy, _ = load_merged(base)
+    return build(tidy, source=fingerprint(find_merged(base)))
+
+
+def _users_blob(users: np.ndarray) -> bytes:
+    import pyarrow as pa
+    table = pa.table({"userid": pd.Series(users)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as w:
+        w.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def write(bits: PlanBits, path=DEFAULT_PATH) -> Path:
+    """PlanBits → 파일 (임시 파일에 쓰고 rename)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": VERSION, "created": datetime.now().isoformat(timespec="seconds"), "source": bits.source,
+                "months": bits.months, "n_users": bits.n_users, "rows": bits.rows.tolist(),
+                "rev_rows": bits.rev_rows.tolist(), "arrays": {}}
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        for name in ("premium", "free", "revenue"):
+            a = np.ascontiguousarray(getattr(bits, name))
+            f.write(b"\0" * (-f.tell() % ALIGN))
+            manifest["arrays"][name] = {"offset": f.tell(), "dtype": a.dtype.str, "shape": list(a.shape)}
+            f.write(a.tobytes())
+        blob = _users_blob(bits.users)
+        manifest["users"] = [f.tell(), len(blob)]
+        f.write(blob)
+        raw = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        f.write(raw)
+        f.write(struct.pack("<Q", len(raw)))
+    os.replace(tmp, path)
+    return path
+
+
+# ---------- 읽기 ----------
+def open_bits(path=DEFAULT_PATH) -> PlanBits:
+    """파일 → PlanBits. 비트셋 · 매출 행렬은 mmap 위의 읽기 전용 배열(복사 없음)"""
+    import pyarrow as pa
+    path = Path(path)
+    with path.open("rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < len(MAGIC) + 8 or mm[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"요금제 비트맵 형식이 아닙니다: {path}")
+    (n,) = struct.unpack("<Q", mm[-8:])
+    manifest = json.loads(mm[len(mm) - 8 - n:len(mm) - 8])
+    if manifest.get("version") != VERSION:
+        raise ValueError(f"요금제 비트맵 버전 불일치: {manifest.get('version')}")
+    arrays = {name: np.ndarray(tuple(a["shape"]), np.dtype(a["dtype"]), buffer=mm, offset=a["offset"])
+              for name, a in manifest["arrays"].items()}
+    off, length = manifest["users"]
+    users = pa.ipc.open_file(pa.py_buffer(memoryview(mm)[off:off + length])).read_all().column("userid").to_numpy()
+    bits = PlanBits(manifest["months"], users, arrays["premium"], arrays["free"], arrays["revenue"],
+                    manifest["rows"], manifest["rev_rows"], manifest.get("source"))
+    bits.created = manifest.get("created")
+    return bits
+
+
+def is_stale(bits: PlanBits, base: Path = BASE) -> bool:
+    from core.loader import find_merged
+    from core.snapshot import fingerprint
+    src = find_merged(base)
+    return src is not None and bool(bits.source) and fingerprint(src) != bits.source
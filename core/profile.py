@@ -0,0 +1,198 @@
+"""데이터 품질 프로파일 — 결측 · 카디널리티 · 중복 · 값 범위 · 요금제 분포를 한 번의 스트리밍 패스로
+
+원본을 청크로 읽으며 월(month)별 부분 통계를 쌓는다. 부분 통계는 서로 더하기/최댓값만으로 합쳐지므로
+(HyperLogLog 레지스터는 원소별 max) 월 범위 필터는 해당 월들만 merge()해 답하고, 전체 재스캔이 없다.
+앱은 artifacts/metrics/profile.json을 읽어 Data Quality 카드 · 결측 차트에 쓴다 (`python -m tools.profile`).
+
+중복(행 전체 · (userid, month) 키)은 월이 같은 행끼리만 생기므로 월 파티션 안에서 정확히 세고 합친다.
+"""
+import json, os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg
+from core.loader import BASE, find_merged, iter_merged
+from core.sketch import HLL
+
+VERSION = 2  # 2: 요금제 라벨 정규화(core.labels)
+DEFAULT_PATH = BASE / "artifacts" / "metrics" / "profile.json"
+HLL_P = 12        # 레지스터 4,096개 — 표준오차 ≈ 1.6% (core.sketch)
+HLL_P_USER = 14   # userid — 16,384개, ≈ 0.8%
+KEY_COLS = ["userid", "month"]
+
+
+# ---------- 부분 통계 ----------
+def _scalar(v):
+    return v.item() if hasattr(v, "item") else v
+
+
+def _range(s: pd.Series):
+    s = s.dropna()
+    if s.empty:
+        return None
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        return [_scalar(s.min()), _scalar(s.max())]
+    s = s.astype(str)
+    return [s.min(), s.max()]
+
+
+def _merge_range(a, b):
+    if a is None or b is None:
+        return a or b
+    try:
+        return [min(a[0], b[0]), max(a[1], b[1])]
+    except TypeError:  # 청크마다 숫자/문자로 다르게 추론된 컬럼
+        return [min(str(a[0]), str(b[0])), max(str(a[1]), str(b[1]))]
+
+
+def partial(df: pd.DataFrame, plan_col: str = None) -> dict:
+    """프레임 한 조각의 통계 (중복은 merge 단계에서 해시로 세므로 여기선 제외)"""
+    hll = {}
+    for c in df.columns:
+        h = HLL(HLL_P_USER if c == "userid" else HLL_P)
+        h.add(df[c])
+        hll[c] = h
+    plan = df[plan_col].value_counts().to_dict() if plan_col and plan_col in df.columns else {}
+    return {"rows": len(df), "nulls": {c: int(n) for c, n in df.isna().sum().items()},
+            "ranges": {c: _range(df[c]) for c in df.columns}, "hll": hll,
+            "plan_counts": {str(k): int(v) for k, v in plan.items() if v}, "dup_rows": 0, "dup_keys": 0}
+
+
+def merge(a: dict, b: dict) -> dict:
+    """부분 통계 둘 → 하나 (서로 다른 행 집합이어야 함 — 월 파티션끼리는 항상 성립)"""
+    if a is None:
+        return b
+    out = {"rows": a["rows"] + b["rows"], "dup_rows": a["dup_rows"] + b["dup_rows"],
+           "dup_keys": a["dup_keys"] + b["dup_keys"]}
+    out["nulls"] = {c: a["nulls"].get(c, 0) + b["nulls"].get(c, 0) for c in {**a["nulls"], **b["nulls"]}}
+    out["ranges"] = {c: _merge_range(a["ranges"].get(c), b["ranges"].get(c)) for c in {**a["ranges"], **b["ranges"]}}
+    out["hll"] = {c: (a["hll"][c].merge(b["hll"][c]) if c in a["hll"] and c in b["hll"] else a["hll"].get(c) or b["hll"][c])
+                  for c in {**a["hll"], **b["hll"]}}
+    out["plan_counts"] = {k: a["plan_counts"].get(k, 0) + b["plan_counts"].get(k, 0)
+                          for k in {**a["plan_counts"], **b["plan_counts"]}}
+    return out
+
+
+def _to_json(p: dict) -> dict:
+    return {**p, "hll": {c: h.dumps() for c, h in p["hll"].items()}}
+
+
+def _from_json(p: dict) -> dict:
+    return {**p, "hll": {c: HLL.loads(s) for c, s in p["hll"].items()}}
+
+
+# ---------- 빌드 ----------
+def build(frames, source: dict = None) -> dict:
+    """프레임 청크 iterable → 월별 부분 통계 프로파일 (청크마다 월로 나눠 누적)"""
+    parts, row_hashes, key_hashes = {}, {}, {}
+    columns, plan_col = None, None
+    for chunk in frames:
+        if columns is None:
+            columns, plan_col = list(chunk.columns), agg.plan_column(chunk)
+        month = chunk["month"].astype(str) if "month" in chunk.columns else pd.Series("—", index=chunk.index)
+        rh = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        kh = (pd.util.hash_pandas_object(chunk[KEY_COLS], index=False).to_numpy()
+              if set(KEY_COLS) <= set(chunk.columns) else None)
+        codes, months = pd.factorize(month)
+        for i, m in enumerate(months):
+            sel = codes == i
+            parts[m] = merge(parts.get(m), partial(chunk[sel], plan_col))
+            row_hashes.setdefault(m, []).append(rh[sel])
+            if kh is not None:
+                key_hashes.setdefault(m, []).append(kh[sel])
+    for m, p in parts.items():  # 중복 = 행 수 - 고유 해시 수 (월 안에서만)
+        p["dup_rows"] = p["rows"] - len(np.unique(np.concatenate(row_hashes[m])))
+        if m in key_hashes:
+            p["dup_keys"] = p["rows"] - len(np.unique(np.concatenate(key_hashes[m])))
+    return {"version": VERSION, "created": datetime.now().isoformat(timespec="seconds"), "source": source,
+            "columns": columns or [], "plan_col": plan_col, "partitions": dict(sorted(parts.items()))}
+
+
+def build_from_source(base: Path = BASE, chunk_rows: int = 200_000) -> dict:
+    from core.snapshot import fingerprint
+    path = find_merged(base)
+    if path is None:
+        raise FileNotFoundError("spotify_merged.xlsx(우선) 또는 spotify_merged.csv 를 찾지 못했습니다.")
+    return build(iter_merged(path, chunk_rows), source=fingerprint(path))
+
+
+def write(prof: dict, path=DEFAULT_PATH) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = {**prof, "partitions": {m: _to_json(p) for m, p in prof["partitions"].items()}}
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+# ---------- 읽기 ----------
+class Profile:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = Path(path)
+        doc = json.loads(self.path.read_text(encoding="utf-8"))
+        if doc.get("version") != VERSION:
+            raise ValueError(f"프로파일 버전 불일치: {doc.get('version')}")
+        self.doc = doc
+        self.columns, self.plan_col = doc["columns"], doc.get("plan_col")
+        self.partitions = {m: _from_json(p) for m, p in doc["partitions"].items()}
+        self._merged = {}
+
+    def is_stale(self, base: Path = BASE) -> bool:
+        from core.snapshot import fingerprint
+        src = find_merged(base)
+        if src is None or not self.doc.get("source"):
+            return False
+        return fingerprint(src) != self.doc["source"]
+
+    def months(self) -> list:
+        return sorted(self.partitions)
+
+    def stats(self, months=None) -> dict:
+        """months(없으면 전체) 부분 통계를 합친 것 (월 조합별로 기억)"""
+        key = tuple(sorted(self.partitions if months is None else months))
+        if key not in self._merged:
+            out = None
+            for m in key:
+                if m in self.partitions:
+                    out = merge(out, self.partitions[m])
+            self._merged[key] = out
+        return self._merged[key]
+
+    def for_selection(self, sel: dict):
+        """사이드바 선택이 월 범위뿐(또는 없음)이면 해당 월 통계, 다른 차원이 있으면 None (비트맵으로 계산)"""
+        sel = sel or {}
+        if set(sel) - {"month"}:
+            return None
+        if "month" not in sel:
+            return self.stats()
+        lo, hi = sel["month"]
+        return self.stats([m for m in self.partitions if lo <= m <= hi])
+
+    def null_counts(self, stats: dict) -> pd.Series:
+        return pd.Series({c: stats["nulls"].get(c, 0) for c in self.columns}, dtype="int64")
+
+    def column_table(self, stats: dict) -> pd.DataFrame:
+        """컬럼별 결측 · 고유값(추정) · 값 범위"""
+        rows = []
+        for c in self.columns:
+            rng = stats["ranges"].get(c)
+            rows.append({"column": c, "nulls": stats["nulls"].get(c, 0),
+                         "null_rate(%)": round(stats["nulls"].get(c, 0) / max(stats["rows"], 1) * 100, 2),
+                         "distinct≈": int(round(stats["hll"][c].estimate())) if c in stats["hll"] else None,
+                         "min": None if rng is None else str(rng[0]), "max": None if rng is None else str(rng[1])})
+        return pd.DataFrame(rows)
+
+    def summary(self, stats: dict = None) -> dict:
+        """노트북 summary.json과 같은 키 (+ 키 중복)"""
+        s = stats or self.stats()
+        na = self.null_counts(s).sort_values(ascending=False).head(5)
+        mr = s["ranges"].get("month") or [None, None]
+        return {"rows": s["rows"], "distinct_users": int(round(s["hll"]["userid"].estimate())) if "userid" in s["hll"] else None,
+                "duplicates": s["dup_rows"], "duplicate_keys": s["dup_keys"],
+                "na_top5": {c: int(n) for c, n in na.items()},
+                "month_range": {"min": mr[0], "max": mr[1]},
+                "plan_counts": s["plan_counts"]}
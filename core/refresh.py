@@ -0,0 +1,136 @@
+"""Revenue 지표 백그라운드 갱신 (앱 서버 안에서 노트북 Step1~6 재실행)
+
+메트릭 원본(loader.find_metrics_source — 노트북 정제본, 없으면 spotify_merged.*)의 지문(크기 · 수정시각)을 poll() 때마다(최소 CHECK_EVERY_S 간격) 확인하고,
+바뀌었거나 export가 빠져 있으면 워커 스레드 하나가 파이프라인을 다시 돌린다.
+화면은 그동안 이전 번들을 그대로 쓰고, 계산이 끝나면 번들(dict) 참조 하나를 통째로 바꿔 끼운다 —
+파일이 하나씩 바뀌는 중간 상태나 일부만 새 값인 결과를 보는 세션은 없다.
+새 결과는 data/out_*.csv(파일마다 임시 파일 → rename)와 out_manifest.json(원본 지문)에도 남겨
+다음 서버 시작 때 같은 원본이면 다시 계산하지 않는다. 정적 HTML 리포트(core.report)도 같은 번들로 다시 쓴다
+(STAYORSKIP_REPORT로 경로 지정, 0이면 끔). 지표 계산이 실패하면 error에 남기고 이전 번들을 계속 쓴다.
+리포트는 새 번들을 끼운 뒤에 쓰고, 실패해도 report_error에만 남긴다 — 선택 산출물 때문에 새 지표 서빙이 막히지 않게.
+scipy · sklearn이 없어 만들 수 없는 export(sig · imp)는 이전 번들 값을 그대로 넘겨 받고,
+complete()는 만들 수 있는 export만 본다 — 없는 의존성 때문에 poll()마다 재계산하지 않도록.
+"""
+import json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core import pipeline
+from core.loader import BASE, find_metrics_source, load_merged, load_metrics_input
+from core.snapshot import fingerprint
+
+CHECK_EVERY_S = float(os.environ.get("STAYORSKIP_REFRESH_S", 10))
+MANIFEST = "out_manifest.json"
+REPORT = os.environ.get("STAYORSKIP_REPORT", str(BASE / "artifacts" / "report" / "index.html"))
+REPORT = None if REPORT in ("", "0") else REPORT
+
+
+def complete(exports: dict) -> bool:
+    """설치된 의존성으로 만들 수 있는 export가 다 있나 (sig · imp는 scipy · sklearn이 있을 때만 요구)"""
+    return bool(exports) and all(exports.get(k) is not None for k in pipeline.buildable())
+
+
+def read_manifest(out_dir) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class MetricsRefresher:
+    def __init__(self, out_dir, base=BASE, initial: dict = None, source: dict = None,
+                 check_every: float = CHECK_EVERY_S, report_path=REPORT):
+        self.out_dir, self.base, self.check_every = str(out_dir), base, check_every
+        self.report_path = report_path
+        initial = initial or {k: None for k in pipeline.EXPORT_FILES}
+        if source is None and complete(initial):
+            # 출처를 모르는 export(노트북 산출물)는 지금 원본 기준으로 믿고, 이후 바뀔 때만 다시 계산
+            src = find_metrics_source(base)
+            source = fingerprint(src) if src is not None else None
+        self._bundle = {"version": 0, "source": source, "built": None, "exports": initial}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-refresh")
+        self._future = None
+        self._last_check = float("-inf")
+        self.error = None
+        self.report_error = None
+
+    # ---- 읽기 (세션 스레드) ----
+    def current(self) -> dict:
+        """지금 서빙할 번들 {version, source, built, exports} — 읽기 전용으로 쓸 것"""
+        self.poll()
+        return self._bundle
+
+    def exports(self) -> dict:
+        return self.current()["exports"]
+
+    @property
+    def running(self) -> bool:
+        return self._future is not None and not self._future.done()
+
+    def status(self) -> dict:
+        b = self._bundle
+        return {"version": b["version"], "built": b["built"], "source": b["source"],
+                "running": self.running, "error": self.error, "report_error": self.report_error}
+
+    # ---- 갱신 ----
+    def poll(self, force: bool = False):
+        """원본이 바뀌었거나 export가 비어 있으면 백그라운드 재계산 예약 (이미 도는 중이면 무시)"""
+        now = time.monotonic()
+        with self._lock:
+            if self.running or (not force and now - self._last_check < self.check_every):
+                return
+            self._last_check = now
+            src = find_metrics_source(self.base)
+            if src is None:  # 원본 없는 배포본 — 있는 export만 서빙
+                return
+            fp = fingerprint(src)
+            if not force and fp == self._bundle["source"] and complete(self._bundle["exports"]):
+                return
+            self._future = self._pool.submit(self._rebuild, fp)
+
+    def _rebuild(self, fp: dict):
+        try:
+            raw, _ = load_metrics_input(self.base)  # 읽는 도중 원본이 또 바뀌면 다음 poll()에서 지문이 달라 다시 돈다
+            bundle = pipeline.run_available(raw)
+            exports = pipeline.as_exports(bundle)
+            for k, v in self._bundle["exports"].items():  # 못 만든 선택 export는 이전 값 유지 (경고 화면 방지)
+                if exports.get(k) is None and v is not None:
+                    exports[k] = v
+            new = {"version": self._bundle["version"] + 1, "source": fp,
+                   "built": datetime.now().isoformat(timespec="seconds"), "exports": exports}
+            self._persist(bundle, new)
+            self._bundle = new  # 참조 하나만 교체 → 세션은 이전 번들 아니면 새 번들 전체를 본다
+            self.error = None
+        except Exception as e:  # 원본이 쓰이는 중(깨진 xlsx 등)이어도 서빙은 계속
+            self.error = f"{type(e).__name__}: {e}"
+            return
+        self._report(new)  # 끼운 뒤에 — 리포트 실패는 report_error에만
+
+    def _persist(self, bundle: dict, new: dict):
+        try:
+            pipeline.export(bundle, self.out_dir)
+            path = os.path.join(self.out_dir, MANIFEST)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump({"source": new["source"], "built": new["built"]}, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass  # 읽기 전용 배포 환경이면 메모리 번들만
+
+    def _report(self, new: dict):
+        if self.report_path is None:
+            return
+        from core import report
+        try:
+            tidy, _ = load_merged(self.base)  # EDA 집계는 대시보드와 같은 정규화 라벨로
+            report.write(report.render(new["exports"], report.eda_frames(tidy),
+                                       report.meta_for(new["source"], new["built"])), self.report_path)
+            self.report_error = None
+        except Exception as e:  # 리포트는 선택 산출물 — 실패해도 이미 끼운 새 번들로 서빙
+            self.report_error = f"{type(e).__name__}: {e}"
+
+    def wait(self, timeout: float = None):
+        """진행 중인 재계산이 끝날 때까지 (CLI · 벤치용)"""
+        if self._future is not None:
+            self._future.result(timeout)
@@ -0,0 +1,217 @@
+"""정적 HTML 리포트 — 대시보드 핵심 화면을 서버 없이 열리는 HTML 파일 하나로
+
+Revenue KPI · 유지율/ARPU 추이 · 월 매출 · 세그먼트 LTV · 유의 요인 · 중요도 · EDA 분포를
+앱과 같은 core.charts 템플릿 스펙(데이터 인라인)으로 만들어 vega-embed로 그린다. Streamlit 서버도, 파이썬 세션도 없다:
+
+    html = render(exports, eda_frames(tidy), meta)   # exports = pipeline.load_exports() 모양
+    write(html)                                       # → artifacts/report/index.html (임시 파일 → rename)
+    build()                                           # 원본 로드 → export(없으면 파이프라인) → 기록
+
+Vega · Vega-Lite · vega-embed 스크립트는 기본적으로 CDN(jsdelivr, 설치된 Altair가 쓰는 메이저 버전)에서 받고,
+js_dir에 *.min.js 세 파일이 있으면 HTML 안에 넣어 오프라인에서도 열린다.
+Revenue 지표가 다시 계산되면(core.refresh) 리포트도 같은 번들로 다시 쓴다.
+"""
+import html, json, os
+from datetime import datetime
+from pathlib import Path
+
+import altair as alt
+import pandas as pd
+
+from core import aggregates as agg, charts, pipeline, ui
+from core.loader import BASE, find_merged
+
+DEFAULT_PATH = BASE / "artifacts" / "report" / "index.html"
+LIBS = (("vega", alt.VEGA_VERSION), ("vega-lite", alt.VEGALITE_VERSION), ("vega-embed", alt.VEGAEMBED_VERSION))
+CDN = "https://cdn.jsdelivr.net/npm/{name}@{version}"
+
+CSS = f"""
+body {{ background:{ui.BG_DARK}; color:{ui.TEXT}; font-family:-apple-system,"Apple SD Gothic Neo","Malgun Gothic",sans-serif;
+       max-width:1200px; margin:0 auto; padding:24px; }}
+h1 {{ color:{ui.GREEN}; margin-bottom:4px; }}
+h2 {{ border-bottom:1px solid #2a2a2a; padding-bottom:6px; margin-top:36px; }}
+.meta, .cap {{ color:{ui.MUTED}; font-size:13px; }}
+.kpis {{ display:grid; grid-template-columns:repeat(4,1fr); gap:12px; }}
+.kpi {{ background:{ui.PANEL}; border-radius:10px; padding:14px 16px; }}
+.kpi b {{ display:block; font-size:26px; color:{ui.GREEN}; }}
+.grid {{ display:grid; grid-template-columns:1fr 1fr; gap:16px; }}
+.chart {{ width:100%; }}
+table {{ border-collapse:collapse; width:100%; font-size:13px; }}
+th, td {{ border-bottom:1px solid #2a2a2a; padding:4px 8px; text-align:left; }}
+"""
+
+
+# ---------- 집계 ----------
+def eda_frames(tidy: pd.DataFrame) -> dict:
+    """리포트의 EDA · 월 매출 부분 집계 (필터 없는 앱 화면과 같은 함수)"""
+    plan_col = agg.plan_column(tidy)
+    out = {"overview": agg.overview(tidy), "insights": agg.eda_insights(tidy),
+           "monthly_revenue": agg.monthly_revenue_by_month(tidy), "missing": agg.missing_rate_top(tidy)}
+    if plan_col:
+        out["plans"] = agg.plan_counts(tidy, plan_col)
+    if "spotify_listening_device" in tidy.columns:
+        out["devices"] = agg.device_top(tidy)
+    if "music_time_slot" in tidy.columns:
+        out["time_slots"] = agg.time_slot_counts(tidy)
+    return out
+
+
+def segment_top(pref: pd.DataFrame, k: int = 10) -> pd.DataFrame:
+    """세그먼트별 평균 LTV 상위 k (variable = group 라벨)"""
+    view = pref.assign(group=[row.get(row["variable"]) for _, row in pref.iterrows()])
+    view = view.dropna(subset=["avg_ltv"]).sort_values("avg_ltv", ascending=False).head(k)
+    return pd.DataFrame({"segment": view["variable"].astype(str) + " = " + view["group"].astype(str),
+                         "avg_ltv": view["avg_ltv"].to_numpy(), "users": view["users"].to_numpy()})
+
+
+# ---------- HTML ----------
+def _chart_specs(exports: dict, eda: dict) -> dict:
+    """{div id: Vega-Lite 스펙(데이터 인라인)} — 없는 입력의 차트는 빠진다"""
+    ui.apply_theme()
+    out = {}
+
+    def add(key, kind, data, **params):
+        s = charts.inline(charts.spec(kind, data, **params))
+        s.setdefault("width", "container")
+        out[key] = s
+
+    if exports.get("retention") is not None:
+        ret = exports["retention"]
+        add("retention", "line", pd.DataFrame({"period": ret["from_to"].astype(str),
+                                               "premium_retention": pd.to_numeric(ret["premium_retention"], errors="coerce")}),
+            x="period", y="premium_retention", y_title="Premium Retention", y_domain=(0, 1.05), fmt=".1%", height=300)
+    if exports.get("arpu") is not None:
+        arpu = exports["arpu"]
+        add("arpu", "line", pd.DataFrame({"month": arpu["month"].astype(str),
+                                          "arpu": pd.to_numeric(arpu["arpu"], errors="coerce")}),
+            x="month", y="arpu", y_title="ARPU (₩)", axis_format="~s", height=300)
+    monthly = eda.get("monthly_revenue")
+    if monthly is not None and not monthly.empty:
+        add("monthly_revenue", "bar_trend", monthly, x="month", y=monthly.columns[1], window=3, x_title="Month",
+            y_title="월별 매출 합계 (₩)", axis_format="~s", height=320)
+    if exports.get("pref") is not None:
+        add("segment_ltv", "hbar", segment_top(exports["pref"]), x="avg_ltv", y="segment", x_title="평균 LTV (₩)",
+            axis_format="~s", label_limit=400, height=420,
+            tooltip=(("segment:N", "세그먼트", None), ("avg_ltv:Q", "평균 LTV", ",.0f"), ("users:Q", "Users", None)))
+    if exports.get("imp") is not None and exports["imp"].shape[1] >= 2:
+        imp = exports["imp"]
+        imp = imp.rename(columns={imp.columns[0]: "feature", imp.columns[1]: "importance"})[["feature", "importance"]]
+        add("importance", "hbar", imp.dropna().sort_values("importance", ascending=False).head(10), x="importance",
+            y="feature", x_title="Importance", y_title="Feature", fmt=".3f", label_limit=400, height=380)
+    if eda.get("plans") is not None:
+        add("plans", "donut", eda["plans"], theta="users", color="plan")
+    if eda.get("devices") is not None:
+        add("devices", "hbar", eda["devices"], x="count", y="device", x_title="Users", y_title="device", height=260)
+    if eda.get("time_slots") is not None:
+        add("time_slots", "line", eda["time_slots"], x="time_slot", y="users", sort=agg.TIME_SLOT_ORDER,
+            y_title="User Count", point_size=70, stroke_width=3, height=280)
+    if eda.get("missing") is not None:
+        add("missing", "hbar", eda["missing"], x="missing_rate(%)", y="column", x_title="Missing (%)", fmt=None, height=280)
+    return out
+
+
+def _kpi_cards(exports: dict) -> str:
+    if exports.get("kpi") is None:
+        return "<p class='cap'>KPI export가 없습니다.</p>"
+    k = pipeline.kpi_values(exports["kpi"])
+    cards = (("전환율", f"{k.get('conversion_rate', float('nan')) * 100:.1f}%"),
+             ("유지율(평균)", f"{k.get('premium_retention_mean', float('nan')) * 100:.1f}%"),
+             ("ARPU(원)", f"{k.get('arpu_overall', float('nan')):,.0f}"),
+             ("평균 Premium 기간", f"{k.get('avg_premium_duration', float('nan')):.2f}개월"))
+    return "<div class='kpis'>" + "".join(f"<div class='kpi'>{t}<b>{v}</b></div>" for t, v in cards) + "</div>"
+
+
+def _sig_table(sig) -> str:
+    if sig is None:
+        return "<p class='cap'>유의성 검정 export가 없습니다.</p>"
+    view = sig.query("p_value < 0.05").sort_values("p_value").head(10)
+    return view.to_html(index=False, border=0, float_format=lambda v: f"{v:.3g}")
+
+
+def _scripts(js_dir=None) -> str:
+    """vega · vega-lite · vega-embed 로더 — js_dir에 세 파일이 다 있으면 인라인, 아니면 CDN"""
+    if js_dir is not None:
+        files = [Path(js_dir) / f"{name}.min.js" for name, _ in LIBS]
+        if all(f.exists() for f in files):
+            return "\n".join("<script>" + f.read_text(encoding="utf-8").replace("</script", "<\\/script") + "</script>"
+                             for f in files)
+    return "\n".join(f"<script src='{CDN.format(name=name, version=v)}'></script>" for name, v in LIBS)
+
+
+def render(exports: dict, eda: dict, meta: dict = None, js_dir=None) -> str:
+    """exports(pipeline.load_exports 모양) + eda_frames() → HTML 문자열"""
+    meta = meta or {}
+    specs = _chart_specs(exports, eda)
+    div = lambda key: f"<div class='chart' id='{key}'></div>" if key in specs else ""
+    ov = eda.get("overview") or {}
+    insights = "".join(f"<li>{html.escape(str(s))}</li>" for s in eda.get("insights", []))
+    payload = json.dumps(specs, ensure_ascii=False, default=str).replace("</", "<\\/")
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>StayOrSkip 리포트</title>
+<style>{CSS}</style>
+{_scripts(js_dir)}
+</head><body>
+<h1>StayOrSkip 리포트</h1>
+<p class="meta">생성 {html.escape(str(meta.get("built", "—")))} · 원본 {html.escape(str(meta.get("source", "—")))}
+ · {ov.get("n_rows", 0):,}행 · 사용자 {ov.get("n_users", 0):,}명 · {html.escape(str(ov.get("month_min", "—")))} ~ {html.escape(str(ov.get("month_max", "—")))}</p>
+
+<h2>💰 Revenue KPI</h2>
+{_kpi_cards(exports)}
+<h2>📈 Retention &amp; ARPU Trend</h2>
+<div class="grid">{div("retention")}{div("arpu")}</div>
+<h2>📊 월별 매출 합계</h2>
+{div("monthly_revenue")}
+<p class="cap">막대: 월 매출 합계 · 선: 최근 3개월 이동 평균</p>
+<h2>🎧 세그먼트별 평균 LTV (Top 10)</h2>
+{div("segment_ltv")}
+<h2>🔍 통계적으로 유의한 요인 (p&lt;0.05)</h2>
+{_sig_table(exports.get("sig"))}
+<h2>🌲 LTV 영향 요인 (Feature Importance)</h2>
+{div("importance")}
+<h2>🔎 EDA</h2>
+<div class="grid">{div("plans")}{div("devices")}</div>
+<div class="grid">{div("time_slots")}{div("missing")}</div>
+<ul class="cap">{insights}</ul>
+
+<script type="application/json" id="specs">{payload}</script>
+<script>
+const specs = JSON.parse(document.getElementById("specs").textContent);
+for (const [id, spec] of Object.entries(specs)) {{
+  vegaEmbed("#" + id, spec, {{actions: {{export: true, source: false, compiled: false, editor: false}}}})
+    .catch(err => {{ document.getElementById(id).textContent = "차트를 그리지 못했습니다: " + err; }});
+}}
+</script>
+</body></html>
+"""
+
+
+def write(text: str, path=DEFAULT_PATH) -> Path:
+    """HTML → 파일 (임시 파일에 쓰고 rename — 보고 있던 리포트가 반쯤 쓴 파일이 되지 않게)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def meta_for(source: dict = None, built: str = None) -> dict:
+    src = source or {}
+    return {"built": built or datetime.now().isoformat(timespec="seconds"),
+            "source": src.get("name", "—") if isinstance(src, dict) else src}
+
+
+def build(base: Path = BASE, path=DEFAULT_PATH, exports: dict = None, js_dir=None) -> Path:
+    """원본 로드 → export(없으면 파이프라인) · EDA 집계 → HTML 기록"""
+    from core.loader import load_merged, load_metrics_input
+    from core.snapshot import fingerprint
+    tidy, _ = load_merged(base)
+    if exports is None:
+        exports = pipeline.load_exports(str(base / "data"))
+        if any(v is None for v in exports.values()):
+            exports = pipeline.as_exports(pipeline.run_available(load_metrics_input(base)[0]))
+    src = find_merged(base)
+    meta = meta_for(fingerprint(src) if src is not None else None)
+    return write(render(exports, eda_frames(tidy), meta, js_dir), path)
@@ -0,0 +1,137 @@
+"""세그먼트 × 월 KPI 텐서 — 취향 변수 값(세그먼트)마다 월별 사용자 · Premium 비중 · 유지율 · ARPU · 매출
+
+세그먼트는 pipeline.pref_summary와 같이 유저의 최신 월 취향값이다(유저 하나는 변수마다 세그먼트 하나).
+원본 행을 (유저, 월) 쌍으로 한 번 줄이고(같은 쌍의 행은 Premium OR · 매출 합), 변수마다 쌍 배열 위에서
+np.bincount로 (세그먼트, 월) 칸을 센다. 결과는 float64 배열 하나 (전체 세그먼트, 월, 카운트) + 코드 인덱스:
+
+    tr = build(tidy)                              # PREF_COLS 전부
+    tr.trend("fav_music_genre", "Pop")            # month · users · premium_share · retention · arpu · revenue
+    tr.compare("fav_music_genre", ["Pop", "Rock"], "arpu")   # 긴 형식 (차트 series용)
+    tr.to_frame() / from_frame(df)                # 스냅샷 저장용 긴 표 ↔ 텐서
+
+카운트는 합칠 수 있는 값만 둔다(users · premium_users · kept · revenue · revenue_rows). 비율은 꺼낼 때 나눈다:
+premium_share = premium_users / users, retention(m→m+1) = kept / premium_users, arpu = revenue / revenue_rows(노트북 ARPU와 같은 행 평균).
+"""
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg, labels
+from core.pipeline import PREF_COLS
+
+COUNTS = ("users", "premium_users", "kept", "revenue", "revenue_rows")
+METRICS = {"arpu": "ARPU (₩)", "premium_share": "Premium 비중", "retention": "다음 달 유지율", "revenue": "매출 (₩)",
+           "users": "사용자 수"}
+
+
+class SegmentTrends:
+    """data: (세그먼트, 월, len(COUNTS)) float64 · index: variable · value(문자열) · users(전체 기간) — data 행 순서"""
+
+    def __init__(self, months, index: pd.DataFrame, data: np.ndarray):
+        self.months, self.index, self.data = list(months), index.reset_index(drop=True), data
+        self._rows = {(v, s): i for i, (v, s) in enumerate(zip(self.index["variable"], self.index["value"]))}
+
+    def variables(self) -> list:
+        return list(dict.fromkeys(self.index["variable"]))
+
+    def values(self, variable: str) -> pd.DataFrame:
+        """변수의 세그먼트 (value, users) — 사용자 많은 순"""
+        seg = self.index[self.index["variable"] == variable]
+        return seg[["value", "users"]].sort_values("users", ascending=False, kind="stable").reset_index(drop=True)
+
+    def row(self, variable: str, value) -> int:
+        return self._rows[(variable, str(value))]
+
+    def trend(self, variable: str, value) -> pd.DataFrame:
+        c = dict(zip(COUNTS, self.data[self.row(variable, value)].T))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame({"month": self.months, "users": c["users"].astype(np.int64),
+                                 "premium_share": c["premium_users"] / c["users"],
+                                 "retention": np.append(c["kept"][:-1] / c["premium_users"][:-1], np.nan),
+                                 "arpu": c["revenue"] / c["revenue_rows"], "revenue": c["revenue"]})
+
+    def compare(self, variable: str, values, metric: str = "arpu") -> pd.DataFrame:
+        """여러 세그먼트의 한 지표 (month, segment, value) — 사용자가 없는 달은 뺀다"""
+        parts = [self.trend(variable, v).assign(segment=str(v)) for v in values]
+        out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["month", "segment", metric])
+        return out.loc[out["users"] > 0, ["month", "segment", metric]].rename(columns={metric: "value"}) \
+                  .dropna().reset_index(drop=True)
+
+    # ---- 저장 ----
+    def to_frame(self) -> pd.DataFrame:
+        """긴 표 (variable, value, segment_users, month, COUNTS...) — 세그먼트 × 월 행"""
+        n_s, n_m, _ = self.data.shape
+        out = pd.DataFrame({"variable": np.repeat(self.index["variable"].to_numpy(), n_m),
+                            "value": np.repeat(self.index["value"].to_numpy(), n_m),
+                            "segment_users": np.repeat(self.index["users"].to_numpy(np.int64), n_m),
+                            "month": np.tile(np.asarray(self.months, dtype=object), n_s)})
+        for k, name in enumerate(COUNTS):
+            out[name] = self.data[:, :, k].ravel()
+        return out
+
+
+def from_frame(df: pd.DataFrame) -> SegmentTrends:
+    """to_frame() 출력 → SegmentTrends (행 순서 = 세그먼트 순서 × 월 순서)"""
+    months = list(dict.fromkeys(df["month"]))
+    n_m = len(months)
+    data = df[list(COUNTS)].to_numpy(np.float64).reshape(-1, n_m, len(COUNTS))
+    index = df.iloc[::n_m][["variable", "value", "segment_users"]].rename(columns={"segment_users": "users"})
+    return SegmentTrends(months, index, data)
+
+
+# ---------- 빌드 ----------
+def _latest_rows(users: np.ndarray, months: np.ndarray, n_users: int) -> np.ndarray:
+    """유저별 최신 월 행 위치 (pipeline.latest_prefs: userid · month 정렬 후 마지막 행)"""
+    order = np.lexsort((np.arange(len(users)), months, users))
+    last = np.full(n_users, -1, np.int64)
+    last[users[order]] = order  # 같은 유저는 정렬 순서상 뒤의 행이 덮어씀
+    return last
+
+
+def build(df: pd.DataFrame, cols=PREF_COLS, plan_col: str = None) -> SegmentTrends:
+    """tidy → 세그먼트 × 월 텐서 (취향 변수 cols 중 있는 것 전부)"""
+    plan_col = plan_col or agg.plan_column(df)
+    users, user_labels = pd.factorize(df["userid"])
+    months, month_labels = pd.factorize(df["month"].astype(str), sort=True)
+    ok = (users >= 0) & (months >= 0)
+    paid = labels.premium_mask(df[plan_col])[ok] if plan_col else np.zeros(int(ok.sum()), bool)
+    rev = pd.to_numeric(df[agg.revenue_column(df)], errors="coerce").to_numpy(np.float64)[ok]
+    u, m = users[ok], months[ok].astype(np.int64)
+    n_u, n_m = len(user_labels), len(month_labels)
+
+    # (유저, 월) 쌍: Premium 여부 · 매출 합 · 매출 행 수 · 다음 달에도 Premium인지
+    pairs, inv = np.unique(u.astype(np.int64) * n_m + m, return_inverse=True)
+    prem = np.bincount(inv, weights=paid, minlength=len(pairs)) > 0
+    has = ~np.isnan(rev)
+    revenue = np.bincount(inv[has], weights=rev[has], minlength=len(pairs))
+    rev_rows = np.bincount(inv[has], minlength=len(pairs)).astype(np.float64)
+    pu, pm = pairs // n_m, pairs % n_m
+    prem_keys = pairs[prem]  # 정렬돼 있음
+    pos = np.searchsorted(prem_keys, pairs + 1)
+    kept = prem & (pm + 1 < n_m) & (pos < len(prem_keys)) & (prem_keys[np.minimum(pos, len(prem_keys) - 1)] == pairs + 1)
+    weights = (None, prem, kept, revenue, rev_rows)
+
+    latest = _latest_rows(u, m, n_u)
+    seen = latest >= 0  # 유효 행(userid · month 있음)이 하나도 없는 유저는 세그먼트 없음(-1)
+    blocks, index = [], []
+    for col in [c for c in cols if c in df.columns]:
+        vals = df[col].to_numpy()[ok][latest[seen]]
+        try:
+            seen_codes, seg_labels = pd.factorize(vals, sort=True)
+        except TypeError:  # 섞인 타입은 등장 순서
+            seen_codes, seg_labels = pd.factorize(vals)
+        codes = np.full(n_u, -1, np.int64)
+        codes[seen] = seen_codes
+        n_s = len(seg_labels)
+        seg = codes[pu]
+        keep = seg >= 0
+        cell = seg[keep] * n_m + pm[keep]
+        block = np.stack([np.bincount(cell, weights=None if w is None else w[keep].astype(np.float64),
+                                      minlength=n_s * n_m) for w in weights], axis=-1).reshape(n_s, n_m, len(COUNTS))
+        blocks.append(block)
+        index.append(pd.DataFrame({"variable": col, "value": [str(v) for v in seg_labels],
+                                   "users": np.bincount(codes[codes >= 0], minlength=n_s)}))
+    if not blocks:
+        return SegmentTrends([str(x) for x in month_labels], pd.DataFrame(columns=["variable", "value", "users"]),
+                             np.zeros((0, n_m, len(COUNTS))))
+    return SegmentTrends([str(x) for x in month_labels], pd.concat(index, ignore_index=True),
+                         np.concatenate(blocks).astype(np.float64))
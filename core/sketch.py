@@ -0,0 +1,114 @@
+"""고유값 수 근사 (HyperLogLog) — 데이터 품질 프로파일 · 필터별 고유 사용자 수 공용
+
+레지스터 배열은 원소별 max로 합쳐지므로(합집합) 월 · 요금제 · 세그먼트 셀마다 스케치를 만들어 두면
+어떤 필터 조합이든 해당 셀들의 max → 추정 한 번으로 답한다(행을 다시 훑거나 userid를 다시 해시하지 않음).
+estimate()는 (..., m) 배열을 받아 앞 축마다 한꺼번에 추정한다.
+"""
+import base64, zlib
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_P = 12  # 레지스터 4,096개 — 표준오차 ≈ 1.04/√m ≈ 1.6%
+
+
+def hash_values(values) -> np.ndarray:
+    """값 → uint64 해시. 숫자는 float64로 맞춰 청크마다 int/float로 추론돼도 같은 해시"""
+    s = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+        s = s.astype(np.float64)
+    return pd.util.hash_pandas_object(s, index=False).to_numpy()
+
+
+def split(h: np.ndarray, p: int):
+    """64비트 해시 → (레지스터 번호 = 상위 p비트, 랭크 = 나머지의 선행 0 개수 + 1)"""
+    h = np.asarray(h, dtype=np.uint64)
+    idx = (h >> np.uint64(64 - p)).astype(np.intp)
+    bitlen = np.frexp((h << np.uint64(p)).astype(np.float64))[1]  # 0이면 0
+    return idx, np.clip(65 - bitlen, 1, 64 - p + 1).astype(np.uint8)
+
+
+def _sigma(x: float) -> float:
+    if x == 1.0:
+        return float("inf")
+    y, z = 1.0, x
+    while True:
+        x *= x
+        z_old, z = z, z + x * y
+        y += y
+        if z == z_old:
+            return z
+
+
+def _tau(x: float) -> float:
+    if x == 0.0 or x == 1.0:
+        return 0.0
+    y, z = 1.0, 1.0 - x
+    while True:
+        x = np.sqrt(x)
+        z_old = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == z_old:
+            return z / 3
+
+
+def _estimate_hist(c: np.ndarray, m: int) -> float:
+    """랭크 히스토그램 c[0..q+1] → 추정치 (Ertl 2017 개선 추정 — 보정표 없이 전 구간에서 편향이 작다)"""
+    q = len(c) - 2
+    z = m * _tau(1 - c[q + 1] / m)
+    for k in range(q, 0, -1):
+        z = 0.5 * (z + c[k])
+    z += m * _sigma(c[0] / m)
+    return m * m / (2 * np.log(2) * z)
+
+
+def estimate(reg: np.ndarray):
+    """레지스터 (..., m) → 추정 고유값 수. 1차원이면 스칼라"""
+    reg = np.asarray(reg)
+    m = reg.shape[-1]
+    q = 64 - (m.bit_length() - 1)
+    flat = reg.reshape(-1, m)
+    out = np.array([_estimate_hist(np.bincount(r, minlength=q + 2), m) for r in flat]).reshape(reg.shape[:-1])
+    return out[()]
+
+
+def registers(cells: np.ndarray, h: np.ndarray, n_cells: int, p: int = DEFAULT_P) -> np.ndarray:
+    """행별 (셀 번호, 해시) → 셀별 레지스터 (n_cells, 2^p) 를 한 번에"""
+    m = 1 << p
+    reg = np.zeros(n_cells * m, np.uint8)
+    if len(h):
+        idx, rank = split(h, p)
+        np.maximum.at(reg, np.asarray(cells, dtype=np.intp) * m + idx, rank)
+    return reg.reshape(n_cells, m)
+
+
+class HLL:
+    def __init__(self, p: int = DEFAULT_P, registers: np.ndarray = None):
+        self.p, self.m = p, 1 << p
+        self.reg = np.zeros(self.m, np.uint8) if registers is None else registers
+
+    def add_hashes(self, h: np.ndarray):
+        """64비트 해시 배열 추가"""
+        if len(h) == 0:
+            return
+        idx, rank = split(h, self.p)
+        np.maximum.at(self.reg, idx, rank)
+
+    def add(self, values: pd.Series):
+        """값(결측 제외)의 고유값만 해시해 추가 — 같은 값을 여러 번 넣어도 결과는 같다"""
+        self.add_hashes(hash_values(values.dropna().unique()))
+
+    def merge(self, other: "HLL") -> "HLL":
+        return HLL(self.p, np.maximum(self.reg, other.reg))
+
+    def estimate(self) -> float:
+        return float(estimate(self.reg))
+
+    def dumps(self) -> str:
+        return base64.b64encode(zlib.compress(bytes([self.p]) + self.reg.tobytes())).decode("ascii")
+
+    @classmethod
+    def loads(cls, s: str) -> "HLL":
+        raw = zlib.decompress(base64.b64decode(s))
+        return cls(raw[0], np.frombuffer(raw[1:], dtype=np.uint8).copy())
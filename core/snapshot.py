@@ -0,0 +1,235 @@
+"""대시보드 스냅샷 — 화면에 쓰는 집계를 미리 계산해 파일 하나로
+
+새 컨테이너의 첫 방문자가 xlsx 읽기 · 매출 파싱 · 집계를 전부 치르지 않도록,
+`python -m tools.snapshot`으로 Dataset 탭 차트 · EDA 카운트 · Revenue KPI/세그먼트 표를
+미리 만들어 두고 앱은 시작할 때 이 파일을 memory-map 해서 그대로 쓴다.
+원본은 사이드바 필터를 걸 때만(행 단위 계산이 필요할 때) 읽는다.
+
+파일 구조 (*.snap):
+    MAGIC | Arrow IPC 파일 블롭 (표마다 하나, 비압축 → mmap zero-copy) ... | manifest(JSON) | manifest 길이(uint64 LE)
+manifest에는 블롭 위치와 스칼라/리스트 값(overview, 인사이트 문구, 필터 옵션 등), 원본 파일 지문이 들어간다.
+"""
+import json, os, struct
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from core import aggregates as agg, filters, pipeline, segtrends, transitions
+from core.loader import BASE, find_merged
+
+MAGIC = b"SOSNAP1\n"
+VERSION = 3  # 2: 요금제 · 기기 · 빈도 라벨 정규화(core.labels), 3: 구간 라벨(연령) 옵션을 하한 숫자 순으로
+DEFAULT_PATH = Path(os.environ.get("STAYORSKIP_SNAPSHOT", BASE / "artifacts" / "snapshot" / "dashboard.snap"))
+PREVIEW_ROWS = 5
+
+
+def fingerprint(path) -> dict:
+    """원본 파일 지문 (이름 · 크기 · 수정시각) — 스냅샷이 낡았는지 판단용"""
+    st = Path(path).stat()
+    return {"name": Path(path).name, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+# ---------- 빌드 ----------
+def compute(tidy: pd.DataFrame, exports: dict = None) -> dict:
+    """앱이 그리는 집계 전부 → {이름: DataFrame | JSON 값}"""
+    plan_col = agg.plan_column(tidy)
+    ix = filters.FilterIndex(tidy)
+    out = {
+        "schema": tidy.head(0),
+        "preview": tidy.head(PREVIEW_ROWS),
+        "overview": agg.overview(tidy),
+        "plan_col": plan_col,
+        "options": {dim: ix.options(dim) for dim in ix.dims},
+        # Dataset 탭
+        "monthly_revenue": agg.monthly_revenue(tidy),
+        "na_top": agg.na_top(tidy),
+        "total_revenue": agg.total_revenue(tidy),
+        # EDA 탭
+        "missing_rate_top": agg.missing_rate_top(tidy),
+        "eda_insights": agg.eda_insights(tidy),
+        # Revenue 탭
+        "monthly_revenue_by_month": agg.monthly_revenue_by_month(tidy),
+    }
+    if plan_col:
+        out["users_by_plan_latest"] = agg.users_by_plan_latest(tidy, plan_col)
+        out["revenue_by_plan"] = agg.revenue_by_plan(tidy, plan_col)
+        out["plan_counts"] = agg.plan_counts(tidy, plan_col)
+        out["plan_transitions"] = transitions.transition_table(tidy, plan_col)
+    if "userid" in tidy.columns and any(c in tidy.columns for c in pipeline.PREF_COLS):
+        out["segment_trends"] = segtrends.build(tidy, plan_col=plan_col).to_frame()
+    if "spotify_listening_device" in tidy.columns:
+        out["device_top"] = agg.device_top(tidy)
+    if "music_time_slot" in tidy.columns:
+        out["time_slot_counts"] = agg.time_slot_counts(tidy)
+    if "premium_duration" in tidy.columns:
+        out["premium_duration_hist"] = agg.histogram(tidy, "premium_duration")
+    for key, frame in (exports or {}).items():
+        if frame is not None:
+            out[f"export.{key}"] = frame
+    return out
+
+
+def _ipc_blob(df: pd.DataFrame) -> bytes:
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as w:
+        w.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _jsonable(v):
+    if hasattr(v, "item"):  # numpy 스칼라
+        return v.item()
+    if isinstance(v, dict):
+        return {k: _jsonable(x) for k, x in v.items()}
+    if isinstance(v, (list, tuple)):
+        return [_jsonable(x) for x in v]
+    return v
+
+
+def write(items: dict, path=DEFAULT_PATH, source: dict = None) -> Path:
+    """compute() 결과 → 스냅샷 파일 (임시 파일에 쓰고 rename — 읽는 쪽이 반쯤 쓴 파일을 보지 않게)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+                "source": source, "frames": {}, "values": {}}
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(MAGIC)
+        for name, v in items.items():
+            if isinstance(v, pd.DataFrame):
+                blob = _ipc_blob(v)
+                manifest["frames"][name] = [f.tell(), len(blob)]
+                f.write(blob)
+            else:
+                manifest["values"][name] = _jsonable(v)
+        raw = json.dumps(manifest, ensure_ascii=False).encode("utf-8")
+        f.write(raw)
+        f.write(struct.pack("<Q", len(raw)))
+    os.replace(tmp, path)
+    return path
+
+
+def build(base: Path = BASE, path=DEFAULT_PATH, exports: dict = None) -> Path:
+    """원본 로드 → 집계 → 기록. exports가 없으면 data/out_*.csv, 그것도 없으면 파이프라인 실행"""
+    from core.loader import find_metrics_source, load_merged, load_metrics_input
+    tidy, _ = load_merged(base)
+    if exports is None:
+        exports = pipeline.load_exports(str(base / "data"))
+        if any(v is None for v in exports.values()):
+            exports = pipeline.as_exports(pipeline.run_available(load_metrics_input(base)[0]))
+    items = compute(tidy, exports)
+    items["metrics_source"] = fingerprint(find_metrics_source(base))  # export가 어느 원본 기준인지 (refresh용)
+    return write(items, path, source=fingerprint(find_merged(base)))
+
+
+# ---------- 읽기 ----------
+class Snapshot:
+    """memory-map 된 스냅샷. 표는 처음 요청할 때 Arrow → pandas로 바꿔 보관"""
+
+    def __init__(self, path=DEFAULT_PATH):
+        import pyarrow as pa
+        self.path = Path(path)
+        self._mm = pa.memory_map(str(self.path), "r")
+        buf = self._mm.read_buffer()
+        if buf.size < len(MAGIC) + 8 or buf.slice(0, len(MAGIC)).to_pybytes() != MAGIC:
+            raise ValueError(f"스냅샷 형식이 아닙니다: {self.path}")
+        (n,) = struct.unpack("<Q", buf.slice(buf.size - 8, 8).to_pybytes())
+        self.manifest = json.loads(buf.slice(buf.size - 8 - n, n).to_pybytes())
+        if self.manifest.get("version") != VERSION:
+            raise ValueError(f"스냅샷 버전 불일치: {self.manifest.get('version')}")
+        self._buf = buf
+        self._frames = {}
+
+    def __contains__(self, name) -> bool:
+        return name in self.manifest["frames"] or name in self.manifest["values"]
+
+    def frame(self, name: str) -> pd.DataFrame:
+        if name not in self._frames:
+            import pyarrow as pa
+            off, length = self.manifest["frames"][name]
+            table = pa.ipc.open_file(self._buf.slice(off, length)).read_all()  # zero-copy
+            self._frames[name] = table.to_pandas()
+        return self._frames[name].copy(deep=False)
+
+    def value(self, name: str, default=None):
+        return self.manifest["values"].get(name, default)
+
+    def get(self, name: str, default=None):
+        if name in self.manifest["frames"]:
+            return self.frame(name)
+        return self.value(name, default)
+
+    def is_stale(self, base: Path = BASE) -> bool:
+        """원본이 있고 빌드 때와 지문이 다르면 낡은 것. 원본이 없으면(배포본) 스냅샷을 그대로 믿는다"""
+        src = find_merged(base)
+        if src is None or not self.manifest.get("source"):
+            return False
+        return fingerprint(src) != self.manifest["source"]
+
+    def exports(self) -> dict:
+        return {k: (self.frame(f"export.{k}") if f"export.{k}" in self else None) for k in pipeline.EXPORT_FILES}
+
+    def options(self, dim: str) -> list:
+        return self.value("options", {}).get(dim, [])
+
+
+class SnapshotView:
+    """필터 없는 Dataset / EDA 집계를 스냅샷에서 — FilteredView와 같은 메서드.
+    스냅샷에 없는 조합(기본값이 아닌 k 등)은 fallback()이 돌려주는 라이브 뷰로 넘긴다."""
+
+    active = False
+    sel = {}
+    approx_users = False  # 스냅샷 값은 빌드 때 정확히 센 것
+
+    def __init__(self, snap: Snapshot, fallback):
+        self.snap = snap
+        self._fallback = fallback
+
+    def _frame(self, name, *args, default_args=()):
+        if name in self.snap and tuple(args) == tuple(default_args):
+            return self.snap.frame(name)
+        return getattr(self._fallback(), name)(*args)
+
+    def n_rows(self) -> int:
+        return self.snap.value("overview")["n_rows"]
+
+    def overview(self) -> dict:
+        return dict(self.snap.value("overview"))
+
+    def preview(self, k: int = 5) -> pd.DataFrame:
+        if k <= PREVIEW_ROWS:
+            return self.snap.frame("preview").head(k)
+        return self._fallback().preview(k)
+
+    def monthly_revenue(self):
+        return self._frame("monthly_revenue")
+
+    def users_by_plan_latest(self, plan_col: str):
+        return self._frame("users_by_plan_latest", plan_col, default_args=(self.snap.value("plan_col"),))
+
+    def revenue_by_plan(self, plan_col: str):
+        return self._frame("revenue_by_plan", plan_col, default_args=(self.snap.value("plan_col"),))
+
+    def na_top(self, k: int = 5):
+        return self._frame("na_top", k, default_args=(5,))
+
+    def total_revenue(self) -> int:
+        return self.snap.value("total_revenue")
+
+    def missing_rate_top(self, k: int = 10):
+        return self._frame("missing_rate_top", k, default_args=(10,))
+
+    def plan_counts(self, plan_col: str = None):
+        return self._frame("plan_counts")
+
+    def device_top(self, k: int = 5):
+        return self._frame("device_top", k, default_args=(5,))
+
+    def time_slot_counts(self, order=agg.TIME_SLOT_ORDER):
+        return self._frame("time_slot_counts", tuple(order), default_args=(tuple(agg.TIME_SLOT_ORDER),))
+
+    def eda_insights(self) -> list:
+        return list(self.snap.value("eda_insights"))
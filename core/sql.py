@@ -0,0 +1,234 @@
+"""SQL 지표 엔진 (선택) — Revenue KPI를 파라미터 쿼리로, DuckDB가 있으면 DuckDB · 없으면 표준 라이브러리 sqlite3
+
+노트북 Step2~3(core.pipeline)의 ARPU · 유지율 · 전환율 · 평균 Premium 기간 · 세그먼트 LTV를 같은 정의의 SQL로 옮겼다.
+두 백엔드가 같은 쿼리 문자열을 쓰고, 결과는 pipeline과 같은 열 이름의 DataFrame이다:
+
+    eng = connect(tidy)                         # 프레임 → DuckDB 뷰(복사 없음) / sqlite 테이블
+    eng = connect(parts="data/parts")           # 파티션 저장소(core.partitions) — DuckDB는 Parquet을 직접 스캔(메모리 밖 ·
+                                                #   멀티스레드), sqlite는 파티션을 하나씩 DB 파일에 적재
+    eng.kpis()                                  # pipeline.kpi_values(kpi_table(...))와 같은 dict
+    eng.retention("2023-01", "2023-04")         # 월 범위(포함)로 잘라 계산
+    eng.segment_ltv("fav_music_genre")          # pipeline.pref_summary의 한 변수
+    eng.bundle()                                # {kpi, retention, arpu, pref} — pipeline.run 번들과 같은 모양
+
+결과는 (쿼리 문자열, 파라미터, 데이터 버전)마다 LRU에 보관한다. 데이터 버전은 원본 지문(파티션 저장소면 manifest 지문).
+백엔드는 STAYORSKIP_SQL(auto · duckdb · sqlite, 기본 auto).
+"""
+import json, os, threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from core import labels
+from core.pipeline import PREF_COLS
+
+BACKEND = os.environ.get("STAYORSKIP_SQL", "auto")
+QUERY_CACHE = 64  # 보관할 쿼리 결과 수
+FIRST, LAST = "0000-00", "9999-99"  # 월 범위 기본값
+FACT_COLS = ["userid", "month", labels.PLAN_COL, "revenue_num"] + PREF_COLS
+
+# ---------- 쿼리 (두 백엔드 공용, ? 파라미터 앞 두 개 = 월 범위) ----------
+RANGE = "r AS (SELECT * FROM facts WHERE month BETWEEN ? AND ?)"
+USERS = """u AS (
+  SELECT userid, COALESCE(SUM(revenue), 0) AS ltv, SUM(is_premium) AS premium_duration,
+         MAX(CASE WHEN month = (SELECT MIN(month) FROM r) AND is_premium = 0 THEN 1 ELSE 0 END)
+       * MAX(CASE WHEN month > (SELECT MIN(month) FROM r) AND is_premium = 1 THEN 1 ELSE 0 END) AS is_free_to_premium
+  FROM r WHERE userid IS NOT NULL GROUP BY userid)"""
+
+ARPU = f"""WITH {RANGE}
+SELECT month, AVG(revenue) AS arpu FROM r GROUP BY month ORDER BY month"""
+
+RETENTION = f"""WITH {RANGE},
+p AS (SELECT DISTINCT userid, month FROM r WHERE is_premium = 1 AND userid IS NOT NULL),
+m AS (SELECT month, LEAD(month) OVER (ORDER BY month) AS nxt FROM (SELECT DISTINCT month FROM r) AS ms)
+SELECT m.month || '→' || m.nxt AS from_to, COUNT(DISTINCT a.userid) AS premium_users,
+       CAST(COUNT(DISTINCT b.userid) AS DOUBLE) / NULLIF(COUNT(DISTINCT a.userid), 0) AS premium_retention
+FROM m LEFT JOIN p AS a ON a.month = m.month
+       LEFT JOIN p AS b ON b.userid = a.userid AND b.month = m.nxt
+WHERE m.nxt IS NOT NULL GROUP BY m.month, m.nxt ORDER BY m.month"""
+
+KPIS = f"""WITH {RANGE}, {USERS}
+SELECT AVG(is_free_to_premium) AS conversion_rate, (SELECT AVG(revenue) FROM r) AS arpu_overall,
+       AVG(premium_duration) AS avg_premium_duration FROM u"""
+
+USER_ROLLUPS = f"""WITH {RANGE}, {USERS}
+SELECT userid, ltv, premium_duration, ltv / NULLIF(premium_duration, 0) AS avg_monthly_revenue, is_free_to_premium
+FROM u ORDER BY userid"""
+
+# 유저별 롤업(u)과 최신 월 취향값(l)을 한 번만 만들고 변수마다 GROUP BY — 변수 수만큼 롤업을 다시 돌지 않게
+PREFS = f"""WITH {RANGE}, {USERS},
+l AS (SELECT *, ROW_NUMBER() OVER (PARTITION BY userid ORDER BY month DESC) AS rn FROM r WHERE userid IS NOT NULL),
+j AS (SELECT u.*, {{cols}} FROM u JOIN l ON l.userid = u.userid AND l.rn = 1)
+{{groups}}"""
+PREF_GROUP = """SELECT '{name}' AS variable, {col} AS grp, COUNT(DISTINCT userid) AS users, AVG(ltv) AS avg_ltv,
+       AVG(premium_duration) AS avg_premium_duration,
+       AVG(ltv / NULLIF(premium_duration, 0)) AS avg_monthly_revenue,
+       AVG(is_free_to_premium) AS free_to_premium_rate
+FROM j WHERE {col} IS NOT NULL GROUP BY {col}"""
+
+# is_premium은 적재 전에 labels.premium_mask로 만든 열 — 원본 라벨("Premium (paid subscription)")도 pipeline과 같게
+FACTS = """CREATE VIEW facts AS SELECT userid, month, is_premium, revenue_num AS revenue{prefs} FROM tidy"""
+
+
+def backend(pref: str = None) -> str:
+    """auto면 duckdb가 설치돼 있을 때 duckdb, 아니면 sqlite"""
+    from importlib.util import find_spec
+    pref = pref or BACKEND
+    if pref in ("auto", "duckdb") and find_spec("duckdb") is not None:
+        return "duckdb"
+    if pref == "duckdb":
+        raise ImportError("duckdb가 설치돼 있지 않습니다.")
+    return "sqlite"
+
+
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _plain(df: pd.DataFrame) -> pd.DataFrame:
+    """category 라벨 → 문자열 (sqlite 적재 · DuckDB 스캔 모두 평범한 VARCHAR로)"""
+    cats = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: df[c].cat.categories.dtype for c in cats}) if cats else df
+
+
+def _with_premium(df: pd.DataFrame) -> pd.DataFrame:
+    """적재할 프레임 + is_premium(0/1) — Premium 판정은 pipeline과 같은 labels.premium_mask"""
+    return _plain(df).assign(is_premium=labels.premium_mask(df[labels.PLAN_COL]).astype("int8"))
+
+
+class Engine:
+    def __init__(self, con, kind: str, columns: list, version=None, cache: int = QUERY_CACHE):
+        self.con, self.kind, self.columns, self.cache_size = con, kind, list(columns), cache
+        self.version = json.dumps(version, sort_keys=True, default=str)
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._stats = {"queries": 0, "hits": 0}
+        prefs = [c for c in PREF_COLS if c in self.columns]
+        self.con.execute(FACTS.format(prefs="".join(", " + _ident(c) for c in prefs)))
+
+    # ---- 실행 ----
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """파라미터 쿼리 → DataFrame. (쿼리, 파라미터, 데이터 버전)이 같으면 캐시된 결과(얕은 복사)"""
+        key = (sql, tuple(params), self.version)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._cache[key].copy(deep=False)
+            # 연결 하나를 세션 스레드들이 나눠 쓰므로 실행도 잠금 안에서 (DuckDB는 쿼리 안에서 멀티스레드)
+            if self.kind == "duckdb":
+                out = self.con.execute(sql, list(params)).df()
+            else:
+                out = pd.read_sql_query(sql, self.con, params=list(params))
+            self._stats["queries"] += 1
+            self._cache[key] = out
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return out.copy(deep=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"backend": self.kind, **self._stats, "cached": len(self._cache)}
+
+    # ---- 지표 ----
+    def arpu(self, start: str = FIRST, end: str = LAST) -> pd.DataFrame:
+        return self.query(ARPU, (start, end))
+
+    def retention(self, start: str = FIRST, end: str = LAST) -> pd.DataFrame:
+        return self.query(RETENTION, (start, end))
+
+    def user_rollups(self, start: str = FIRST, end: str = LAST) -> pd.DataFrame:
+        return self.query(USER_ROLLUPS, (start, end))
+
+    def kpis(self, start: str = FIRST, end: str = LAST) -> dict:
+        row = self.query(KPIS, (start, end)).iloc[0]
+        return {"conversion_rate": float(row["conversion_rate"]),
+                "premium_retention_mean": float(self.retention(start, end)["premium_retention"].mean()),
+                "arpu_overall": float(row["arpu_overall"]), "avg_premium_duration": float(row["avg_premium_duration"])}
+
+    def segment_ltv(self, col: str, start: str = FIRST, end: str = LAST) -> pd.DataFrame:
+        """취향 변수 col 값별 유저 수 · 평균 LTV · 전환율 (유저의 최신 월 값 기준, pipeline.pref_summary와 같음)"""
+        if col not in PREF_COLS or col not in self.columns:
+            raise KeyError(f"세그먼트 변수가 아닙니다: {col}")
+        return self.pref_summary([col], start, end).drop(columns="variable")
+
+    def pref_summary(self, cols=PREF_COLS, start: str = FIRST, end: str = LAST) -> pd.DataFrame:
+        """pipeline.pref_summary와 같은 모양 (변수별 값 컬럼 + variable)"""
+        cols = [c for c in cols if c in self.columns]
+        if not cols:
+            return pd.DataFrame()
+        sql = PREFS.format(cols=", ".join("l." + _ident(c) for c in cols),
+                           groups="\nUNION ALL\n".join(PREF_GROUP.format(name=c, col=_ident(c)) for c in cols))
+        out = self.query(sql, (start, end))
+        parts = [g.drop(columns="variable").rename(columns={"grp": c}).sort_values(c).infer_objects().assign(variable=c)
+                 for c in cols for g in [out[out["variable"] == c]]]
+        return pd.concat(parts, ignore_index=True)
+
+    def bundle(self, start: str = FIRST, end: str = LAST) -> dict:
+        """pipeline.run 번들 중 SQL로 옮긴 부분 {kpi, retention, arpu, pref}"""
+        k = self.kpis(start, end)
+        return {"kpi": pd.DataFrame({"metric": list(k), "value": list(k.values())}),
+                "retention": self.retention(start, end), "arpu": self.arpu(start, end),
+                "pref": self.pref_summary(start=start, end=end)}
+
+
+# ---------- 연결 ----------
+def connect(tidy: pd.DataFrame = None, parts=None, kind: str = None, db_path=None, version=None,
+            cache: int = QUERY_CACHE) -> Engine:
+    """tidy 프레임 또는 파티션 저장소 폴더 → Engine. db_path는 sqlite 적재 파일(기본: 메모리, 파티션이면 저장소 안)"""
+    kind = backend(kind)
+    if parts is not None:
+        return _connect_parts(Path(parts), kind, db_path, cache)
+    cols = [c for c in FACT_COLS if c in tidy.columns]
+    frame = _with_premium(tidy[cols])
+    if kind == "duckdb":
+        import duckdb
+        con = duckdb.connect()
+        con.register("tidy", frame)  # pandas 프레임을 그대로 스캔 (복사 없음)
+    else:
+        import sqlite3
+        con = sqlite3.connect(str(db_path or ":memory:"), check_same_thread=False)
+        frame.to_sql("tidy", con, index=False, chunksize=100_000)
+        _index(con)
+    return Engine(con, kind, cols, version, cache)
+
+
+def _connect_parts(root: Path, kind: str, db_path=None, cache: int = QUERY_CACHE) -> Engine:
+    import pyarrow.parquet as pq
+    from core import partitions
+    from core.snapshot import fingerprint
+    manifest = partitions.read_manifest(root)
+    names = pq.read_schema(root / manifest["parts"][0]["path"]).names
+    cols = [c for c in FACT_COLS if c in names]
+    version = fingerprint(root / partitions.MANIFEST)
+    if kind == "duckdb":
+        import duckdb
+        con = duckdb.connect()
+        files = ", ".join("'" + str(root / p["path"]).replace("'", "''") + "'" for p in manifest["parts"])
+        src = f"read_parquet([{files}])"
+        plan = _ident(labels.PLAN_COL)
+        # 요금제 라벨 종류만 꺼내 판정 → 작은 조회 테이블과 조인 (Parquet은 계속 직접 스캔)
+        kinds = con.execute(f"SELECT DISTINCT {plan} AS plan FROM {src}").df()
+        con.register("plan_kinds", kinds.assign(is_premium=labels.is_premium(kinds["plan"]).astype("int8")))
+        con.execute(f"CREATE VIEW tidy AS SELECT {', '.join('t.' + _ident(c) for c in cols)}, "
+                    f"COALESCE(k.is_premium, 0) AS is_premium FROM {src} AS t "
+                    f"LEFT JOIN plan_kinds AS k ON k.plan = t.{plan}")
+        return Engine(con, kind, cols, version, cache)
+    import sqlite3
+    db_path = Path(db_path or root / "_facts.sqlite")
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    con = sqlite3.connect(str(tmp))
+    for part in partitions.iter_parts(root, columns=cols):  # 파티션 하나씩 → 전체를 메모리에 올리지 않음
+        _with_premium(part).to_sql("tidy", con, index=False, if_exists="append", chunksize=100_000)
+    _index(con)
+    con.close()
+    os.replace(tmp, db_path)
+    return Engine(sqlite3.connect(str(db_path), check_same_thread=False), kind, cols, version, cache)
+
+
+def _index(con):
+    con.execute("CREATE INDEX IF NOT EXISTS tidy_month ON tidy (month)")
+    con.execute("CREATE INDEX IF NOT EXISTS tidy_user ON tidy (userid, month)")
+    con.commit()
@@ -0,0 +1,152 @@
+"""프로세스 공용 읽기 전용 데이터 저장소
+
+st.cache_data는 세션마다 tidy 프레임을 pickle → 역직렬화해 복사본을 건넨다(세션 수만큼 메모리 증가).
+DataStore는 st.cache_resource로 프로세스에 하나만 두고,
+- 원본 프레임: 세션마다 얕은 복사(view)만 건넴 — Copy-on-Write라 세션이 값을 바꾸면 그 세션만 복사됨
+- 파생 집계: derive()로 한 번만 계산해 공유, 메모리 예산(STAYORSKIP_CACHE_MB, 기본 256MB) 초과 시 LRU 제거
+"""
+import os, sys, threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET_MB = float(os.environ.get("STAYORSKIP_CACHE_MB", 256))
+
+if pd.__version__.startswith(("1.", "2.")):  # pandas 3+는 Copy-on-Write가 항상 켜짐
+    try:
+        pd.set_option("mode.copy_on_write", True)
+    except Exception:
+        pass
+
+
+def nbytes(obj) -> int:
+    """캐시 예산 계산용 대략적인 크기"""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(nbytes(v) for v in obj.values()) + sys.getsizeof(obj)
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(v) for v in obj) + sys.getsizeof(obj)
+    return sys.getsizeof(obj)
+
+
+def _key(obj):
+    """캐시 키용 — list/dict/set 인자를 hashable로"""
+    if isinstance(obj, (list, tuple)):
+        return tuple(_key(v) for v in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted((k, _key(v)) for k, v in obj.items()))
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(obj)
+    return obj
+
+
+def _freeze(obj):
+    """공유 결과는 읽기 전용으로 (ndarray는 writeable 해제, list는 tuple, 프레임은 CoW 얕은 복사로 건넴)"""
+    if isinstance(obj, np.ndarray):
+        obj.flags.writeable = False
+    elif isinstance(obj, list):
+        return tuple(obj)
+    return obj
+
+
+def _hand_out(obj):
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=False)
+    return obj
+
+
+class DataStore:
+    def __init__(self, df: pd.DataFrame, source: str = "", budget_mb: float = None):
+        self._df = df
+        self.source = source
+        self.budget = int((budget_mb if budget_mb is not None else DEFAULT_BUDGET_MB) * 2**20)
+        self._cache = OrderedDict()   # key → (value, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "uncached": 0}
+        self._base_bytes = None
+        self._pinned = {}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """원본 프레임 view (0-copy). 세션이 컬럼을 추가/수정해도 다른 세션엔 영향 없음"""
+        return self._df.copy(deep=False)
+
+    @property
+    def base_bytes(self) -> int:
+        if self._base_bytes is None:  # deep 계산은 대형 프레임에서 비싸므로 한 번만
+            self._base_bytes = nbytes(self._df)
+        return self._base_bytes
+
+    def derive(self, fn, *args, **kwargs):
+        """fn(df, *args, **kwargs) 결과를 프로세스 공용 LRU에 보관 (키 = 함수 + 인자)"""
+        key = (fn.__module__, fn.__qualname__, _key(args), _key(kwargs))
+        return self.memo(key, lambda: fn(self._df, *args, **kwargs))
+
+    def memo(self, key, compute):
+        """임의 키의 계산 결과를 같은 LRU/예산으로 공유 (compute는 인자 없는 함수)"""
+        key = _key(key)
+        hit = self._get(key)
+        if hit is not None:
+            return _hand_out(hit)
+        with self._key_lock(key):  # 같은 집계를 여러 세션이 동시에 계산하지 않도록
+            hit = self._get(key)
+            if hit is not None:
+                return _hand_out(hit)
+            value = _freeze(compute())
+            self._put(key, value)
+        return _hand_out(value)
+
+    def pin(self, name: str, build):
+        """build(df)로 한 번 만들어 LRU 예산과 무관하게 보관 (인덱스 등 재생성이 비싼 것)"""
+        if name not in self._pinned:
+            with self._key_lock(("pin", name)):
+                if name not in self._pinned:
+                    self._pinned[name] = build(self._df)
+        return self._pinned[name]
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _get(self, key):
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None:
+                return None
+            self._cache.move_to_end(key)
+            self._stats["hits"] += 1
+            return item[0]
+
+    def _put(self, key, value):
+        size = nbytes(value)
+        with self._lock:
+            self._stats["misses"] += 1
+            if size > self.budget:  # 예산보다 큰 결과는 보관하지 않음
+                self._stats["uncached"] += 1
+                return
+            self._cache[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.budget and self._cache:
+                old_key, (_, old_size) = self._cache.popitem(last=False)
+                self._key_locks.pop(old_key, None)
+                self._bytes -= old_size
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._key_locks.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._cache), "cache_mb": round(self._bytes / 2**20, 2),
+                    "budget_mb": round(self.budget / 2**20, 1), "base_mb": round(self.base_bytes / 2**20, 2),
+                    "pinned": sorted(self._pinned), "source": self.source}
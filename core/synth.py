@@ -0,0 +1,141 @@
+"""합성 데이터 — spotify_merged 스키마 호환 유저-월 데이터를 임의 규모로 생성
+
+샘플(spotify_merged.csv)에서 아래를 학습(fit)한 뒤 청크 단위로 생성한다.
+- 설문 컬럼: 유저 단위 응답 조합을 통째로 복원추출 → 카테고리 분포(및 컬럼 간 결합분포) 유지
+- 요금제: 첫 달 분포 + 월→다음달 전이확률(마르코프)
+- 매출: Premium = 샘플의 Premium 월 매출, Free = 0
+
+    spec = fit(load_sample())
+    write(generate(spec, n_users=1_000_000), "data/synth/spotify_merged.parquet")
+"""
+from dataclasses import dataclass
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from core import labels
+from core.loader import BASE, MERGED_CSV
+
+# 월마다 바뀌는 컬럼 (나머지는 유저 고정 설문 응답)
+MONTHLY_COLS = ["userid", "month", "revenue", "subscription_plan", "timestamp", "spotify_subscription_plan"]
+
+
+@dataclass
+class SynthSpec:
+    columns: list            # 출력 컬럼 순서 (샘플과 동일)
+    profiles: pd.DataFrame   # 유저별 설문 응답 (복원추출 풀)
+    plans: list              # 요금제 라벨 (샘플 표기 그대로)
+    p0: np.ndarray           # 첫 달 요금제 분포 (len(plans),)
+    trans: np.ndarray        # 전이확률 P[from, to] (len(plans), len(plans))
+    revenue: np.ndarray      # 요금제별 월 매출 (len(plans),)
+    start_month: str
+    n_months: int
+
+
+def load_sample(path=None) -> pd.DataFrame:
+    return pd.read_csv(path or BASE / MERGED_CSV)
+
+
+def fit(sample: pd.DataFrame) -> SynthSpec:
+    """샘플에서 설문 풀 · 요금제 전이확률 · 매출 규칙 추출"""
+    sample = sample.sort_values(["userid", "month"], kind="stable")
+    sample = sample.assign(month=sample["month"].astype(str))
+    months = sorted(sample["month"].unique())
+
+    survey_cols = [c for c in sample.columns if c not in MONTHLY_COLS]
+    profiles = sample.groupby("userid", sort=True)[survey_cols].first().reset_index(drop=True)
+
+    plans = sorted(sample["subscription_plan"].dropna().astype(str).unique())
+    code = {p: i for i, p in enumerate(plans)}
+    wide = sample.pivot(index="userid", columns="month", values="subscription_plan")[months]
+    codes = wide.apply(lambda s: s.map(code)).to_numpy(dtype=float)  # 결측 월은 NaN
+
+    first = codes[:, 0][~np.isnan(codes[:, 0])].astype(int)
+    p0 = np.bincount(first, minlength=len(plans)).astype(float)
+    p0 /= p0.sum()
+
+    a, b = codes[:, :-1].ravel(), codes[:, 1:].ravel()
+    ok = ~(np.isnan(a) | np.isnan(b))
+    k = len(plans)
+    counts = np.bincount(a[ok].astype(int) * k + b[ok].astype(int), minlength=k * k).reshape(k, k).astype(float)
+    rows = counts.sum(axis=1, keepdims=True)
+    # 관측 안 된 상태는 그대로 머무는 것으로
+    trans = np.where(rows > 0, counts / np.where(rows > 0, rows, 1), np.eye(k))
+
+    rev = pd.to_numeric(sample["revenue"].astype(str).str.replace(r"[^0-9.\-]", "", regex=True), errors="coerce")
+    prem = labels.is_premium(plans)
+    price = rev[labels.is_premium(sample["subscription_plan"].astype(str))].mode()
+    revenue = np.where(prem, float(price.iloc[0]) if len(price) else 0.0, 0.0)
+
+    return SynthSpec(columns=list(sample.columns), profiles=profiles, plans=plans, p0=p0,
+                     trans=trans, revenue=revenue, start_month=months[0], n_months=len(months))
+
+
+def simulate_plans(spec: SynthSpec, n_users: int, n_months: int, rng) -> np.ndarray:
+    """(n_users, n_months) 요금제 코드 — 첫 달은 p0, 이후 전이확률로 한 달씩"""
+    cum0, cum = np.cumsum(spec.p0), np.cumsum(spec.trans, axis=1)
+    out = np.empty((n_users, n_months), dtype=np.int8)
+    out[:, 0] = np.searchsorted(cum0, rng.random(n_users), side="right").clip(max=len(spec.plans) - 1)
+    for m in range(1, n_months):
+        u = rng.random(n_users)[:, None]
+        out[:, m] = (u >= cum[out[:, m - 1]]).sum(axis=1).clip(max=len(spec.plans) - 1)
+    return out
+
+
+def generate(spec: SynthSpec, n_users: int, n_months: int = None, start_month: str = None,
+             seed: int = 42, chunk_users: int = 100_000):
+    """유저 chunk_users명 단위로 DataFrame을 흘려보내는 제너레이터 (userid는 1부터 연속)"""
+    n_months = n_months or spec.n_months
+    months = pd.period_range(start_month or spec.start_month, periods=n_months, freq="M").astype(str).to_numpy()
+    stamps = np.array([f"{m}-01" for m in months])
+    plans = np.array(spec.plans, dtype=object)
+    seeds = np.random.SeedSequence(seed).spawn((n_users + chunk_users - 1) // chunk_users)
+
+    for i, ss in enumerate(seeds):
+        rng = np.random.default_rng(ss)
+        lo = i * chunk_users
+        n = min(chunk_users, n_users - lo)
+        codes = simulate_plans(spec, n, n_months, rng).ravel()
+        prof = spec.profiles.iloc[rng.integers(0, len(spec.profiles), n)]
+        prof = prof.iloc[np.repeat(np.arange(n), n_months)].reset_index(drop=True)
+        plan_lab = plans[codes]
+        monthly = {
+            "userid": np.repeat(np.arange(lo + 1, lo + n + 1, dtype=np.int64), n_months),
+            "month": np.tile(months, n),
+            "revenue": spec.revenue[codes].astype(np.int64),
+            "subscription_plan": plan_lab,
+            "timestamp": np.tile(stamps, n),
+            "spotify_subscription_plan": plan_lab,
+        }
+        chunk = pd.concat([pd.DataFrame(monthly), prof], axis=1)
+        yield chunk[[c for c in spec.columns if c in chunk.columns]]
+
+
+def write(chunks, out, fmt: str = None) -> int:
+    """청크를 순서대로 한 파일에 기록 (parquet: 청크=row group, csv: 이어쓰기). 총 행 수 반환"""
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    fmt = fmt or ("parquet" if out.suffix == ".parquet" else "csv")
+    total, writer = 0, None
+    try:
+        for chunk in chunks:
+            if fmt == "parquet":
+                import pyarrow as pa, pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(out, table.schema, compression="zstd")
+                writer.write_table(table)
+            else:
+                chunk.to_csv(out, mode="w" if total == 0 else "a", header=(total == 0), index=False)
+            total += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def make_user_months(n_rows: int, sample: pd.DataFrame = None, seed: int = 42) -> pd.DataFrame:
+    """n_rows(유저-월) 근처 크기의 합성 프레임 (메모리에 한 번에) — 작은 규모/벤치용"""
+    spec = fit(load_sample() if sample is None else sample)
+    n_users = max(1, n_rows // spec.n_months)
+    return pd.concat(generate(spec, n_users, seed=seed), ignore_index=True)
@@ -0,0 +1,140 @@
+"""요금제 전환(Markov) 행렬 — 월 → 다음 달 요금제 이동 (Free→Premium · Premium→Free · 재활성화)
+
+userid × month 요금제 코드 패널을 한 번 만들고, 인접한 두 달의 (from, to) 코드 쌍을
+np.bincount((구간 × K + from) × K + to) 한 번으로 센다 — 구간 수 · 상태 수와 무관하게 행 수에 선형.
+관측되지 않은 유저-월은 ABSENT 상태로 두어 이탈 · 복귀도 같은 행렬에 들어간다.
+다단계 예측은 전 구간 합산 전이확률 P로 마지막 월 분포 × P^s.
+
+    table = transition_table(tidy)          # 구간별 + 전체(POOLED) 전이 건수 · 비율 (앱은 공용 캐시 / 스냅샷)
+    matrix(table)                           # from × to 비율 (히트맵)
+    projection(table, steps=6)              # s개월 뒤 요금제 분포
+"""
+import numpy as np
+import pandas as pd
+
+from core import aggregates as agg, labels
+
+ABSENT = "(미관측)"
+POOLED = "전체"
+COLUMNS = ["from_to", "from_plan", "to_plan", "users", "rate", "reactivated"]
+
+
+def panel(df: pd.DataFrame, plan_col: str):
+    """(유저 × 월 상태 코드, 상태 라벨, 월 라벨). 요금제 결측 · 미관측 유저-월 = ABSENT(마지막 코드)"""
+    users, _ = pd.factorize(df["userid"])
+    months, month_labels = pd.factorize(df["month"].astype(str), sort=True)
+    plans, plan_labels = pd.factorize(df[plan_col], sort=True)
+    k = len(plan_labels)
+    codes = np.full((users.max() + 1 if len(users) else 0, len(month_labels)), k, dtype=np.int64)
+    ok = (users >= 0) & (plans >= 0)
+    codes[users[ok], months[ok]] = plans[ok]  # 같은 유저-월이 여러 행이면 마지막 행
+    return codes, [str(p) for p in plan_labels] + [ABSENT], [str(m) for m in month_labels]
+
+
+def counts(codes: np.ndarray, n_states: int) -> np.ndarray:
+    """인접 월 전이 건수 (구간, from, to) — bincount 한 번"""
+    n_steps = codes.shape[1] - 1
+    if n_steps <= 0:
+        return np.zeros((0, n_states, n_states), np.int64)
+    step = np.arange(n_steps)
+    key = (step * n_states + codes[:, :-1]) * n_states + codes[:, 1:]
+    return np.bincount(key.ravel(), minlength=n_steps * n_states ** 2).reshape(n_steps, n_states, n_states)
+
+
+def reactivations(codes: np.ndarray, states: list) -> np.ndarray:
+    """(구간, from, to)별로 그중 '예전에 유료였다가 다시 유료가 된' 유저 수 (Premium→Free→Premium 등)"""
+    n_states, n_steps = len(states), codes.shape[1] - 1
+    if n_steps <= 0:
+        return np.zeros((0, n_states, n_states), np.int64)
+    paid = labels.is_premium(states)[codes]
+    ever_paid = np.maximum.accumulate(paid, axis=1)[:, :-1]  # 구간 시작 월까지 한 번이라도 유료
+    hit = ever_paid & ~paid[:, :-1] & paid[:, 1:]
+    step = np.broadcast_to(np.arange(n_steps), hit.shape)
+    key = ((step * n_states + codes[:, :-1]) * n_states + codes[:, 1:])[hit]
+    return np.bincount(key, minlength=n_steps * n_states ** 2).reshape(n_steps, n_states, n_states)
+
+
+def _long(from_to, cnt: np.ndarray, react: np.ndarray, states: list) -> pd.DataFrame:
+    k = len(states)
+    rows = cnt.sum(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = np.where(rows > 0, cnt / rows, np.nan)
+    return pd.DataFrame({"from_to": from_to, "from_plan": np.repeat(states, k), "to_plan": np.tile(states, k),
+                         "users": cnt.ravel(), "rate": rate.ravel(), "reactivated": react.ravel()})
+
+
+def transition_table(df: pd.DataFrame, plan_col: str = None) -> pd.DataFrame:
+    """구간("2023-01→2023-02")별 + 전체(POOLED) 전이 건수 · from 기준 비율 · 재활성화 수 (긴 형식).
+    ABSENT는 실제로 미관측 유저-월이 있을 때만 남긴다"""
+    plan_col = plan_col or agg.plan_column(df)
+    if plan_col is None or not {"userid", "month"} <= set(df.columns):
+        return pd.DataFrame(columns=COLUMNS)
+    codes, states, months = panel(df, plan_col)
+    cnt, react = counts(codes, len(states)), reactivations(codes, states)
+    keep = np.arange(len(states))
+    if not (codes == len(states) - 1).any():
+        keep = keep[:-1]
+    cnt, react, states = cnt[:, keep][:, :, keep], react[:, keep][:, :, keep], [states[i] for i in keep]
+    parts = [_long(f"{a}→{b}", c, r, states) for a, b, c, r in zip(months[:-1], months[1:], cnt, react)]
+    parts.append(_long(POOLED, cnt.sum(axis=0), react.sum(axis=0), states))
+    return pd.concat(parts, ignore_index=True)
+
+
+def states_of(table: pd.DataFrame) -> list:
+    return list(dict.fromkeys(table["from_plan"]))
+
+
+def matrix(table: pd.DataFrame, from_to: str = POOLED, value: str = "rate") -> pd.DataFrame:
+    """from × to 표 (value = rate | users)"""
+    sub = table[table["from_to"] == from_to]
+    states = states_of(table)
+    return sub.pivot(index="from_plan", columns="to_plan", values=value).reindex(index=states, columns=states)
+
+
+def projection(table: pd.DataFrame, steps: int = 6) -> pd.DataFrame:
+    """마지막 월 상태 분포에서 전체 구간 평균 전이확률로 s개월 뒤 분포 (step, plan, share, users)"""
+    states = states_of(table)
+    pairs = [p for p in dict.fromkeys(table["from_to"]) if p != POOLED]
+    if not pairs:
+        return pd.DataFrame(columns=["step", "plan", "share", "users"])
+    p = matrix(table).fillna(0).to_numpy(dtype=np.float64, copy=True)
+    dead = p.sum(axis=1) == 0
+    p[dead, dead] = 1.0  # 한 번도 떠난 적 없는 상태는 제자리(흡수)
+    last = matrix(table, pairs[-1], "users").sum(axis=0).to_numpy(dtype=np.float64)
+    dist, out = last / last.sum(), []
+    for s in range(steps + 1):
+        out += [{"step": s, "plan": st, "share": float(v), "users": float(v * last.sum())} for st, v in zip(states, dist)]
+        dist = dist @ p
+    return pd.DataFrame(out)
+
+
+def sankey(table: pd.DataFrame, gap: float = 0.03, samples: int = 16):
+    """월별 상태 노드 + 노드 사이 흐름 띠 좌표 (Altair 영역 차트용)
+    nodes: x(월 위치) · plan · y0/y1 · users / links: link · x · y0/y1 (smoothstep 곡선 위 samples점) · 구간 · from/to · users"""
+    states = states_of(table)
+    pairs = [p for p in dict.fromkeys(table["from_to"]) if p != POOLED]
+    mats = [matrix(table, p, "users").fillna(0).to_numpy(dtype=np.float64) for p in pairs]
+    if not mats:
+        return pd.DataFrame(), pd.DataFrame()
+    sizes = [m.sum(axis=1) for m in mats] + [mats[-1].sum(axis=0)]  # 월별 상태 인원
+    pad = gap * max(s.sum() for s in sizes)
+    tops = [np.concatenate([[0], np.cumsum(s + pad)[:-1]]) for s in sizes]  # 노드 아래쪽 y
+    nodes = pd.DataFrame([{"x": i, "plan": st, "y0": tops[i][j], "y1": tops[i][j] + sizes[i][j], "users": sizes[i][j]}
+                          for i in range(len(sizes)) for j, st in enumerate(states) if sizes[i][j] > 0])
+    t = np.linspace(0, 1, samples)
+    ease = t * t * (3 - 2 * t)
+    links = []
+    for i, (pair, m) in enumerate(zip(pairs, mats)):
+        out_off = tops[i][:, None] + np.concatenate([np.zeros((len(states), 1)), np.cumsum(m, axis=1)[:, :-1]], axis=1)
+        in_off = tops[i + 1] + np.concatenate([np.zeros((1, len(states))), np.cumsum(m, axis=0)[:-1]], axis=0)
+        for a, b in zip(*np.nonzero(m)):
+            lo = out_off[a, b] + (in_off[a, b] - out_off[a, b]) * ease
+            links.append(pd.DataFrame({"link": f"{pair}|{states[a]}|{states[b]}", "x": i + t, "y0": lo, "y1": lo + m[a, b],
+                                       "from_to": pair, "from_plan": states[a], "to_plan": states[b], "users": m[a, b]}))
+    return nodes, pd.concat(links, ignore_index=True) if links else pd.DataFrame()
+
+
+def months_of(table: pd.DataFrame) -> list:
+    """구간 라벨 → 월 목록 (sankey x 위치 순서)"""
+    pairs = [p for p in dict.fromkeys(table["from_to"]) if p != POOLED]
+    return [p.split("→")[0] for p in pairs] + [pairs[-1].split("→")[1]] if pairs else []
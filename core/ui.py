@@ -0,0 +1,287 @@
+"""두 앱(spotify.py · spotify_v2.py)과 sections/ 공용 UI 코어
+
+- 다크 테마: 색상 상수 · 전역 CSS · Altair 테마 (프로세스당 한 번 등록)
+  차트는 전부 core.charts(브라우저 렌더). matplotlib은 PNG 내보내기 대체 경로에서만 pyplot()으로 import + rcParams
+- 레이아웃 유틸: vgap / tight_top / section_title / sp
+- 이미지: render_image / img_to_datauri (core.assets 레지스트리 — 프로세스 캐시)
+- 공통 골격: hero(타이틀) · sidebar_header / sidebar_footer
+"""
+import altair as alt
+import streamlit as st
+
+from core import assets, export, perf
+
+# ---- Colors (Dark) ----
+BG_DARK   = "#121212"   # page background
+PANEL     = "#191414"   # plot panel
+TEXT      = "#F9FCF9"
+MUTED     = "#CFE3D8"
+GREEN     = "#1DB954"   # Spotify Green
+MINT      = "#7CE0B8"   # light green for lines
+CYAN      = "#80DEEA"   # cyan accent
+GRID_CLR  = "#FFFFFF"
+GRID_ALPHA= 0.07
+
+# ---- Streamlit CSS (dark fixed) ----
+THEME_CSS = f"""
+<style>
+:root {{
+  --bg:{BG_DARK}; --panel:{PANEL}; --text:{TEXT}; --muted:{MUTED}; --brand:{GREEN};
+}}
+html, body, .stApp,[data-testid="stAppViewContainer"], [data-testid="stMain"]{{
+  background:{BG_DARK}!important; color:{TEXT}!important;
+}}
+section[data-testid="stSidebar"]{{ background:{PANEL}!important; color:{TEXT}!important; }}
+
+/* KPI: 라벨/값 가독성 업 */
+div[data-testid="stMetric"] div[data-testid="stMetricLabel"] p{{ color:#EAF7EF!important; font-weight:700!important; }}
+div[data-testid="stMetric"] div[data-testid="stMetricValue"]{{ color:{GREEN}!important; font-weight:800!important; }}
+
+/* 공통 selectbox 강조(테두리 그린) */
+.cu-select .stSelectbox>div>div{{ border:1px solid rgba(29,185,84,.65)!important; border-radius:8px; }}
+
+/* 섹션 타이틀 */
+.cu-h2{{ display:flex; align-items:center; gap:.6rem; font-weight:800; font-size:1.25rem; margin:.2rem 0 .8rem 0; }}
+.cu-h2::before{{ content:""; width:4px; height:20px; background:{GREEN}; border-radius:2px; }}
+</style>
+"""
+
+# ---- 앱 공통 CSS (사이드바 내비 · 탭 · 카드 · KPI) ----
+APP_CSS = """
+<style>
+:root{
+  --bg:#121212; --panel:#191414; --text:#F9FCF9; --muted:#D7E4DC; --line:rgba(255,255,255,.08);
+  --brand:#1DB954; --brand-2:#1ED760; --soft-ivory:#E8F5E9; --tab-underline:rgba(29,185,84,.5); --navShift:18px;
+}
+html, body, .stApp,[data-testid="stAppViewContainer"], [data-testid="stMain"]{ background:var(--bg)!important; color:var(--text)!important; }
+[data-testid="stHeader"]{ background:var(--bg)!important; box-shadow:none!important; }
+[data-testid="stAppViewContainer"] .main .block-container{ padding-top:.15rem!important; padding-bottom:2rem!important; }
+
+section[data-testid="stSidebar"]{ background:var(--panel)!important; color:var(--text)!important; }
+section[data-testid="stSidebar"] .block-container{ padding-top:.25rem!important; padding-bottom:.8rem!important; }
+hr.cup-divider{ border:none; height:1px; background:var(--line); margin:.6rem 0 .5rem 0; }
+section[data-testid="stSidebar"] [role="radiogroup"]{ display:flex; flex-direction:column; gap:.30rem; margin-left:var(--navShift)!important; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"]{ position:relative; display:block; background:transparent; border:none; border-radius:6px;
+  padding:.35rem .45rem .35rem .90rem; line-height:1.08; cursor:pointer; transition:color .12s ease, background .12s ease; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"] p{ margin:0; color:#CFE3D8; font-weight:600; letter-spacing:.15px; font-size:.94rem; transition:color .12s ease; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"]:hover p{ color:var(--brand-2)!important; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"][aria-checked="true"]::before,
+section[data-testid="stSidebar"] label[data-baseweb="radio"]:has(input:checked)::before{
+  content:""; position:absolute; left:.42rem; top:50%; width:9px; height:9px; border-radius:50%; background:var(--brand); transform:translateY(-50%);
+}
+section[data-testid="stSidebar"] label[data-baseweb="radio"][aria-checked="true"] p,
+section[data-testid="stSidebar"] label[data-baseweb="radio"]:has(input:checked) p{ color:#FFF!important; font-weight:700!important; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"] > div:first-child, section[data-testid="stSidebar"] label[data-baseweb="radio"] svg{ display:none!important; }
+section[data-testid="stSidebar"] label[data-baseweb="radio"] input[type="radio"]{ position:absolute; left:-9999px; opacity:0; }
+
+hr.cup-footer-line{ border:none; height:1px; background:var(--line); margin:.8rem 0 .75rem 0; }
+.cup-sidebar-footer{ margin-left:var(--navShift); color:var(--muted); font-size:.84rem; letter-spacing:.1px; text-align:left; }
+.cup-link-btn{ display:inline-block; margin-bottom:.45rem; padding:6px 10px; font-size:.85rem; font-weight:600;
+  color:var(--brand); text-decoration:none; border:1px solid rgba(29,185,84,.45); border-radius:6px; transition:all .2s ease; }
+.cup-link-btn:hover{ background:var(--brand); color:#0.1; border-color:var(--brand); }
+
+h1{ font-weight:800; letter-spacing:-0.2px; margin:0 0 -0.2rem 0!important; }
+.cup-subtitle{ color:var(--muted); font-size:1.08rem; font-weight:500; margin:0 0 1rem 0; letter-spacing:.1px; }
+.cup-h2{ display:flex; align-items:center; gap:.8rem; margin:1.6rem 0 .9rem 0; font-weight:700; font-size:1.25rem; letter-spacing:.1px; }
+.cup-h2::before{ content:""; display:inline-block; width:4px; height:22px; background:var(--brand); border-radius:2px; }
+.cup-card{ background:transparent; border:1px solid var(--line); border-radius:10px; padding:1rem 1.2rem; margin:1.1rem 0; }
+
+.stTabs [aria-selected="true"], .stTabs [data-baseweb="tab"]:focus, .stTabs [data-baseweb="tab"]:active { background:transparent; box-shadow:none; filter:none; }
+.stTabs [aria-selected="true"] p{ color:var(--brand-2); }
+.stTabs [role="tablist"]{ border-color: rgba(255,255,255,.08); }
+.stTabs [data-baseweb="tab"]{ border-bottom:2px solid transparent; }
+.stTabs [data-baseweb="tab"][aria-selected="true"]{ border-bottom-color:var(--brand); }
+.stTabs [data-baseweb="tab"]:hover{ border-bottom-color:var(--brand-2); }
+.stTabs [data-baseweb="tab-highlight"]{ background:var(--brand)!important; }
+.stTabs [data-baseweb="tab"] p{ color:rgba(255,255,255,0.72)!important; transition:color .15s ease; }
+.stTabs [data-baseweb="tab"]:hover p{ color:var(--brand-2)!important; }
+
+div[data-testid="stMetric"] div[data-testid="stMetricValue"]{ color:var(--brand)!important; font-weight:800!important; font-size:2.2rem!important; line-height:1.1!important; white-space:nowrap!important; }
+div[data-testid="stMetric"] div[data-testid="stMetricLabel"] p{ font-size:1.05rem!important; color:var(--muted)!important; letter-spacing:.2px; }
+.cup-kpi-plus small{ font-size:60%; opacity:.85; vertical-align:super; }
+.kpi-tight [data-testid="stHorizontalBlock"]{ gap:.2rem!important; }
+.kpi-tight [data-testid="column"]{ padding-left:.05rem!important; padding-right:.05rem!important; }
+.kpi-tight [data-testid="stMetric"]{ margin-bottom:0!important; }
+
+.cup-info-box{ background:rgba(255,255,255,.03); border:1px solid rgba(255,255,255,.10); border-radius:12px; padding:1.6rem 1.8rem; }
+.cup-team-line{ color:rgba(255,255,255,.9); font-size:1.05rem; line-height:2.0; margin:.2rem 0; display:flex; align-items:center; }
+.cup-team-name{ display:inline-block; width:70px; font-weight:600; color:#fff; }
+.cup-team-role{ margin-left:.4rem; }
+.cup-spotify-box{ background:rgba(255,255,255,.03); border:1px solid rgba(255,255,255,.10); border-radius:12px; padding:1.2rem 1.4rem; }
+
+div[data-testid="stMarkdownContainer"] > p{ margin-bottom:.15rem!important; }
+div[data-testid="stMarkdownContainer"] ul{ margin-top:.05rem!important; margin-bottom:.4rem!important; margin-left:1.1rem!important; padding-left:0!important; }
+.cup-gap-top{ margin-top:1.2rem!important; }
+.cup-gap-y{ height:1.2rem; }
+            
+/* 섹션 제목의 기본 여백을 없애고(=0), 아래쪽만 section_title()로 제어 */
+.cup-h2{ margin:0 0 .9rem 0 !important; }
+
+/* 카드 안 code가 초록색으로 보이지 않게 – 일반 텍스트처럼 */
+.cup-card code{ color:var(--text)!important; background:transparent!important; padding:0!important; }
+</style>
+"""
+
+HERO_CSS = """
+<style>
+  .cup-hero { display:inline-flex; align-items:baseline; gap:0; margin:-4.5rem 0 .25rem 0; transform:translateY(-8px); }
+  .cup-hero h1 { margin:0; line-height:1; font-weight:800; letter-spacing:-.2px; transform:translateY(-2px); }
+  .cup-hero img { width:3.05em; height:auto; vertical-align:baseline; transform:translateY(0.65em); margin-left:-6px!important; display:inline-block; }
+  [data-testid="stAppViewContainer"] .main .block-container { padding-top:.1rem!important; }
+  .cup-subtitle { color: var(--muted); font-size: 1.08rem; font-weight: 500; margin-top: -1.4rem!important; margin-bottom: 1.0rem!important; letter-spacing: .1px; }
+</style>
+"""
+
+COLAB_URL = "https://colab.research.google.com/drive/1kmdOCUneO2tjT8NqOd5MvYaxJqiiqb9y?usp=sharing"
+
+_themed = False
+_mpl_themed = False
+
+
+# ---------- 테마 ----------
+def _alt_dark():
+    return {
+        "config": {
+            "background": BG_DARK,
+            "view": {"stroke": "transparent"},
+            "axis": {
+                "labelColor": MUTED, "titleColor": MUTED,
+                "gridColor": GRID_CLR, "gridOpacity": GRID_ALPHA,
+                "tickColor": MUTED
+            },
+            "legend": {"labelColor": MUTED, "titleColor": MUTED},
+            "range": {"category": [GREEN, MINT, CYAN, "#A7FFEB", "#B39DDB"]},
+        }
+    }
+
+
+def pyplot():
+    """matplotlib.pyplot — 처음 부를 때 import하고 다크 rcParams를 한 번만 적용 (프로세스 전역 설정)"""
+    global _mpl_themed
+    import matplotlib.pyplot as plt
+    if _mpl_themed:
+        return plt
+    plt.rcParams["font.family"] = ["Apple SD Gothic Neo", "Malgun Gothic", "Noto Sans CJK KR", "NanumGothic", "DejaVu Sans"]
+    plt.rcParams.update({
+        "figure.facecolor": BG_DARK,
+        "axes.facecolor":   PANEL,
+        "axes.edgecolor":   MUTED,
+        "axes.labelcolor":  MUTED,
+        "xtick.color":      MUTED,
+        "ytick.color":      MUTED,
+        "text.color":       MUTED,
+        "grid.color":       GRID_CLR,
+        "grid.alpha":       GRID_ALPHA,
+        "axes.grid":        True,
+        "axes.unicode_minus": False,
+    })
+    _mpl_themed = True
+    return plt
+
+
+def apply_theme():
+    """Altair 테마 — 프로세스 전역 설정이라 한 번만"""
+    global _themed
+    if _themed:
+        return
+    try:
+        alt.themes.register("cup_dark", _alt_dark)
+    except Exception:
+        pass
+    alt.themes.enable("cup_dark")
+    _themed = True
+
+
+def inject_css():
+    """전역 CSS (리런마다 페이지에 다시 실어야 함 — 문자열은 모듈 상수 하나)"""
+    st.markdown(THEME_CSS, unsafe_allow_html=True)
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+
+
+def setup():
+    """set_page_config 직후 앱에서 한 번 호출"""
+    apply_theme()
+    inject_css()
+
+
+# ---------- 이미지 하위호환 래퍼 ----------
+def _st_image_compat(data: bytes):
+    """Streamlit 신/구버전 호환 이미지 렌더"""
+    try:
+        st.image(data, use_container_width=True)
+    except TypeError:
+        st.image(data, use_column_width=True)
+
+
+def render_image(filename: str):
+    """로컬(루트/assets/StayOrSkip) → GitHub Raw 순으로 찾아 렌더, 없으면 조용히 패스"""
+    b = assets.asset_bytes(filename)
+    if b:
+        _st_image_compat(b)
+
+
+def img_to_datauri(filename: str) -> str:
+    """이미지를 data URI로 변환 (못 찾으면 빈 투명 픽셀)"""
+    return assets.datauri(filename)
+
+
+# ---------- 간격 유틸 ----------
+def vgap(px: int):
+    st.markdown(f"<div style='height:{px}px;'></div>", unsafe_allow_html=True)
+
+
+def tight_top(px: int):
+    st.markdown(f"<div style='margin-top:{px}px;'></div>", unsafe_allow_html=True)
+
+
+# ---------- 소제목/간격 유틸 ----------
+def section_title(text: str, caption: str = "", top_gap: int = 18, bottom_gap: int = 8):
+    """제목 + 작은 설명 + 위아래 여백을 한 번에 출력 (다음 제목까지를 한 구간으로 계측)"""
+    perf.section(text)
+    vgap(top_gap)
+    st.markdown(f"<div class='cup-h2'>{text}</div>", unsafe_allow_html=True)
+    if caption:
+        st.markdown(f"<span style='color:#A7B9AF;font-size:0.92rem;'>{caption}</span>", unsafe_allow_html=True)
+    vgap(bottom_gap)
+
+
+def export_buttons(name: str, data, label: str = "⬇ 데이터", png=None):
+    """차트/표 아래 CSV · Parquet (+ png가 있으면 PNG) 다운로드. data는 DataFrame 또는 프레임 청크를 돌려주는 0-인자 함수,
+    png는 이미지 바이트를 돌려주는 0-인자 함수(core.charts.rasterizer).
+    파일은 클릭했을 때 별도 스레드에서 만든다(리런 없음 — 큰 내보내기가 화면/다른 세션을 막지 않음)."""
+    c1, c2, c3 = st.columns([1, 1, 1, 5] if png is not None else [1, 1, 6])[:3]
+    for col, fmt in ((c1, "csv"), (c2, "parquet")):
+        col.download_button(
+            f"{label} {fmt.upper()}", lambda fmt=fmt: export.to_bytes(data() if callable(data) else data, fmt),
+            file_name=f"{name}.{fmt}", mime=export.FORMATS[fmt], key=f"dl_{name}_{fmt}", on_click="ignore")
+    if png is not None:
+        c3.download_button("⬇ PNG", png, file_name=f"{name}.png", mime="image/png", key=f"dl_{name}_png",
+                           on_click="ignore")
+
+
+# ---------- 공통 골격 ----------
+def hero(subtitle: str):
+    """타이틀 'Stay or Skip ▶' + 부제"""
+    icon = img_to_datauri("free-icon-play-4604241.png")
+    st.markdown(HERO_CSS + f"""
+<div class="cup-hero"><h1>Stay or Skip</h1><img src="{icon}" alt="play icon" /></div>
+<p class="cup-subtitle">{subtitle}</p>
+""", unsafe_allow_html=True)
+    vgap(36)
+
+
+def sidebar_header():
+    st.caption("build: v2025-10-24-spotify-compat-CSV")  # ← 새 코드 적용 확인용
+    render_image("Cup_3_copy_4.png")
+    st.markdown('<hr class="cup-divider">', unsafe_allow_html=True)
+
+
+def sidebar_footer():
+    st.markdown('<hr class="cup-footer-line">', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="cup-sidebar-footer">'
+        f'<a href="{COLAB_URL}" '
+        'target="_blank" class="cup-link-btn">🔗 Open in Google Colab</a><br>'
+        '© DATA CUPBOP | Stay or Skip'
+        '</div>', unsafe_allow_html=True
+    )
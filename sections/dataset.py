@@ -0,0 +1,201 @@
+"""PROJECT OVERVIEW · Dataset 탭 (두 앱 공용)
+
+집계는 FilteredView(core.filters) — 사이드바 필터가 없으면 빈 선택(전체)으로 넘기면 되고,
+결과는 DataStore 공용 캐시에 쌓여 어느 앱에서 열어도 데운 캐시를 쓴다.
+"""
+import pandas as pd
+import streamlit as st
+
+from core import aggregates as agg, app, browse, charts, export, perf
+from core.ui import export_buttons, section_title, vgap
+
+
+BROWSE_DEFAULT_COLS = ["userid", "month", "subscription_plan", "revenue", "Age", "Gender"]
+
+
+def row_browser(sel: dict, columns: list):
+    """서버 쪽 페이지네이션 행 브라우저 (core.browse) — 브라우저로는 현재 페이지 행 · 선택 컬럼만 보낸다.
+    사이드바 필터(sel)가 그대로 적용되고, 켜기 전에는 원본을 읽지 않는다(스냅샷 모드)."""
+    c1, c2, c3 = st.columns([3, 2, 1])
+    cols = c1.multiselect("컬럼", columns, default=[c for c in BROWSE_DEFAULT_COLS if c in columns],
+                          key="rb_cols", placeholder="전체")
+    sort = c2.selectbox("정렬", ["(원본 순서)"] + columns, key="rb_sort")
+    desc = c3.toggle("내림차순", key="rb_desc")
+    flt = st.data_editor(
+        pd.DataFrame({"column": pd.Series(dtype=str), "op": pd.Series(dtype=str), "value": pd.Series(dtype=str)}),
+        num_rows="dynamic", hide_index=True, use_container_width=True, key="rb_filters",
+        column_config={"column": st.column_config.SelectboxColumn("컬럼", options=columns),
+                       "op": st.column_config.SelectboxColumn("조건", options=list(browse.OPS), default="contains"),
+                       "value": st.column_config.TextColumn("값")})
+
+    with perf.timer("browse.page", "block"):
+        rb = browse.RowBrowser(app.get_store(), sel, flt[["column", "op", "value"]].itertuples(index=False),
+                               sort=None if sort == "(원본 순서)" else sort, ascending=not desc)
+        c1, c2, c3 = st.columns([1, 1, 4])
+        size = c1.selectbox("페이지 크기", browse.PAGE_SIZES, key="rb_size")
+        n_pages = rb.n_pages(size)
+        if st.session_state.get("rb_page", 1) > n_pages:  # 조건이 바뀌어 페이지 수가 줄면 마지막 페이지로
+            st.session_state["rb_page"] = n_pages
+        page = c2.number_input(f"페이지 (/{n_pages:,})", 1, n_pages, 1, key="rb_page")
+        st.dataframe(rb.page(page - 1, size, cols or None), use_container_width=True)
+    lo = (page - 1) * size
+    c3.caption(f"조건에 맞는 {rb.total():,}행 중 {min(lo + 1, rb.total()):,}–{min(lo + size, rb.total()):,}행")
+    # 조건에 맞는 행 전체 (정렬 순서 · 선택 컬럼) — 클릭 시 청크 단위로 직렬화
+    df, rows = rb.store.df, rb.rows()
+    export_buttons("rows_filtered" if (sel or rb.col_filters) else "rows",
+                   lambda: export.iter_tables(df, rows, cols or None), label=f"⬇ {rb.total():,}행")
+
+
+def _fname(name: str, fview) -> str:
+    return f"{name}_filtered" if fview.active else name
+
+
+def render(fview, tidy: pd.DataFrame):
+    # --- Dataset Overview (간격 통일: section_title 사용) ---
+    section_title("Dataset Overview")
+
+    # 요약값
+    ov = fview.overview()
+    n_rows, n_cols = ov["n_rows"], ov["n_cols"]
+    month_min, month_max = ov["month_min"], ov["month_max"]
+    approx = "≈" if ov.get("n_users_approx") else ""  # HLL 추정치 표기 (core.filters.UserSketches)
+
+    # ✅ “주요 컬럼”은 실제 분석 핵심만: userid, month, subscription_plan, revenue_num
+    # (timestamp 는 기록용이라 Full Column List 에서만 노출)
+    st.markdown(f"""
+    <div class="cup-card" style="margin-top:0.3rem;">
+    <b>데이터셋명</b>: Spotify User Behavior Dataset
+    <b>규모</b>: {n_rows:,}행, {n_cols}개 컬럼<br>
+    <b>주요 컬럼</b>: userid, month, revenue_num, subscription_plan<br>
+    <b>출처</b>: Kaggle Spotify 사용자행동 데이터 + 추가 생성한 프리미엄 구독료(6개월) 컬럼 병합 (merged)
+    </div>
+    """, unsafe_allow_html=True)
+    if fview.active:
+        st.caption(f"사이드바 필터 적용 중: 전체 {fview.index.n:,}행 중 {n_rows:,}행 · 사용자 {approx}{ov['n_users']:,}명")
+
+    # --- 기존 핵심 요약표 아래에 추가 ---
+    section_title("Full Column List", "머지드 데이터셋의 전체 컬럼 및 설명 요약", top_gap=10, bottom_gap=6)
+
+    # 전체 컬럼 설명 자동 생성
+    all_columns = [
+        ("userid", "사용자 고유 ID"),
+        ("month", "관측 월 (2023-01 ~ 2023-06)"),
+        ("revenue", "월별 매출액 (문자형 원화 표시)"),
+        ("subscription_plan", "요금제 유형 (Free / Premium)"),
+        ("timestamp", "응답 시각 (설문 타임스탬프)"),
+        ("Age", "사용자 연령대"),
+        ("Gender", "사용자 성별"),
+        ("spotify_usage_period", "Spotify 사용 기간"),
+        ("spotify_listening_device", "주 청취 기기"),
+        ("spotify_subscription_plan", "Spotify 계정의 요금제 정보"),
+        ("premium_sub_willingness", "프리미엄 구독 의향 (예/아니오)"),
+        ("preffered_premium_plan", "선호 프리미엄 요금제 유형"),
+        ("preferred_listening_content", "주 청취 콘텐츠 (Music / Podcast 등)"),
+        ("fav_music_genre", "가장 선호하는 음악 장르"),
+        ("music_time_slot", "주 청취 시간대 (출근/퇴근/야간 등)"),
+        ("music_Influencial_mood", "음악 선택에 영향을 주는 감정 상태"),
+        ("music_lis_frequency", "음악 청취 빈도"),
+        ("music_expl_method", "음악 탐색 방법 (추천/검색/친구 공유 등)"),
+        ("music_recc_rating", "음악 추천 만족도 (1~5점 척도)"),
+        ("pod_lis_frequency", "팟캐스트 청취 빈도"),
+        ("fav_pod_genre", "선호 팟캐스트 장르"),
+        ("preffered_pod_format", "선호 팟캐스트 형식 (토크/뉴스 등)"),
+        ("pod_host_preference", "선호하는 진행자 스타일"),
+        ("preffered_pod_duration", "선호 팟캐스트 길이"),
+        ("pod_variety_satisfaction", "팟캐스트 다양성 만족도"),
+    ]
+
+    df_cols = pd.DataFrame(all_columns, columns=["컬럼명", "설명"])
+    st.dataframe(df_cols, hide_index=True, use_container_width=True)
+    vgap(20)
+
+    # Preview
+    section_title("Dataset Preview", "데이터 상위 5행 미리보기", top_gap=12, bottom_gap=12)
+    st.dataframe(fview.preview(5), use_container_width=True)
+    if st.toggle("전체 행 탐색 (페이지 · 정렬 · 컬럼 필터)", key="rb_open"):
+        row_browser(fview.sel, list(tidy.columns))
+    vgap(16)
+
+    # ===== 인터랙티브 차트들 (core.charts 템플릿 — 스펙 골격은 프로세스 캐시, 리런마다 집계 데이터만) =====
+    muted = "rgba(255,255,255,0.65)"
+
+    # 1) 월별 매출 라인 (툴팁+줌)
+    section_title("Monthly Revenue Trend", "월별 총매출 추이(₩)")
+    rev_col = agg.revenue_column(tidy)
+    plan_col = agg.plan_column(tidy)  # 아래 두 요금제 차트 공용 (없으면 None)
+    monthly = fview.monthly_revenue()
+
+    charts.show("line", monthly, x="month_dt", y=rev_col, x_type="T", x_title="Month", y_title="Revenue (₩)",
+                zoom=True, axis_color=muted, grid=0.12)
+    export_buttons(_fname("monthly_revenue", fview), monthly)
+    vgap(18)
+
+    # 2) 최신월 요금제별 활성 사용자 바 (툴팁+정렬)
+    section_title("Active Users by Plan — Latest Month", "최신 월 기준 요금제별 고유 사용자 수")
+    if {"month", "userid"} <= set(tidy.columns):
+        if plan_col:
+            users_mix = fview.users_by_plan_latest(plan_col)
+            charts.show("hbar", users_mix, x="users", y=plan_col, y_title="Plan", axis_color=muted,
+                        x_title="Users (unique, HLL ≈)" if fview.approx_users else "Users (unique)")
+            export_buttons(_fname("users_by_plan_latest", fview), users_mix)
+        else:
+            st.info("요금제 컬럼을 찾을 수 없어요.")
+    else:
+        st.info("month / userid 컬럼이 필요합니다.")
+    vgap(18)
+
+    # 3) 요금제별 총 매출 바
+    section_title("Revenue by Plan (Total)", "관측 기간 동안 요금제별 총 매출 합계")
+    if plan_col and rev_col in tidy.columns:
+        plan_rev = fview.revenue_by_plan(plan_col)
+        charts.show("hbar", plan_rev, x="revenue_sum", y=plan_col, x_title="Revenue (₩)", y_title="Plan",
+                    axis_color=muted)
+        export_buttons(_fname("revenue_by_plan", fview), plan_rev)
+    else:
+        st.info("요금제/매출 컬럼이 없어 매출 구성을 그릴 수 없어요.")
+    vgap(18)
+
+    # 4) 데이터 정합성 & 결측치 (프로파일이 있으면 중복 · 컬럼 통계는 core.profile 월별 통계에서)
+    section_title("Data Quality Check", "결측치 현황 및 데이터 정합성")
+    prof = app.load_profile()
+    pstats = prof.for_selection(fview.sel) if prof is not None else None
+    dup_line = (f"<br>- 중복: 행 전체 <b>{pstats['dup_rows']:,}건</b> · (userid, month) 키 <b>{pstats['dup_keys']:,}건</b>"
+                if pstats is not None else "")
+    st.markdown(f"""
+    <div class="cup-card">
+    - 병합 기준: <b>userid</b> (매출 ⟷ 원본 설문)<br>
+    - 기간/규모: <b>{month_min} ~ {month_max}</b>, <b>{n_rows:,}행</b><br>
+    - 매출 기준: <b>Premium만 유료매출</b> (Free=0원){dup_line}
+    </div>
+    """, unsafe_allow_html=True)
+
+    na_top = fview.na_top()
+
+    if len(na_top) > 0:
+        charts.show("hbar", na_top, x="na_cnt", y="column", x_title="Missing Values", y_title="Column",
+                    color="#BFBFBF", axis_color=muted)
+        export_buttons(_fname("na_top", fview), na_top)
+    if pstats is not None:
+        with st.expander("컬럼 프로파일 (결측 · 고유값 추정 · 값 범위)"):
+            col_prof = prof.column_table(pstats)
+            st.dataframe(col_prof, hide_index=True, use_container_width=True)
+            st.caption(f"프로파일 생성: {prof.doc['created']} · 고유값은 HyperLogLog 추정치(±2%)")
+            export_buttons(_fname("column_profile", fview), col_prof)
+    else:
+        st.markdown("<div class='cup-card'>결측치 상위 5개 컬럼 요약입니다. 이상 없으면 완료 메시지를 표시합니다.</div>", unsafe_allow_html=True)
+
+    # 정합성 요약 + 완료 배지 (간격 넉넉)
+    vgap(10)
+    total_rev = fview.total_revenue()
+
+    st.markdown(f"""
+    <div class="cup-card">
+    ✅ <b>정합성 요약</b><br>
+    - 사용자 수: <b>{approx}{ov['n_users']:,}</b>명 · 기간: <b>{month_min} ~ {month_max}</b><br>
+    - 총 매출(합산): <b>₩{total_rev:,.0f}</b><br>
+    - 분석 가능 상태: <b>양호</b>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.success("✅ 데이터 병합 및 품질 검증 완료 — 분석에 활용 가능합니다.")
+    vgap(12)
@@ -0,0 +1,257 @@
+"""헤드리스 벤치마크 — 데이터 로드(머지 원본 · 월 파티션) · Dataset 탭 집계 · 차트 스펙 · Revenue 탭 로드 · 노트북 Step2~5
+
+    python -m tools.bench                        # 샘플(3,120행) + 10만 행
+    python -m tools.bench --rows 3120,1000000,10000000 --repeat 5
+    python -m tools.bench --baseline artifacts/bench/latest.json   # 회귀 체크(느려지면 exit 1)
+
+스테이지별로 cold(첫 실행) / warm(반복 중앙값) 시간과 tracemalloc 피크 메모리를 재서
+artifacts/bench/ 에 JSON으로 남긴다.
+"""
+import argparse, json, os, pickle, platform, statistics, sys, tempfile, time, tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from core import (aggregates, browse, charts, clusters, conversion, filters, labels, loader, partitions, pipeline, planbits, segtrends,
+                  sql, synth, transitions)
+from core.store import DataStore
+
+OUT_DIR = loader.BASE / "artifacts" / "bench"
+XLSX_MAX_ROWS = 20_000  # 엑셀은 이 이하 규모에서만 (3만 행이면 읽기만 10초대)
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def measure(fn, repeat: int) -> dict:
+    """cold = 첫 호출, warm = 이후 repeat회 중앙값. 메모리는 별도 1회(추적 오버헤드 분리)"""
+    cold = _timed(fn)
+    warm = [_timed(fn) for _ in range(repeat)]
+    return {"cold_s": round(cold, 5), "warm_s": round(statistics.median(warm), 5) if warm else None,
+            "warm_min_s": round(min(warm), 5) if warm else None, "peak_mb": round(_peak_mb(fn), 2)}
+
+
+def filter_change(store, sel):
+    view = filters.FilteredView(store, sel)
+    plan_col = view.index.plan_col
+    return [view.overview(), view.monthly_revenue(), view.users_by_plan_latest(plan_col),
+            view.revenue_by_plan(plan_col), view.na_top(), view.total_revenue(), view.missing_rate_top(),
+            view.plan_counts(plan_col), view.device_top(), view.time_slot_counts(), view.eda_insights()]
+
+
+def distinct_users(store, sel, exact: bool):
+    view = filters.FilteredView(store, sel, exact=exact)
+    return view.overview()["n_users"], view.users_by_plan_latest(view.index.plan_col)
+
+
+def stages(rows: int, workdir: Path, with_importance: bool):
+    """(이름, 함수) 목록. 입력 파일/exports는 workdir에 미리 만들어 둔다"""
+    spec = synth.fit(synth.load_sample())
+    csv_path = workdir / "spotify_merged.csv"
+    synth.write(synth.generate(spec, max(1, rows // spec.n_months)), csv_path)
+    out = []
+    if rows <= XLSX_MAX_ROWS:
+        xlsx_path = workdir / "spotify_merged.xlsx"
+        loader.read_merged(csv_path).to_excel(xlsx_path, index=False)
+        out.append(("load_data[xlsx]", lambda: loader.tidy_up(loader.read_merged(xlsx_path))))
+    out.append(("load_data[csv]", lambda: loader.tidy_up(loader.read_merged(csv_path))))
+
+    raw = loader.read_merged(csv_path)
+    # 수집 때 라벨 정규화(고유 라벨마다 한 번 + category remap) — 복사 비용 포함
+    out.append(("load_data[normalize_labels]", lambda: labels.normalize(raw.copy())))
+    tidy = loader.tidy_up(raw)
+    blob = pickle.dumps(tidy, protocol=pickle.HIGHEST_PROTOCOL)
+    # st.cache_data 히트 = 캐시된 pickle을 세션마다 역직렬화하는 비용
+    out.append(("load_data[cache_hit]", lambda: pickle.loads(blob)))
+    # DataStore(st.cache_resource) 히트 = 공유 프레임의 얕은 view
+    shared = DataStore(tidy, "csv")
+    out.append(("load_data[store_view]", lambda: shared.df))
+    # 월 × 요금제 파티션 저장소: 전체 vs 최신 월 파티션만(pruning) — "최신 월" 차트가 읽는 양
+    parts_dir = workdir / "parts"
+    partitions.write(tidy, parts_dir, by_plan=True)
+    last = partitions.latest_month(parts_dir)
+    latest_cols = ["userid", "month", "subscription_plan"]
+    out += [
+        ("load_data[parts_all]", lambda: partitions.scan(parts_dir)),
+        ("load_data[parts_latest_month]", lambda: partitions.scan(parts_dir, last, last)),
+        ("dataset.users_by_plan_latest[parts]", lambda: aggregates.users_by_plan_latest(
+            partitions.scan(parts_dir, last, last, columns=latest_cols), "subscription_plan")),
+    ]
+
+    out += [
+        ("dataset.monthly_revenue", lambda: aggregates.monthly_revenue(tidy)),
+        ("dataset.users_by_plan_latest", lambda: aggregates.users_by_plan_latest(tidy, "subscription_plan")),
+        ("dataset.revenue_by_plan", lambda: aggregates.revenue_by_plan(tidy, "subscription_plan")),
+        ("dataset.na_top", lambda: aggregates.na_top(tidy)),
+        ("dataset.nunique_users", lambda: tidy["userid"].nunique()),
+    ]
+
+    # Dataset 탭 차트 4개: 리런마다 Altair 빌드 + to_dict(검증) vs 캐시된 템플릿 골격 + 데이터 주입
+    rev_col = aggregates.revenue_column(tidy)
+    tab_charts = [
+        ("line", aggregates.monthly_revenue(tidy), dict(x="month_dt", y=rev_col, x_type="T", zoom=True)),
+        ("hbar", aggregates.users_by_plan_latest(tidy, "subscription_plan"), dict(x="users", y="subscription_plan")),
+        ("hbar", aggregates.revenue_by_plan(tidy, "subscription_plan"), dict(x="revenue_sum", y="subscription_plan")),
+        ("hbar", aggregates.na_top(tidy), dict(x="na_cnt", y="column", color="#BFBFBF")),
+    ]
+    out += [
+        ("charts.altair[dataset_tab]", lambda: [charts.TEMPLATES[k](**p).to_dict() for k, _, p in tab_charts]),
+        ("charts.template[dataset_tab]", lambda: [charts.spec(k, d, **p) for k, d, p in tab_charts]),
+        # PNG 내보내기: cold = 서버 래스터화(matplotlib import 포함), warm = 데이터 지문 캐시 히트
+        ("charts.png[export]", lambda: charts.png("line", tab_charts[0][1], x="month_dt", y=rev_col, x_type="T")),
+    ]
+
+    # 사이드바 필터 변경 1회 = 마스크 결합 + Dataset/EDA 집계 전부 (budget 0 → 결과 캐시 없이 매번 계산)
+    fstore = DataStore(tidy, "csv", budget_mb=0)
+    ix = filters.index_of(fstore)
+    months = ix.options("month")
+    sel = {"month": (months[min(1, len(months) - 1)], months[-1]), "plan": ix.options("plan")[-1:],
+           "device": ["Smartphone"]}
+    out += [
+        ("filters.build_index", lambda: filters.FilterIndex(tidy)),
+        ("filters.mask", lambda: ix.mask(sel)),
+        ("filters.change", lambda: filter_change(fstore, sel)),
+        # 고유 사용자 수: (월, 요금제, 기기) 셀 HLL 합집합 vs 정확((요금제, 사용자) bincount)
+        ("filters.build_sketches", lambda: filters.UserSketches(ix, tidy).cube("device")),
+        ("filters.distinct_users[hll]", lambda: distinct_users(fstore, sel, exact=False)),
+        ("filters.distinct_users[exact]", lambda: distinct_users(fstore, sel, exact=True)),
+    ]
+
+    # 행 브라우저: 정렬/필터 조건이 같으면 행 번호는 공용 캐시 → 페이지 이동 비용만 (cold = 정렬 포함)
+    bstore = DataStore(tidy, "csv")
+    out += [
+        ("browse.page", lambda: browse.RowBrowser(bstore, sel).page(10, 50)),
+        ("browse.sorted_page", lambda: browse.RowBrowser(bstore, sel, sort="Age", ascending=False).page(10, 50)),
+    ]
+
+    prep = pipeline.prepare(tidy)
+    ltv_user = pipeline.user_rollups(prep)
+    ltv_user_pref = ltv_user.merge(pipeline.latest_prefs(prep), on="userid", how="left")
+    bits = planbits.build(tidy)
+    engine = sql.connect(tidy, cache=0)
+    prefs = clusters.user_prefs(tidy)
+    model, _ = clusters.fit(prefs, workers=1)
+    out += [
+        ("step1.prepare", lambda: pipeline.prepare(tidy)),
+        ("step2.user_rollups", lambda: pipeline.user_rollups(prep, workers=1)),
+        # userid 해시 샤드 × 프로세스 풀 (워커 기동 포함 — 코어 수만큼 빨라지는지)
+        ("step2.user_rollups[partitioned]",
+         lambda: pipeline.user_rollups(prep, workers=max(2, os.cpu_count() or 1), min_rows=0)),
+        ("step2.premium_retention", lambda: pipeline.premium_retention(prep)),
+        ("step2.arpu_monthly", lambda: pipeline.arpu_monthly(prep)),
+        ("revenue.plan_transitions", lambda: transitions.transition_table(tidy)),
+        ("revenue.conversion_events", lambda: conversion.first_events(tidy)),
+        # 취향 세그먼트 × 월 KPI 텐서 (변수 전부, 원본 한 번 + 변수마다 bincount)
+        ("revenue.segment_trends", lambda: segtrends.build(tidy)),
+        # 취향 k-modes (유저 청크 map-reduce, 1 프로세스) + 학습된 모델로 새 유저 배정만
+        ("clusters.fit", lambda: clusters.fit(prefs, workers=1)),
+        ("clusters.assign", lambda: model.assign(prefs)),
+        # 유저 × 월 Premium 비트셋: 빌드(원본 한 번) vs KPI 4종(popcount · AND — 위 step2 대비)
+        ("planbits.build", lambda: planbits.build(tidy)),
+        ("planbits.kpis", lambda: bits.kpis()),
+        # SQL 엔진(DuckDB 있으면 DuckDB, 없으면 sqlite): 적재 + {kpi, retention, arpu, pref} 쿼리 (결과 캐시 끔)
+        (f"sql.connect[{sql.backend()}]", lambda: sql.connect(tidy, cache=0)),
+        (f"sql.bundle[{sql.backend()}]", lambda: engine.bundle()),
+        ("step3.pref_summary", lambda: pipeline.pref_summary(
+            ltv_user.merge(pipeline.latest_prefs(prep), on="userid", how="left"))),
+    ]
+    available = pipeline.buildable()  # find_spec — import 없이 설치 여부만
+    if "sig" in available:
+        out.append(("step4.significance_tests", lambda: pipeline.significance_tests(ltv_user_pref)))
+    else:
+        print("  (scipy 없음 → step4 생략)", file=sys.stderr)
+    if with_importance:
+        if "imp" in available:
+            out.append(("step5.feature_importance", lambda: pipeline.feature_importance(prep, ltv_user)))
+        else:
+            print("  (scikit-learn 없음 → step5 생략)", file=sys.stderr)
+
+    exp_dir = workdir / "data"
+    pipeline.export(pipeline.run(tidy, with_tests=False, with_importance=False), str(exp_dir))
+    out.append(("revenue.load_exports", lambda: pipeline.load_exports(str(exp_dir))))
+    return out
+
+
+def run(rows_list, repeat: int, with_importance: bool) -> dict:
+    result = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "pandas": pd.__version__,
+        "machine": platform.machine(), "cpu_count": os.cpu_count(),
+        "repeat": repeat, "scales": [],
+    }
+    for rows in rows_list:
+        print(f"▶ rows={rows:,}", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as tmp:
+            t0 = time.perf_counter()
+            todo = stages(rows, Path(tmp), with_importance)
+            scale = {"rows": rows, "setup_s": round(time.perf_counter() - t0, 3), "stages": {}}
+            for name, fn in todo:
+                scale["stages"][name] = m = measure(fn, repeat)
+                print(f"  {name:<32} cold {m['cold_s']:>9.4f}s  warm {m['warm_s'] or 0:>9.4f}s  "
+                      f"peak {m['peak_mb']:>9.1f}MB", file=sys.stderr)
+        result["scales"].append(scale)
+    return result
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    """warm 시간이 baseline 대비 (1+tolerance)배를 넘는 스테이지 목록"""
+    base = {(s["rows"], k): v for s in baseline.get("scales", []) for k, v in s["stages"].items()}
+    slow = []
+    for s in result["scales"]:
+        for k, v in s["stages"].items():
+            b = base.get((s["rows"], k))
+            if not b or not b.get("warm_s") or v.get("warm_s") is None:
+                continue
+            ratio = v["warm_s"] / b["warm_s"]
+            # 1ms 미만은 측정 노이즈라 제외
+            if ratio > 1 + tolerance and v["warm_s"] - b["warm_s"] > 1e-3:
+                slow.append({"rows": s["rows"], "stage": k, "baseline_s": b["warm_s"],
+                             "now_s": v["warm_s"], "ratio": round(ratio, 2)})
+    return slow
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", default="3120,100000", help="유저-월 행 수, 콤마 구분 (최대 1천만 권장)")
+    ap.add_argument("--repeat", type=int, default=3, help="warm 반복 횟수")
+    ap.add_argument("--no-importance", action="store_true", help="Step5(RandomForest) 제외")
+    ap.add_argument("--out", default=None, help="결과 JSON 경로 (기본: artifacts/bench/bench_<시각>.json)")
+    ap.add_argument("--baseline", default=None, help="비교할 이전 결과 JSON")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="허용 감속 비율 (기본 25%%)")
+    args = ap.parse_args(argv)
+
+    rows_list = [int(r.replace("_", "")) for r in args.rows.split(",") if r.strip()]
+    result = run(rows_list, args.repeat, not args.no_importance)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["regressions"] = compare(result, json.load(f), args.tolerance)
+
+    out = Path(args.out) if args.out else OUT_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if not args.out:
+        (OUT_DIR / "latest.json").write_text(out.read_text(encoding="utf-8"), encoding="utf-8")
+    print(f"✅ 저장: {out}", file=sys.stderr)
+
+    for r in result.get("regressions", []):
+        print(f"❌ 회귀: rows={r['rows']:,} {r['stage']} {r['baseline_s']}s → {r['now_s']}s (x{r['ratio']})",
+              file=sys.stderr)
+    return 1 if result.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""취향 클러스터 학습 · 배정 CLI — 유저 취향(최신 월) k-modes 모델을 artifacts/clusters/model.npz에
+
+    python -m tools.clusters                       # 원본 → 학습 · 저장, 클러스터별 LTV · 유지율 출력
+    python -m tools.clusters -k 8 --workers 4      # 클러스터 수 · 청크 프로세스 수 (기본: 코어 수)
+    python -m tools.clusters --assign new.csv      # 저장된 모델로 새 유저만 배정 (재학습 없음)
+    python -m tools.clusters --assign new.csv --update   # 배정 + 카운트 누적 → mode 갱신 후 모델 다시 저장
+"""
+import argparse, os, sys, time
+from pathlib import Path
+
+import pandas as pd
+
+from core import clusters
+from core.loader import BASE, load_merged, read_merged, tidy_up
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--out", default=str(clusters.DEFAULT_PATH))
+    ap.add_argument("-k", type=int, default=clusters.K, help="클러스터 수")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="청크를 나눠 돌릴 프로세스 수")
+    ap.add_argument("--labels", help="유저별 배정(userid, cluster, distance)을 쓸 CSV")
+    ap.add_argument("--assign", metavar="FILE", help="새 유저 원본(xlsx · csv) — 저장된 모델로 배정만")
+    ap.add_argument("--update", action="store_true", help="--assign과 함께: 배정 결과로 mode를 갱신해 다시 저장")
+    args = ap.parse_args(argv)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_colwidth", 80)
+
+    t0 = time.perf_counter()
+    if args.assign:
+        model = clusters.load(args.out)
+        prefs = clusters.user_prefs(tidy_up(read_merged(Path(args.assign))))
+        labels = model.update(prefs) if args.update else model.assign(prefs)
+        if args.update:
+            model.save(args.out)
+        print(labels["cluster"].value_counts().sort_index().rename("users").to_string())
+        print(f"✅ {len(labels):,}명 배정{' · 모델 갱신' if args.update else ''} ({time.perf_counter() - t0:.2f}s)",
+              file=sys.stderr)
+    else:
+        tidy, _ = load_merged(Path(args.base))
+        out = clusters.run(tidy, k=args.k, seed=args.seed, workers=args.workers)
+        out["model"].save(args.out)
+        labels = out["labels"]
+        print(out["profile"].to_string(index=False, float_format=lambda v: f"{v:,.3f}"))
+        print(f"✅ {args.out} · 유저 {len(labels):,} · k={out['model'].k} ({time.perf_counter() - t0:.1f}s)",
+              file=sys.stderr)
+    if args.labels:
+        labels.to_csv(args.labels, index=False)
+        print(f"✅ {args.labels}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""월(· 요금제) 파티션 저장소 CLI — tidy 데이터를 data/parts/month=YYYY-MM[/plan=...]/part-*.parquet로
+
+    python -m tools.partition                     # 원본(spotify_merged.*) → data/parts (월 파티션)
+    python -m tools.partition --by-plan           # 월 × 요금제 파티션
+    python -m tools.partition --append new.csv    # 새 달 행을 파티션 파일로 추가 (기존 파일은 그대로)
+    python -m tools.partition --show              # 파티션별 파일 · 행 수 · 크기
+
+머지 원본(xlsx · csv)이 없으면 앱 · 파이프라인은 이 저장소를 원본으로 읽는다(core.loader.find_merged).
+"""
+import argparse, sys, time
+from pathlib import Path
+
+from core import loader, partitions
+from core.loader import BASE
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--out", default=str(partitions.DEFAULT_DIR))
+    ap.add_argument("--by-plan", action="store_true", help="월 아래 요금제(subscription_plan)로도 나눔")
+    ap.add_argument("--append", default=None, help="추가할 행 파일(.xlsx · .csv · .parquet) — 저장소를 다시 쓰지 않음")
+    ap.add_argument("--show", action="store_true", help="쓰지 않고 --out 저장소 요약만 출력")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.append:
+        added = partitions.append(loader.read_merged(Path(args.append)), args.out)
+        print(f"✅ 파티션 {len(added)}개 추가 ({sum(p['rows'] for p in added):,}행 · "
+              f"{time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    elif not args.show:
+        from core.snapshot import fingerprint
+        base = Path(args.base)
+        src = loader.find_merged(base)
+        if src is None or loader.is_parts(src):
+            print("머지 원본(spotify_merged.xlsx · csv)을 찾지 못했습니다.", file=sys.stderr)
+            return 1
+        tidy, _ = loader.load_merged(base)
+        partitions.write(tidy, args.out, by_plan=args.by_plan, source=fingerprint(src))
+        print(f"✅ {args.out} ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+    m = partitions.read_manifest(args.out)
+    st = partitions.stats(args.out)
+    print(f"updated {m['updated']} · source {m['source']} · {'월 × 요금제' if m['by_plan'] else '월'} 파티션 "
+          f"{len(st)}개 · 파일 {int(st['files'].sum())}개 · {int(st['rows'].sum()):,}행 · {st['bytes'].sum() / 1024:,.1f} KB")
+    for r in st.itertuples():
+        plan = "" if r.plan is None or r.plan != r.plan else f" / {r.plan}"
+        print(f"  {r.month}{plan:<12} files {r.files:>3}  rows {r.rows:>10,}  {r.bytes / 1024:>9,.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""메트릭 파이프라인(노트북 Step1~6) CLI — 정제본(없으면 머지 원본 + 노트북 정제)에서 data/out_*.csv를
+
+    python -m tools.pipeline --check         # 다시 계산해 커밋된 data/out_*.csv와 비교 (다르면 exit 1)
+    python -m tools.pipeline --export        # 다시 계산해 data/out_*.csv 덮어쓰기 + HTML 리포트(core.report) 다시 쓰기
+    python -m tools.pipeline --export --report 0   # 리포트는 건너뜀
+"""
+import argparse, sys, tempfile, time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core import pipeline, report
+from core.loader import BASE, find_metrics_source, load_metrics_input
+
+
+def same(ref: pd.DataFrame, got: pd.DataFrame, rtol: float = 1e-6) -> str:
+    """두 export가 같으면 "", 다르면 이유 — 숫자 컬럼은 rtol, 나머지는 문자열 비교"""
+    if list(ref.columns) != list(got.columns):
+        return f"컬럼 {list(ref.columns)} ≠ {list(got.columns)}"
+    if len(ref) != len(got):
+        return f"행 수 {len(ref)} ≠ {len(got)}"
+    for c in ref.columns:
+        a, b = ref[c], got[c]
+        if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+            ok = np.isclose(a.to_numpy(float), b.to_numpy(float), rtol=rtol, equal_nan=True)
+        else:
+            a, b = a.astype(object), b.astype(object)
+            ok = ((a.isna() & b.isna()) | (a == b).fillna(False)).to_numpy(bool)
+        if not ok.all():
+            i = int(np.argmin(ok))
+            return f"{c} {int((~ok).sum())}행 다름 (예: {i}행 {a.iloc[i]!r} ≠ {b.iloc[i]!r})"
+    return ""
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_cleaned_final_v2.csv · spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--out", default=str(BASE / "data"), help="export 폴더")
+    ap.add_argument("--check", action="store_true", help="커밋된 export와 비교")
+    ap.add_argument("--export", action="store_true", help="결과를 --out에 쓰기")
+    ap.add_argument("--report", default=str(report.DEFAULT_PATH), help="--export와 함께 다시 쓸 HTML 리포트 경로 (0이면 끔)")
+    args = ap.parse_args(argv)
+    base = Path(args.base)
+
+    t0 = time.perf_counter()
+    raw, source = load_metrics_input(base)
+    bundle = pipeline.run_available(raw)
+    print(f"✅ {find_metrics_source(base).name} ({source}) · {len(raw):,}행 ({time.perf_counter() - t0:.1f}s)",
+          file=sys.stderr)
+    ok = True
+    if args.check:
+        ref = pipeline.load_exports(args.out)
+        with tempfile.TemporaryDirectory() as tmp:  # 같은 CSV 왕복을 거쳐 비교 (결측 · dtype이 파일과 같게)
+            pipeline.export(bundle, tmp)
+            got = {k: (pipeline.load_exports(tmp)[k] if bundle.get(k) is not None else None) for k in ref}
+        for key, name in pipeline.EXPORT_FILES.items():
+            if got[key] is None or ref[key] is None:
+                print(f"  {name:<40} - (없음: {'계산 안 됨' if got[key] is None else '커밋된 파일 없음'})")
+                continue
+            r, g = ref[key], got[key]
+            if key == "imp":  # 중요도 0 동점은 정렬 순서가 정해져 있지 않음 → feature 순으로 비교
+                r, g = (x.sort_values(x.columns[0], ignore_index=True) for x in (r, g))
+            why = same(r, g)
+            ok &= not why
+            print(f"  {name:<40} {'✓' if not why else '✗ ' + why}")
+    if args.export:
+        pipeline.export(bundle, args.out)
+        print(f"✅ {args.out}", file=sys.stderr)
+        if args.report not in ("", "0"):
+            path = report.build(base, args.report, exports=pipeline.as_exports(bundle))
+            print(f"✅ {path}", file=sys.stderr)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""유저 × 월 요금제 비트맵 빌드 CLI — Premium 여부 비트셋 + 매출 행렬을 artifacts/planbits/plans.bits에
+
+    python -m tools.planbits                 # 원본(spotify_merged.*) → plans.bits, KPI 출력
+    python -m tools.planbits --show          # 기존 파일의 manifest · KPI만
+    python -m tools.planbits --check         # 노트북 파이프라인(Step1~2) KPI와 비교 (다르면 exit 1)
+"""
+import argparse, json, math, sys, time
+from pathlib import Path
+
+from core import planbits
+from core.loader import BASE
+
+
+def check(bits: planbits.PlanBits, base: Path) -> bool:
+    from core import pipeline
+    from core.loader import load_merged
+    prep = pipeline.prepare(load_merged(base)[0])
+    ltv_user, ret = pipeline.user_rollups(prep), pipeline.premium_retention(prep)
+    ref, got = pipeline.kpi_values(pipeline.kpi_table(prep, ltv_user, ret)), bits.kpis()
+    ok = True
+    for k, v in ref.items():
+        same = math.isclose(v, got[k], rel_tol=1e-9) or (math.isnan(v) and math.isnan(got[k]))
+        ok &= same
+        print(f"  {k:<24} pipeline {v:>14.6f}  bits {got[k]:>14.6f}  {'✓' if same else '✗'}")
+    return ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--out", default=str(planbits.DEFAULT_PATH))
+    ap.add_argument("--show", action="store_true", help="빌드하지 않고 --out 파일 요약만 출력")
+    ap.add_argument("--check", action="store_true", help="파이프라인 KPI와 일치하는지 확인")
+    args = ap.parse_args(argv)
+
+    if not args.show:
+        t0 = time.perf_counter()
+        planbits.write(planbits.build_from_source(Path(args.base)), args.out)
+        print(f"✅ {args.out} ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+    bits = planbits.open_bits(args.out)
+    stale = " · ⚠ 원본이 바뀜(다시 빌드 필요)" if planbits.is_stale(bits, Path(args.base)) else ""
+    print(f"created {bits.created} · source {bits.source} · {Path(args.out).stat().st_size / 1024:,.1f} KB{stale}")
+    print(f"  users {bits.n_users:,} · months {bits.months[0] if bits.months else '-'}~{bits.months[-1] if bits.months else '-'}"
+          f" · bitset {bits.premium.nbytes * 2 / 1024:,.1f} KB · revenue {bits.revenue.nbytes / 1024:,.1f} KB")
+    t0 = time.perf_counter()
+    kpis = bits.kpis()
+    print(json.dumps(kpis, ensure_ascii=False, indent=2))
+    print(f"  KPI {(time.perf_counter() - t0) * 1e3:.2f} ms", file=sys.stderr)
+    if args.check and not check(bits, Path(args.base)):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
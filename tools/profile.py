@@ -0,0 +1,33 @@
+"""데이터 품질 프로파일 CLI — 원본을 청크로 한 번 읽어 월별 부분 통계를 artifacts/metrics/profile.json에
+
+    python -m tools.profile                              # 원본(spotify_merged.*) → profile.json
+    python -m tools.profile --chunk-rows 500000 --summary artifacts/metrics/summary.json
+"""
+import argparse, json, sys, time
+from pathlib import Path
+
+from core import profile
+from core.loader import BASE
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--out", default=str(profile.DEFAULT_PATH))
+    ap.add_argument("--chunk-rows", type=int, default=200_000, help="청크당 행 수 (=메모리 상한)")
+    ap.add_argument("--summary", default=None, help="노트북 summary.json 형식 요약도 이 경로에 기록")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    prof = profile.build_from_source(Path(args.base), args.chunk_rows)
+    profile.write(prof, args.out)
+    summary = profile.Profile(args.out).summary()
+    if args.summary:
+        Path(args.summary).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    print(f"✅ {args.out} ({len(prof['partitions'])}개 월 · {time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""정적 HTML 리포트 빌드 — 대시보드 핵심 화면(KPI · 추이 · 세그먼트 · EDA)을 서버 없이 열리는 파일 하나로
+
+    python -m tools.report                          # → artifacts/report/index.html (스크립트는 CDN)
+    python -m tools.report --js-dir vendor/vega     # vega · vega-lite · vega-embed .min.js를 HTML에 인라인 (오프라인)
+    python -m tools.report --out /tmp/report.html
+
+Revenue 지표는 data/out_*.csv(없으면 파이프라인 실행), EDA는 원본에서 집계한다.
+앱 서버가 지표를 다시 계산할 때(core.refresh)도 같은 경로에 다시 쓴다.
+"""
+import argparse, sys, time
+from pathlib import Path
+
+from core import report
+from core.loader import BASE
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*) · data/out_*.csv 를 찾을 폴더")
+    ap.add_argument("--out", default=str(report.DEFAULT_PATH))
+    ap.add_argument("--js-dir", default=None, help="vega.min.js · vega-lite.min.js · vega-embed.min.js 가 있는 폴더 (인라인)")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    path = report.build(Path(args.base), args.out, js_dir=args.js_dir)
+    print(f"✅ {path} ({path.stat().st_size / 1024:,.1f} KB · {time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+"""대시보드 스냅샷 빌드 CLI — 배포 전에 한 번 돌려 두면 앱이 원본 없이 첫 화면을 그린다
+
+    python -m tools.snapshot                                  # → artifacts/snapshot/dashboard.snap
+    python -m tools.snapshot --out /srv/app/dashboard.snap    # 앱은 STAYORSKIP_SNAPSHOT 경로를 읽음
+    python -m tools.snapshot --show                           # 기존 스냅샷 내용 확인
+"""
+import argparse, sys, time
+from pathlib import Path
+
+from core import snapshot
+from core.loader import BASE
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*) · data/out_*.csv 를 찾을 폴더")
+    ap.add_argument("--out", default=str(snapshot.DEFAULT_PATH))
+    ap.add_argument("--show", action="store_true", help="빌드하지 않고 --out 스냅샷의 manifest 요약만 출력")
+    args = ap.parse_args(argv)
+
+    if not args.show:
+        t0 = time.perf_counter()
+        snapshot.build(Path(args.base), args.out)
+        print(f"✅ {args.out} ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+    snap = snapshot.Snapshot(args.out)
+    m = snap.manifest
+    print(f"created {m['created']} · source {m['source']} · {Path(args.out).stat().st_size / 1024:,.1f} KB")
+    for name, (off, length) in m["frames"].items():
+        print(f"  frame {name:<28} {length / 1024:>8,.1f} KB")
+    print(f"  values {', '.join(m['values'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""SQL 지표 엔진 CLI — Revenue KPI를 DuckDB(있으면) · sqlite3 파라미터 쿼리로 (core.sql)
+
+    python -m tools.sql                                  # 원본 → KPI 4종 + 월별 ARPU · 유지율
+    python -m tools.sql --parts data/parts --start 2023-03 --end 2023-06
+    python -m tools.sql --segment fav_music_genre        # 세그먼트별 평균 LTV
+    python -m tools.sql --check                          # 노트북 파이프라인(Step1~3)과 같은지 (다르면 exit 1)
+    python -m tools.sql --query "SELECT month, SUM(revenue) AS rev FROM facts GROUP BY month"
+"""
+import argparse, math, sys, time
+from pathlib import Path
+
+import numpy as np
+
+from core import sql
+from core.loader import BASE
+
+
+def check(eng: sql.Engine, base: Path) -> bool:
+    from core import pipeline
+    from core.loader import load_merged
+    prep = pipeline.prepare(load_merged(base)[0])
+    ltv_user, ret = pipeline.user_rollups(prep), pipeline.premium_retention(prep)
+    ref, got = pipeline.kpi_values(pipeline.kpi_table(prep, ltv_user, ret)), eng.kpis()
+    ok = True
+    for k, v in ref.items():
+        same = math.isclose(v, got[k], rel_tol=1e-9) or (math.isnan(v) and math.isnan(got[k]))
+        ok &= same
+        print(f"  {k:<24} pipeline {v:>14.6f}  sql {got[k]:>14.6f}  {'✓' if same else '✗'}")
+    pref = pipeline.pref_summary(ltv_user.merge(pipeline.latest_prefs(prep), on="userid", how="left"))
+    mine = eng.pref_summary()
+    cols = ["users", "avg_ltv", "avg_premium_duration", "avg_monthly_revenue", "free_to_premium_rate"]
+    for var in pref["variable"].unique():
+        a = pref[pref["variable"] == var].sort_values(var)[cols].to_numpy(float)
+        b = mine[mine["variable"] == var].sort_values(var)[cols].to_numpy(float)
+        same = a.shape == b.shape and np.allclose(a, b, rtol=1e-9, equal_nan=True)
+        ok &= same
+        if not same:
+            print(f"  segment {var:<24} ✗")
+    print(f"  segment LTV {pref['variable'].nunique()}개 변수 {'✓' if ok else '✗'}")
+    return ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--base", default=str(BASE), help="원본(spotify_merged.*)을 찾을 폴더")
+    ap.add_argument("--parts", default=None, help="파티션 저장소 폴더 (주면 원본 대신 Parquet 파티션을 스캔)")
+    ap.add_argument("--backend", default=None, choices=["auto", "duckdb", "sqlite"], help="기본 STAYORSKIP_SQL(auto)")
+    ap.add_argument("--start", default=sql.FIRST, help="월 범위 시작 (YYYY-MM, 포함)")
+    ap.add_argument("--end", default=sql.LAST, help="월 범위 끝 (YYYY-MM, 포함)")
+    ap.add_argument("--segment", default=None, help="세그먼트별 평균 LTV를 볼 취향 변수")
+    ap.add_argument("--query", default=None, help="facts 뷰(userid · month · is_premium · revenue · 취향 변수)에 직접 SQL")
+    ap.add_argument("--check", action="store_true", help="파이프라인 KPI · 세그먼트 LTV와 일치하는지 확인")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        if args.parts:
+            eng = sql.connect(parts=args.parts, kind=args.backend)
+        else:
+            from core.loader import load_merged
+            eng = sql.connect(load_merged(Path(args.base))[0], kind=args.backend)
+    except ImportError as e:
+        print(f"❌ {e} — pip install duckdb 또는 --backend sqlite", file=sys.stderr)
+        return 1
+    print(f"backend {eng.kind} · 적재 {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+
+    if args.check:
+        return 0 if check(eng, Path(args.base)) else 1
+    if args.query:
+        print(eng.query(args.query).to_string(index=False))
+        return 0
+    if args.segment:
+        print(eng.segment_ltv(args.segment, args.start, args.end).to_string(index=False))
+        return 0
+    t0 = time.perf_counter()
+    for k, v in eng.kpis(args.start, args.end).items():
+        print(f"  {k:<24} {v:>14.6f}")
+    print(eng.arpu(args.start, args.end).merge(
+        eng.retention(args.start, args.end).assign(month=lambda d: d["from_to"].str[:7]), on="month", how="left")
+        .to_string(index=False))
+    print(f"쿼리 {time.perf_counter() - t0:.3f}s · {eng.stats()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""앱 시작 시간 프로파일 — 첫 렌더 시간 + 그동안 새로 import된 모듈 (-X importtime) + 예산 체크
+
+    python -m tools.startup                          # spotify.py 첫 렌더 · 최상위 import 상위 15개
+    python -m tools.startup --app spotify_v2.py --top 25
+    python -m tools.startup --budget 1.0             # 첫 렌더가 1초를 넘으면 exit 1 (CI · 배포 전 체크)
+
+서버 프로세스에는 streamlit이 이미 올라와 있으므로, 자식 프로세스에서 streamlit(AppTest)을 먼저 import하고
+표식을 찍은 뒤 앱 스크립트를 한 번 실행해 그 뒤의 import만 센다(= 새 서버의 첫 방문자가 치르는 비용).
+무거운 의존성(matplotlib · scipy · sklearn)은 그걸 쓰는 섹션을 열 때 import해야 이 목록에 나오지 않는다.
+"""
+import argparse, json, os, subprocess, sys
+from collections import defaultdict
+
+from core.loader import BASE
+
+MARK = "@@stayorskip-app-start"
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+AppTest.from_string("pass").run()  # 하네스 초기화(컴포넌트 스캔 등)는 서버 기동 때 이미 끝나 있는 비용
+at = AppTest.from_file({app!r}, default_timeout={timeout})
+sys.stderr.write({mark!r} + "\\n"); sys.stderr.flush()
+t0 = time.perf_counter()
+at.run()
+print(json.dumps({{"first_render_s": time.perf_counter() - t0, "exceptions": [str(e.value)[:200] for e in at.exception]}}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict:
+    """표식 이후 -X importtime 로그 → 최상위 패키지별 누적 import 시간(초). 중첩 import는 부모에 포함"""
+    out = defaultdict(float)
+    lines = stderr.splitlines()
+    start = lines.index(MARK) + 1 if MARK in lines else 0
+    for line in lines[start:]:
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # 헤더
+        name = parts[2][1:]
+        if name.startswith(" "):  # 다른 import 안에서 일어난 import
+            continue
+        out[name.split(".")[0]] += int(parts[1]) / 1e6
+    return dict(out)
+
+
+def profile(app: str, timeout: float = 120) -> dict:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(BASE), os.environ.get("PYTHONPATH")]))}
+    code = CHILD.format(app=str(BASE / app), timeout=timeout, mark=MARK)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BASE, env=env,
+                          capture_output=True, text=True, timeout=timeout + 60)
+    if proc.returncode != 0 or not proc.stdout.strip():
+        raise RuntimeError(f"앱 실행 실패 (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+    res["imports"] = parse_importtime(proc.stderr)
+    return res
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--app", default="spotify.py", help="레포 루트 기준 앱 스크립트")
+    ap.add_argument("--top", type=int, default=15, help="출력할 최상위 import 수")
+    ap.add_argument("--budget", type=float, default=None, help="첫 렌더 허용 시간(초). 넘으면 exit 1")
+    ap.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = ap.parse_args(argv)
+
+    res = profile(args.app)
+    imports = sorted(res["imports"].items(), key=lambda kv: -kv[1])
+    if args.json:
+        print(json.dumps({**res, "imports": dict(imports)}, ensure_ascii=False, indent=2))
+    else:
+        total = sum(v for _, v in imports)
+        print(f"{args.app}: 첫 렌더 {res['first_render_s']:.2f}s · 그중 새 import {total:.2f}s ({len(imports)}개 패키지)")
+        for name, sec in imports[:args.top]:
+            print(f"  {name:<28} {sec:>7.3f}s")
+    if res["exceptions"]:
+        print(f"⚠ 렌더 중 예외 {len(res['exceptions'])}건: {res['exceptions'][0]}", file=sys.stderr)
+    if args.budget is not None and res["first_render_s"] > args.budget:
+        print(f"❌ 첫 렌더 {res['first_render_s']:.2f}s > 예산 {args.budget:.2f}s", file=sys.stderr)
+        return 1
+    return 1 if res["exceptions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
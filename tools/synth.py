@@ -0,0 +1,30 @@
+"""합성 데이터 생성 CLI — 운영 추출본 없이 대시보드/파이프라인 부하 테스트용
+
+    python -m tools.synth --users 1000000 --out data/synth/spotify_merged.parquet
+    python -m tools.synth --users 50000 --months 12 --start 2024-01 --out data/synth/spotify_merged.csv
+"""
+import argparse, sys, time
+
+from core import synth
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, required=True, help="생성할 유저 수")
+    ap.add_argument("--months", type=int, default=None, help="월 수 (기본: 샘플과 동일)")
+    ap.add_argument("--start", default=None, help="시작 월 YYYY-MM (기본: 샘플 첫 달)")
+    ap.add_argument("--sample", default=None, help="학습용 샘플 CSV (기본: spotify_merged.csv)")
+    ap.add_argument("--chunk-users", type=int, default=100_000, help="청크당 유저 수 (=메모리 상한)")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", required=True, help=".parquet 또는 .csv")
+    args = ap.parse_args(argv)
+
+    spec = synth.fit(synth.load_sample(args.sample))
+    t0 = time.perf_counter()
+    n = synth.write(synth.generate(spec, args.users, args.months, args.start, args.seed, args.chunk_users), args.out)
+    print(f"✅ {n:,}행 → {args.out} ({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())